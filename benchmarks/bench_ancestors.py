@@ -0,0 +1,109 @@
+"""
+Upward lookups (parents queries, jsonpath, root and QuerySet.update) in a deep document.
+
+The records of the document are nested DEPTH levels deep, so every lookup which walks
+up the parent chain of a node is slow. Ancestor chains of compose nodes are cached, and
+moving a compose node only drops the chains of its own subtree.
+
+Each cached chain is a tuple as long as the depth of its node, so the memory held by
+the chains (measured with tracemalloc) is printed along with the memory of the tree.
+A moved subtree (a record) is timed too, with the other chains of the tree still cached.
+
+Usage
+-----
+    python -m benchmarks.bench_ancestors
+"""
+import gc
+import time
+import tracemalloc
+
+from jsonutils.base import JSONObject
+
+DEPTH = 30
+BRANCHES = 100
+RECORDS = 50
+REPEATS = 3
+
+
+def make_document():
+    def nested(level, branch):
+        if level == DEPTH:
+            return {
+                "records": [
+                    {"value": i, "name": f"record-{branch}-{i}"} for i in range(RECORDS)
+                ]
+            }
+        node = {"level": level, "child": nested(level + 1, branch)}
+        if level == 5:
+            node["kind"] = "even" if branch % 2 == 0 else "odd"
+        return node
+
+    return {"branches": [nested(0, branch) for branch in range(BRANCHES)]}
+
+
+OPERATIONS = {
+    "query(value__parents__c_kind)": lambda obj: obj.query(
+        value__parents__c_kind="even"
+    ),
+    "query(value__parents__c_level__gt)": lambda obj: obj.query(
+        value__gte=25, value__parents__c_level__gt=DEPTH + 1
+    ),
+    "jsonpaths": lambda obj: obj.query(value__gte=0).jsonpaths(),
+    "root": lambda obj: [node.root for node in obj.query(value__gte=0)],
+    "QuerySet.update": lambda obj: obj.query(value__gte=40).update(lambda x: x + 1),
+}
+
+
+def move_record(obj):
+    records = obj.branches._0.query(records__parents__c_level=0).first()
+    records.append(records.pop(0))
+    return obj.query(name__parents__c_kind="odd").count()
+
+
+def cache_chains(obj):
+    for node in obj.query(value__gte=0):
+        node.depth
+
+
+def traced(function, *args):
+    """(result, bytes allocated by the call which are still allocated after it)"""
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = function(*args)
+        gc.collect()
+        return result, tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+
+
+def timed(function, *args):
+    gc.collect()
+    best = None
+    for _ in range(REPEATS):
+        start = time.process_time()
+        result = function(*args)
+        elapsed = time.process_time() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    obj = JSONObject(make_document())
+    print(f"{'operation':>36} {'time (ms)':>10} {'results':>8}")
+    for name, operation in OPERATIONS.items():
+        elapsed, result = timed(operation, obj)
+        count = len(result) if isinstance(result, list) else result
+        print(f"{name:>36} {elapsed * 1000:>10.1f} {str(count):>8}")
+    elapsed, count = timed(move_record, obj)
+    print(f"{'move a record, query(parents)':>36} {elapsed * 1000:>10.1f} {count:>8}")
+
+    obj, tree = traced(JSONObject, make_document())
+    _, chains = traced(cache_chains, obj)
+    print(f"\ntree: {tree / 2**20:.1f} MiB, cached chains: {chains / 2**20:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
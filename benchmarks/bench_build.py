@@ -0,0 +1,61 @@
+"""
+Construction time and peak memory of eager JSONObject instances.
+
+Documents are lists of flat-ish records, so the number of nodes grows linearly with the size.
+Peak memory is measured with tracemalloc.
+
+Usage
+-----
+    python -m benchmarks.bench_build
+"""
+import time
+import tracemalloc
+
+from jsonutils.base import JSONObject
+
+
+def make_records(size):
+    return [
+        {
+            "id": i,
+            "name": f"item-{i}",
+            "price": i * 0.5,
+            "active": i % 2 == 0,
+            "parent": None,
+            "tags": ["a", "b", "c"],
+            "meta": {"created": "2021-05-01 08:00:00", "views": i % 100},
+        }
+        for i in range(size)
+    ]
+
+
+def count_nodes(data):
+    if isinstance(data, dict):
+        return 1 + sum(count_nodes(v) for v in data.values())
+    if isinstance(data, list):
+        return 1 + sum(count_nodes(v) for v in data)
+    return 1
+
+
+def measure(data):
+    tracemalloc.start()
+    start = time.perf_counter()
+    obj = JSONObject(data)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del obj
+    return elapsed, peak
+
+
+def main():
+    print(f"{'nodes':>10} {'time (s)':>10} {'peak (MB)':>10} {'bytes/node':>11}")
+    for size in (1000, 10000, 50000):
+        data = make_records(size)
+        nodes = count_nodes(data)
+        elapsed, peak = measure(data)
+        print(f"{nodes:>10} {elapsed:>10.3f} {peak / 2**20:>10.2f} {peak / nodes:>11.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Queries over a large list of homogeneous records, traversed node by node and evaluated by columns.
+
+With numpy installed, the children under the keys of a query are parsed once into arrays
+(see jsonutils.columnar), and later queries only compare those arrays. The first query over
+a key pays for its parsing (cold), and the columns are reused until the list is modified (warm).
+
+Usage
+-----
+    python -m benchmarks.bench_columnar_query
+"""
+import time
+
+import jsonutils.config as config
+from jsonutils.base import JSONObject
+
+RECORDS = 100000
+REPEAT = 3
+
+QUERIES = {
+    "price__gt=900": {"price__gt": 900},
+    "amount__lte=50 (str)": {"amount__lte": 50},
+    "created__gte=date": {"created__gte": "2021-12-01"},
+    "status=closed": {"status": "closed"},
+    "status, price, created": {
+        "status": "open",
+        "price__lt": 100,
+        "created__lt": "2021-02-01",
+    },
+}
+
+
+def make_records(size):
+    return {
+        "orders": [
+            {
+                "id": i,
+                "price": (i * 7919) % 1000 + 0.5,
+                "amount": f"{(i * 31) % 1000}.25",
+                "created": f"2021-{i % 12 + 1:02d}-{i % 28 + 1:02d} 10:00:00",
+                "status": "closed" if i % 50 == 0 else "open",
+            }
+            for i in range(size)
+        ]
+    }
+
+
+def timed(function, *args, **kwargs):
+    start = time.process_time()
+    result = function(*args, **kwargs)
+    return time.process_time() - start, result
+
+
+def best(function, *args, **kwargs):
+    return min(timed(function, *args, **kwargs)[0] for _ in range(REPEAT))
+
+
+def main():
+    obj = JSONObject(make_records(RECORDS))
+    min_records = config.COLUMNAR_MIN_RECORDS
+
+    print(
+        f"{'query':>24} {'walk (ms)':>10} {'cold (ms)':>10} "
+        f"{'warm (ms)':>10} {'results':>8}"
+    )
+    for name, q in QUERIES.items():
+        config.COLUMNAR_MIN_RECORDS = None
+        walk, expected = timed(obj.query, **q)
+        config.COLUMNAR_MIN_RECORDS = min_records
+        obj["orders"]._columns = None
+        cold, result = timed(obj.query, **q)
+        assert result == expected
+        warm = best(obj.query, **q)
+        print(
+            f"{name:>24} {walk * 1000:>10.1f} {cold * 1000:>10.1f} "
+            f"{warm * 1000:>10.1f} {len(result):>8}"
+        )
+
+    # a modification invalidates the columns, which are parsed again by the next query
+    q = QUERIES["price__gt=900"]
+    obj["orders"][0].price = 999
+    elapsed, result = timed(obj.query, **q)
+    assert result.first() == 999
+    print(f"\nquery after an update: {elapsed * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Copy a large template and modify one of its fields.
+
+The copy-on-write copy (JSONCompose.copy) is compared with building a new object from the
+native data of the template, which is how copy() used to work.
+Memory is the traced memory held by the copies, measured with tracemalloc.
+
+Usage
+-----
+    python -m benchmarks.bench_copy
+"""
+import time
+import tracemalloc
+
+from jsonutils.base import JSONObject
+
+COPIES = 10
+
+
+def make_template(size):
+    return {
+        "header": {"version": 1, "author": "template", "tags": ["a", "b"]},
+        "items": [
+            {
+                "id": i,
+                "name": f"item-{i}",
+                "price": i * 0.5,
+                "meta": {"created": "2021-05-01 08:00:00", "views": i % 100},
+            }
+            for i in range(size)
+        ],
+    }
+
+
+def rebuild_copy(template):
+    return JSONObject(template._data)
+
+
+def cow_copy(template):
+    return template.copy()
+
+
+def measure(template, copy_function):
+    copies = []
+    tracemalloc.start()
+    start = time.perf_counter()
+    for i in range(COPIES):
+        obj = copy_function(template)
+        obj.header.version = i
+        obj["items"][i].name = "modified"
+        copies.append(obj)
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # copies must be independent
+    assert template.header.version == 1 and template["items"][0].name == "item-0"
+    assert copies[3]["items"][3].name == "modified"
+    assert copies[3]["items"][2].name == "item-2"
+    return elapsed / COPIES, current / COPIES
+
+
+def main():
+    print(f"{'records':>8} {'method':>8} {'ms/copy':>9} {'KB/copy':>9}")
+    for size in (1000, 10000, 50000):
+        template = JSONObject(make_template(size))
+        template._data  # native data is cached, as for any object in use
+        for name, function in (("rebuild", rebuild_copy), ("cow", cow_copy)):
+            elapsed, memory = measure(template, function)
+            print(f"{size:>8} {name:>8} {elapsed * 1000:>9.3f} {memory / 2**10:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
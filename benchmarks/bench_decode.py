@@ -0,0 +1,75 @@
+"""
+Decoding time and peak memory of JSON strings, comparing the two-pass approach
+(json.loads to python objects, then JSONObject over them) with the single-pass JSONObject.loads,
+where nodes are built by the decoder while parsing.
+
+Usage
+-----
+    python -m benchmarks.bench_decode
+"""
+import json
+import time
+import tracemalloc
+
+from jsonutils.base import JSONObject
+
+
+def make_document(size):
+    return json.dumps(
+        {
+            "records": [
+                {
+                    "id": i,
+                    "name": f"item-{i}",
+                    "price": i * 0.5,
+                    "active": i % 2 == 0,
+                    "parent": None,
+                    "tags": ["a", "b", "c"],
+                    "meta": {"created": "2021-05-01 08:00:00", "views": i % 100},
+                }
+                for i in range(size)
+            ]
+        }
+    )
+
+
+def two_pass(string):
+    return JSONObject(json.loads(string))
+
+
+def single_pass(string):
+    return JSONObject.loads(string)
+
+
+def measure(function, string):
+    # time and memory are measured in different runs, since tracemalloc slows down allocations
+    start = time.perf_counter()
+    obj = function(string)
+    elapsed = time.perf_counter() - start
+    del obj
+
+    tracemalloc.start()
+    obj = function(string)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del obj
+    return elapsed, peak
+
+
+def main():
+    print(
+        f"{'size (MB)':>10} {'2-pass (s)':>11} {'1-pass (s)':>11} "
+        f"{'2-pass (MB)':>12} {'1-pass (MB)':>12}"
+    )
+    for size in (10000, 30000, 60000):
+        string = make_document(size)
+        two_time, two_peak = measure(two_pass, string)
+        one_time, one_peak = measure(single_pass, string)
+        print(
+            f"{len(string) / 2**20:>10.1f} {two_time:>11.3f} {one_time:>11.3f} "
+            f"{two_peak / 2**20:>12.2f} {one_peak / 2**20:>12.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
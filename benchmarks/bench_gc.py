@@ -0,0 +1,108 @@
+"""
+Garbage collector pauses and peak memory while loading and discarding many documents.
+
+It simulates a long-running worker: documents are loaded with JSONObject.loads,
+read, and discarded, while the last few of them are kept alive. Trees with strong
+parent links are reference cycles, so they are only freed by the cyclic garbage
+collector. Trees in weak_parents mode are freed by reference counting as soon as
+they are discarded.
+
+GC pauses are timed with gc.callbacks.
+Peak memory is measured with tracemalloc in a separate run.
+
+Usage
+-----
+    python -m benchmarks.bench_gc
+"""
+import gc
+import json
+import time
+import tracemalloc
+from collections import deque
+
+from jsonutils.base import JSONObject
+
+DOCUMENTS = 200
+KEEP = 10  # documents alive at the same time
+
+
+def make_document(size):
+    return json.dumps(
+        {
+            "request": {"id": "abc", "user": {"name": "John", "roles": ["a", "b"]}},
+            "records": [
+                {
+                    "id": i,
+                    "name": f"item-{i}",
+                    "price": i * 0.5,
+                    "meta": {"created": "2021-05-01 08:00:00", "views": i % 100},
+                }
+                for i in range(size)
+            ],
+        }
+    )
+
+
+class GCTimer:
+    """Record the duration of every garbage collection"""
+
+    def __init__(self):
+        self.pauses = {0: [], 1: [], 2: []}
+        self._start = None
+
+    def __call__(self, phase, info):
+        if phase == "start":
+            self._start = time.perf_counter()
+        else:
+            self.pauses[info["generation"]].append(time.perf_counter() - self._start)
+
+    def __enter__(self):
+        gc.callbacks.append(self)
+        return self
+
+    def __exit__(self, *args):
+        gc.callbacks.remove(self)
+
+
+def work(text, weak_parents):
+    alive = deque(maxlen=KEEP)
+    for _ in range(DOCUMENTS):
+        obj = JSONObject.loads(text, weak_parents=weak_parents)
+        obj.records._0.meta.views  # read some data
+        alive.append(obj)
+
+
+def measure(text, weak_parents):
+    gc.collect()
+    with GCTimer() as timer:
+        start = time.perf_counter()
+        work(text, weak_parents)
+        elapsed = time.perf_counter() - start
+    gc.collect()
+
+    tracemalloc.start()
+    work(text, weak_parents)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    gc.collect()
+    return elapsed, timer.pauses, peak
+
+
+def main():
+    text = make_document(1000)
+    print(
+        f"{'weak_parents':>12} {'time (s)':>9} {'gen2 runs':>9} {'max pause (ms)':>14} "
+        f"{'total gc (ms)':>13} {'peak (MB)':>9}"
+    )
+    for weak_parents in (False, True):
+        elapsed, pauses, peak = measure(text, weak_parents)
+        all_pauses = [p for generation in pauses.values() for p in generation]
+        print(
+            f"{str(weak_parents):>12} {elapsed:>9.2f} {len(pauses[2]):>9} "
+            f"{max(all_pauses, default=0) * 1000:>14.1f} "
+            f"{sum(all_pauses) * 1000:>13.1f} {peak / 2**20:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Point lookups over a large list of records, with and without hash indexes.
+
+Without an index, every lookup walks the whole tree and compares each leaf with the
+query value through its __eq__ method (JSONStr.__eq__ first checks if the value is a
+datetime string). With the indexes built by JSONCompose.create_index(key, kind="hash"),
+each lookup is a dict hit.
+
+Usage
+-----
+    python -m benchmarks.bench_hash_index
+"""
+import time
+
+from jsonutils.base import JSONObject
+
+RECORDS = 500000
+
+QUERIES = {
+    "get(id=12345)": lambda obj: obj.get(id=12345),
+    "query(sku='SKU-400000')": lambda obj: obj.query(sku="SKU-400000"),
+    "query(sku__in=[...])": lambda obj: obj.query(
+        sku__in=["SKU-1", "SKU-250000", "SKU-499999"]
+    ),
+}
+
+
+def make_records(size):
+    return {
+        "records": [
+            {"id": i, "sku": f"SKU-{i}", "price": i * 0.5, "stock": i % 7}
+            for i in range(size)
+        ]
+    }
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    obj = JSONObject(make_records(RECORDS))
+    print(f"{'query':>24} {'walk (ms)':>10} {'index (ms)':>10}")
+    walks = {name: timed(query, obj) for name, query in QUERIES.items()}
+
+    start = time.perf_counter()
+    obj.create_index("id", kind="hash")
+    obj.create_index("sku", kind="hash")
+    elapsed = time.perf_counter() - start
+    for name, query in QUERIES.items():
+        walk, expected = walks[name]
+        indexed, result = timed(query, obj)
+        assert result == expected
+        print(f"{name:>24} {walk * 1000:>10.1f} {indexed * 1000:>10.3f}")
+    print(f"\nbuild indexes: {elapsed * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
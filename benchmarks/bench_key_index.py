@@ -0,0 +1,80 @@
+"""
+Queries for keys which appear in few nodes of a large tree, with and without a key index.
+
+Without an index, every query walks the whole tree. With the key index built by
+JSONCompose.build_key_index, only the nodes under the requested keys are checked.
+The index is kept up to date as the tree is modified, which is timed too.
+
+Usage
+-----
+    python -m benchmarks.bench_key_index
+"""
+import time
+
+from jsonutils.base import JSONObject
+
+RECORDS = 100000
+UPDATES = 1000
+
+QUERIES = {
+    "get(id=50000)": lambda obj: obj.get(id=50000),
+    "query(discount__gt=0)": lambda obj: obj.query(discount__gt=0),
+    "query(id=500)": lambda obj: obj.query(id=500),
+    "query_key(^disc.*)": lambda obj: obj.query_key("^disc.*"),
+}
+
+
+def make_records(size):
+    return {
+        "records": [
+            {
+                "id": i,
+                "name": f"item-{i}",
+                "price": i * 0.5,
+                "meta": {"created": "2021-05-01 08:00:00", "views": i % 100},
+                **({"discount": 0.25} if i % 10000 == 0 else {}),
+            }
+            for i in range(size)
+        ]
+    }
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start, result
+
+
+def update(obj):
+    for i in range(UPDATES):
+        obj["records"][i].meta.views = i
+
+
+def main():
+    obj = JSONObject(make_records(RECORDS))
+    print(f"{'query':>24} {'walk (ms)':>10} {'index (ms)':>10} {'results':>8}")
+    walks = {}
+    for name, query in QUERIES.items():
+        walks[name] = timed(query, obj)
+
+    elapsed, _ = timed(obj.build_key_index)
+    for name, query in QUERIES.items():
+        walk, expected = walks[name]
+        indexed, result = timed(query, obj)
+        assert result == expected
+        count = len(result) if isinstance(result, list) else 1
+        print(f"{name:>24} {walk * 1000:>10.1f} {indexed * 1000:>10.3f} {count:>8}")
+
+    print(f"\nbuild index: {elapsed * 1000:.1f} ms")
+    obj._indexes = None
+    plain, _ = timed(update, obj)
+    obj.build_key_index()
+    indexed, _ = timed(update, obj)
+    print(
+        f"{UPDATES} updates: {plain * 1000:.1f} ms without index, "
+        f"{indexed * 1000:.1f} ms with index"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Construction time and peak memory of eager vs lazy JSONObject instances.
+
+Documents are lists of dummy_json trees, serialized to raw python objects
+so that both modes start from the same data. Peak memory is measured with tracemalloc.
+
+Usage
+-----
+    python -m benchmarks.bench_lazy
+"""
+import random
+import time
+import tracemalloc
+
+from jsonutils.base import JSONObject
+from jsonutils.functions.dummy import dummy_json
+
+
+def count_nodes(data):
+    if isinstance(data, dict):
+        return 1 + sum(count_nodes(v) for v in data.values())
+    if isinstance(data, list):
+        return 1 + sum(count_nodes(v) for v in data)
+    return 1
+
+
+def measure(data, lazy):
+    tracemalloc.start()
+    start = time.perf_counter()
+    obj = JSONObject(data, lazy=lazy)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del obj
+    return elapsed, peak
+
+
+def main():
+    random.seed(0)
+    print(f"{'nodes':>10} {'eager (s)':>10} {'lazy (s)':>10} {'eager (MB)':>11} {'lazy (MB)':>10}")
+    for size in (10, 100, 1000, 5000):
+        data = [dummy_json(max_depth=3).json_decode for _ in range(size)]
+        eager_time, eager_peak = measure(data, lazy=False)
+        lazy_time, lazy_peak = measure(data, lazy=True)
+        print(
+            f"{count_nodes(data):>10} {eager_time:>10.4f} {lazy_time:>10.4f} "
+            f"{eager_peak / 2**20:>11.2f} {lazy_peak / 2**20:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Queries over several keys of the same records (multiquery mode).
+
+Nodes under the first key of the query are checked against its conditions, and the
+other keys are checked against their siblings, within the same dict record. Queries
+with one and several conditions per sibling key are timed, as well as a query whose
+sibling keys are missing from most records. The check of the compiled plans against
+the nodes under the first key is timed apart from the traversal of the tree.
+
+Usage
+-----
+    python -m benchmarks.bench_multikey_query
+"""
+import gc
+import time
+
+from jsonutils.base import JSONObject
+from jsonutils.functions.parsers import _compile_query
+from jsonutils.query import All
+
+RECORDS = 100000
+REPEATS = 5
+
+QUERIES = {
+    "type, price": {"type": "sale", "price__gt": 50},
+    "type, price, qty": {"type__in": ["sale", "return"], "price__gt": 50, "qty": 1},
+    "price x2, qty x2": {
+        "type": "sale",
+        "price__gt": 50,
+        "price__lt": 90,
+        "qty__gte": 1,
+        "qty__lte": 3,
+    },
+    "missing discount": {"type": "sale", "discount__gt": 0, "price__gt": 50},
+}
+
+
+def make_records(size):
+    return {
+        "records": [
+            {
+                "type": ("sale", "return", "transfer")[i % 3],
+                "price": i % 100,
+                "qty": i % 5,
+                "meta": {"id": i, "tags": ["a", "b"]},
+                **({"discount": 0.1} if i % 1000 == 0 else {}),
+            }
+            for i in range(size)
+        ]
+    }
+
+
+def timed(function, *args, **kwargs):
+    gc.collect()
+    best = None
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        result = function(*args, **kwargs)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def check(plan, nodes):
+    match = plan.match
+    return [node for node in nodes if match(node)]
+
+
+def main():
+    obj = JSONObject(make_records(RECORDS))
+    nodes = list(obj.query(type=All))
+    print(f"{'query':>18} {'query (ms)':>11} {'check (ms)':>11} {'results':>8}")
+    for name, q in QUERIES.items():
+        elapsed, result = timed(obj.query, **q)
+        checked, matches = timed(check, _compile_query(**q), nodes)
+        assert matches == list(result)
+        print(
+            f"{name:>18} {elapsed * 1000:>11.1f} {checked * 1000:>11.1f} "
+            f"{len(result):>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
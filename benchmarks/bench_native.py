@@ -0,0 +1,58 @@
+"""
+Time spent converting a JSONObject into native python objects:
+the former json encode/decode round trip, the direct tree walk (first _data access),
+a cached _data access, and json_decode (a copy of the cached data).
+
+Usage
+-----
+    python -m benchmarks.bench_native
+"""
+import json
+import time
+
+from jsonutils.base import JSONObject
+from jsonutils.encoders import JSONObjectEncoder
+
+
+def make_records(size):
+    return [
+        {
+            "id": i,
+            "name": f"item-{i}",
+            "price": i * 0.5,
+            "active": i % 2 == 0,
+            "parent": None,
+            "tags": ["a", "b", "c"],
+            "meta": {"created": "2021-05-01 08:00:00", "views": i % 100},
+        }
+        for i in range(size)
+    ]
+
+
+def timeit(function):
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def main():
+    print(
+        f"{'records':>10} {'round trip (s)':>15} {'walk (s)':>10} "
+        f"{'cached (s)':>11} {'json_decode (s)':>16}"
+    )
+    for size in (1000, 10000, 50000):
+        obj = JSONObject(make_records(size))
+        round_trip = timeit(
+            lambda: json.loads(json.dumps(obj, cls=JSONObjectEncoder))
+        )
+        walk = timeit(lambda: obj._data)
+        cached = timeit(lambda: obj._data)
+        decode = timeit(lambda: obj.json_decode)
+        print(
+            f"{size:>10} {round_trip:>15.4f} {walk:>10.4f} "
+            f"{cached:>11.6f} {decode:>16.4f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Memory used by a single node of each type, measured with tracemalloc.
+
+Each node type is instantiated many times, linked to a parent like in a real tree,
+and the traced memory is divided by the number of nodes.
+
+Usage
+-----
+    python -m benchmarks.bench_node_memory
+"""
+import tracemalloc
+
+from jsonutils.base import (
+    JSONBool,
+    JSONDict,
+    JSONFloat,
+    JSONInt,
+    JSONList,
+    JSONNull,
+    JSONStr,
+)
+
+N = 100000
+
+FACTORIES = {
+    "JSONStr": lambda i: JSONStr("value"),
+    "JSONInt": lambda i: JSONInt(1000 + i),
+    "JSONFloat": lambda i: JSONFloat(i + 0.5),
+    "JSONBool": lambda i: JSONBool(True),
+    "JSONNull": lambda i: JSONNull(None),
+    "JSONDict": lambda i: JSONDict(),
+    "JSONList": lambda i: JSONList(),
+}
+
+
+def measure(factory):
+    parent = JSONList()
+    tracemalloc.start()
+    nodes = []
+    for i in range(N):
+        node = factory(i)
+        node._index = i
+        node.parent = parent
+        nodes.append(node)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # discount the list that holds the nodes
+    return (current - nodes.__sizeof__()) / N
+
+
+def main():
+    print(f"{'node':>10} {'bytes/node':>11}")
+    for name, factory in FACTORIES.items():
+        print(f"{name:>10} {measure(factory):>11.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Build time, peak memory and query time of long numeric lists, stored as plain JSONList instances
+(one JSONFloat node per item) or as array-backed JSONNumericList instances.
+
+The query compares every series against a list of thresholds (gt action), and the sum is computed
+with a QuerySet built from the last series.
+
+Usage
+-----
+    python -m benchmarks.bench_numeric_list
+"""
+import random
+import time
+import tracemalloc
+
+import jsonutils.config as config
+from jsonutils.base import JSONObject
+from jsonutils.functions.arrays import _numpy
+from jsonutils.query import QuerySet
+
+SERIES = 10
+
+
+def make_data(size):
+    return {
+        f"series{i}": [random.uniform(0, 100) for _ in range(size)]
+        for i in range(SERIES)
+    }
+
+
+def measure(data, min_length):
+    config.NUMERIC_ARRAY_MIN_LENGTH = min_length
+    thresholds = [-1.0] * len(data["series0"])
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    obj = JSONObject(data)
+    build_time = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    for i in range(SERIES):
+        obj.query(recursive_=False, **{f"series{i}__gt": thresholds}).exists()
+    query_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    QuerySet(obj[f"series{SERIES - 1}"]).sum()
+    sum_time = time.perf_counter() - start
+
+    return build_time, peak, query_time, sum_time
+
+
+def main():
+    random.seed(0)
+    _numpy()  # import numpy (if installed) before timing
+    default_min_length = config.NUMERIC_ARRAY_MIN_LENGTH
+    print(
+        f"{'items':>10} {'mode':>8} {'build (s)':>10} {'peak (MB)':>10} "
+        f"{'query (s)':>10} {'sum (s)':>8}"
+    )
+    for size in (1000, 10000, 100000):
+        data = make_data(size)
+        for mode, min_length in (("list", None), ("array", default_min_length)):
+            build_time, peak, query_time, sum_time = measure(data, min_length)
+            print(
+                f"{size * SERIES:>10} {mode:>8} {build_time:>10.3f} {peak / 2**20:>10.2f} "
+                f"{query_time:>10.3f} {sum_time:>8.3f}"
+            )
+    config.NUMERIC_ARRAY_MIN_LENGTH = default_min_length
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+A query over a large top-level list of records, checked by 1 to N worker processes.
+
+With query(..., workers_=N), the records are split into shards which are checked by a pool of
+processes, and the matches are resolved back into the nodes of the original tree.
+The pool is created for each query, so its start-up time is included.
+
+Usage
+-----
+    python -m benchmarks.bench_parallel_query [max workers]
+"""
+import os
+import sys
+import time
+
+from jsonutils.base import JSONObject
+
+RECORDS = 200000
+
+
+def make_records(size):
+    return [
+        {
+            "id": i,
+            "user": {"name": f"user-{i % 5000}", "country": ["ES", "FR", "DE"][i % 3]},
+            "amount": round(i * 0.37 % 1000, 2),
+            "items": [{"sku": f"SKU-{i % 997}", "qty": i % 5}],
+        }
+        for i in range(size)
+    ]
+
+
+def main():
+    max_workers = int(sys.argv[1]) if len(sys.argv) > 1 else os.cpu_count()
+    obj = JSONObject(make_records(RECORDS))
+
+    def query(workers):
+        return obj.query(amount__gt=990, workers_=workers)
+
+    print(f"{'workers':>8} {'time (ms)':>10} {'speedup':>8} {'results':>8}")
+    start = time.perf_counter()
+    expected = query(None)
+    sequential = time.perf_counter() - start
+    print(f"{1:>8} {sequential * 1000:>10.1f} {1:>8.2f} {len(expected):>8}")
+
+    workers = 2
+    while workers <= max_workers:
+        start = time.perf_counter()
+        result = query(workers)
+        elapsed = time.perf_counter() - start
+        assert all(a is b for a, b in zip(result, expected))
+        assert len(result) == len(expected)
+        speedup = sequential / elapsed
+        print(f"{workers:>8} {elapsed * 1000:>10.1f} {speedup:>8.2f} {len(result):>8}")
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main()
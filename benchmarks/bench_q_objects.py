@@ -0,0 +1,98 @@
+"""
+An OR of conditions over the records of a document: several queries merged by hand,
+against a single query with Q objects.
+
+The Q query checks each record once, and its conditions are sorted by their estimated cost.
+Each Q object is written with its expensive conditions first (a datetime comparison, which
+parses the child of every record, and a regex), followed by a cheap and selective one
+(an exact status, which few records have). With cost ordering the status is checked first,
+so the expensive conditions are only checked for the few records which have it.
+The same Q query without cost ordering (conditions in the written order) is timed too.
+
+Times are CPU times, the best of several interleaved runs.
+
+Usage
+-----
+    python -m benchmarks.bench_q_objects
+"""
+import time
+from unittest import mock
+
+import jsonutils.functions.parsers as parsers
+from jsonutils.base import JSONObject
+from jsonutils.query import Q
+
+RECORDS = 20000
+REPEAT = 5
+
+STATUSES = ["paid"] * 48 + ["refunded", "disputed"]
+
+# expensive conditions first, then a cheap one which few records satisfy
+QUERIES = (
+    dict(created__gte="2021-06-01", note__regex=r"carrier-1[0-2]$", status="refunded"),
+    dict(created__lt="2021-03-01", note__regex=r"carrier-[0-3]$", status="disputed"),
+)
+
+
+def make_orders(size):
+    return [
+        {
+            "id": i,
+            "created": f"2021-{i % 12 + 1:02d}-{i % 28 + 1:02d} 10:00:00",
+            "status": STATUSES[i % len(STATUSES)],
+            "note": f"order {i} shipped by carrier-{i % 13}",
+            "total": round(i * 7.3 % 500, 2),
+        }
+        for i in range(size)
+    ]
+
+
+def by_hand(obj):
+    found = {}
+    for q in QUERIES:
+        for node in obj.query(include_parent_=True, **q):
+            found[id(node)] = node
+    # merged in document order
+    return [node for node in obj if id(node) in found]
+
+
+def with_q(obj):
+    first, second = QUERIES
+    return obj.query(Q(**first) | Q(**second))
+
+
+def written_order(obj):
+    with mock.patch.object(parsers, "_condition_cost", lambda steps, value: 0):
+        return with_q(obj)
+
+
+def timed(function, *args):
+    start = time.process_time()
+    result = function(*args)
+    return time.process_time() - start, result
+
+
+def main():
+    obj = JSONObject(make_orders(RECORDS))
+    functions = {
+        "separate queries": by_hand,
+        "Q, written order": written_order,
+        "Q, cost order": with_q,
+    }
+    expected = by_hand(obj)
+    timings = {name: [] for name in functions}
+
+    # runs are interleaved, so that a noisy machine slows all of them down alike
+    for _ in range(REPEAT):
+        for name, function in functions.items():
+            elapsed, result = timed(function, obj)
+            assert result == expected
+            timings[name].append(elapsed)
+
+    print(f"{len(expected)} of {RECORDS} records (best of {REPEAT} runs, CPU time)")
+    for name, elapsed in timings.items():
+        print(f"{name:>18}: {min(elapsed) * 1000:>8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Time of the same queries over a tree of about one million nodes.
+
+Usage
+-----
+    python -m benchmarks.bench_query
+"""
+import time
+
+from jsonutils.base import JSONObject
+
+RECORDS = 100000
+
+QUERIES = {
+    "price__gt=49000": lambda obj: obj.query(price__gt=49000),
+    "name__contains": lambda obj: obj.query(name__contains="item-9999"),
+    "views__lt=10, created": lambda obj: obj.query(
+        views__lt=10, created__contains="08:00:01"
+    ),
+    "views__parent__c_created": lambda obj: obj.query(
+        views__parent__c_created__contains="2021-05-01 08:00:0"
+    ),
+    "query_key(^na.*)": lambda obj: obj.query_key("^na.*", contains="item-9999"),
+    "get(id=500)": lambda obj: obj.get(id=500),
+    "query(views=5).first()": lambda obj: obj.query(views=5).first(),
+    "iquery(views=5).first()": lambda obj: obj.iquery(views=5).first(),
+    "iquery(views=5).exists()": lambda obj: obj.iquery(views=5).exists(),
+}
+
+
+def make_records(size):
+    return {
+        "records": [
+            {
+                "id": i,
+                "name": f"item-{i}",
+                "price": i * 0.5,
+                "tags": ["a", "b"],
+                "meta": {"created": f"2021-05-01 08:00:0{i % 10}", "views": i % 100},
+            }
+            for i in range(size)
+        ]
+    }
+
+
+def count_nodes(data):
+    if isinstance(data, dict):
+        return 1 + sum(count_nodes(v) for v in data.values())
+    if isinstance(data, list):
+        return 1 + sum(count_nodes(v) for v in data)
+    return 1
+
+
+def main():
+    data = make_records(RECORDS)
+    obj = JSONObject(data)
+    print(f"{count_nodes(data)} nodes")
+    print(f"{'query':>28} {'time (s)':>9} {'results':>8}")
+    for name, query in QUERIES.items():
+        start = time.perf_counter()
+        result = query(obj)
+        elapsed = time.perf_counter() - start
+        count = len(result) if isinstance(result, list) else 1
+        print(f"{name:>28} {elapsed:>9.3f} {count:>8}")
+
+
+if __name__ == "__main__":
+    main()
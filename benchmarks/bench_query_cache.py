@@ -0,0 +1,67 @@
+"""
+The same handful of queries sent many times to a mostly static configuration document,
+with and without the query cache.
+
+Without the cache, every call walks the whole tree. With JSONCompose.enable_query_cache,
+the results are reused until the document is modified, which happens once in a while here.
+
+Usage
+-----
+    python -m benchmarks.bench_query_cache
+"""
+import time
+
+from jsonutils.base import JSONObject
+
+SERVICES = 2000
+CALLS = 400
+UPDATE_EVERY = 100  # calls between modifications of the document
+
+QUERIES = [
+    lambda obj: obj.get(name="service-1500"),
+    lambda obj: obj.query(port__gte=9000),
+    lambda obj: obj.query(enabled=False, include_parent_=True),
+    lambda obj: obj.query_key("timeout.*"),
+]
+
+
+def make_config(size):
+    return {
+        "version": 1,
+        "services": [
+            {
+                "name": f"service-{i}",
+                "port": 8000 + i,
+                "enabled": i % 7 != 0,
+                "limits": {"timeout_ms": 100 + i % 50, "retries": i % 3},
+                "tags": ["internal" if i % 2 else "public", f"zone-{i % 4}"],
+            }
+            for i in range(size)
+        ],
+    }
+
+
+def serve(obj):
+    start = time.perf_counter()
+    for call in range(CALLS):
+        QUERIES[call % len(QUERIES)](obj)
+        if call % UPDATE_EVERY == UPDATE_EVERY - 1:
+            obj.version += 1
+    return time.perf_counter() - start
+
+
+def main():
+    obj = JSONObject(make_config(SERVICES))
+    uncached = serve(obj)
+    obj.enable_query_cache(maxsize=32)
+    cached = serve(obj)
+
+    print(f"{CALLS} calls of {len(QUERIES)} queries, an update every {UPDATE_EVERY}")
+    for name, elapsed in (("no cache", uncached), ("cache", cached)):
+        per_call = elapsed / CALLS * 1000
+        print(f"{name:>10}: {elapsed * 1000:>9.1f} ms ({per_call:.3f} ms/call)")
+    print(obj.query_cache_info())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Key pattern queries (query_key, get_key and filter_key) over a large tree with few distinct keys.
+
+Every node is checked against the key pattern of the query. Node keys are interned as the
+tree is loaded, and the match of each pattern against each distinct key is cached, so a
+node only costs a dict lookup instead of a regex match. Loading time is timed as well.
+
+Usage
+-----
+    python -m benchmarks.bench_query_key
+"""
+import gc
+import json
+import time
+
+from jsonutils.base import JSONObject
+from jsonutils.query import All, I
+
+RECORDS = 50000
+REPEATS = 3
+
+FIELDS = [
+    "id",
+    "name",
+    "description",
+    "created_at",
+    "updated_at",
+    "unit_price",
+    "discount_price",
+    "quantity",
+    "customer_id",
+    "customer_name",
+]
+
+QUERIES = {
+    "query_key(.*_price)": lambda obj: obj.query_key(r".*_price"),
+    "query_key(I(CUSTOMER_.*))": lambda obj: obj.query_key(I("CUSTOMER_.*")),
+    "query_key(id|.*_id)": lambda obj: obj.query_key(r"id|.*_id"),
+    "get_key(discount_price)": lambda obj: obj.get_key("discount_price", exact=49980),
+    "filter_key(.*_at)": lambda obj: obj.query(id=All).filter_key(
+        r".*_at", contains="2021"
+    ),
+}
+
+
+def make_records(size):
+    return {
+        "records": [
+            {
+                **{field: f"{field}-{i}" for field in FIELDS},
+                "unit_price": i,
+                "discount_price": i - 10,
+                "created_at": "2021-05-01 08:00:00",
+                "tags": ["a", "b"],
+                "extra": {"customer_id": i, "customer_notes": "none"},
+            }
+            for i in range(size)
+        ]
+    }
+
+
+def timed(function, *args):
+    gc.collect()
+    best = None
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        result = function(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    text = json.dumps(make_records(RECORDS))
+    load, obj = timed(JSONObject.loads, text)
+    print(f"load: {load * 1000:.1f} ms\n")
+    print(f"{'query':>28} {'time (ms)':>10} {'results':>8}")
+    for name, query in QUERIES.items():
+        elapsed, result = timed(query, obj)
+        count = len(result) if isinstance(result, list) else 1
+        print(f"{name:>28} {elapsed * 1000:>10.1f} {count:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+A report built from many different queries over the same document:
+one query() call for each of them, against a single query_many() call.
+
+query_many walks the tree once, and each node is only checked against the queries
+whose target key it has.
+
+Usage
+-----
+    python -m benchmarks.bench_query_many
+"""
+import time
+
+from jsonutils.base import JSONObject
+
+RECORDS = 20000
+COUNTRIES = ["ES", "FR", "DE", "IT", "PT"]
+
+
+def make_orders(size):
+    return {
+        "orders": [
+            {
+                "id": i,
+                "status": ["paid", "pending", "refunded"][i % 3],
+                "total": round(i * 7.3 % 500, 2),
+                "customer": {
+                    "name": f"customer-{i % 800}",
+                    "country": COUNTRIES[i % 5],
+                },
+                "lines": [{"sku": f"SKU-{i % 97}", "qty": i % 4 + 1}],
+            }
+            for i in range(size)
+        ]
+    }
+
+
+def make_specs():
+    specs = {}
+    for country in COUNTRIES:
+        specs[f"customers_{country}"] = {"country": country, "include_parent_": True}
+    for status in ("paid", "pending", "refunded"):
+        specs[f"orders_{status}"] = {"status": status, "include_parent_": True}
+        specs[f"big_{status}"] = {"status": status, "total__gt": 450}
+    for limit in range(50, 500, 50):
+        specs[f"total_lt_{limit}"] = {"total__lt": limit}
+    for sku in range(0, 97, 8):
+        specs[f"sku_{sku}"] = {"sku": f"SKU-{sku}"}
+    specs["bulk"] = {"qty__gte": 4}
+    specs["first_refund"] = {"status": "refunded", "stop_at_match_": 1}
+    return specs
+
+
+def main():
+    obj = JSONObject(make_orders(RECORDS))
+    specs = make_specs()
+
+    start = time.perf_counter()
+    expected = {name: obj.query(**q) for name, q in specs.items()}
+    separate = time.perf_counter() - start
+
+    start = time.perf_counter()
+    results = obj.query_many(specs)
+    batch = time.perf_counter() - start
+
+    assert all(results[name] == expected[name] for name in specs)
+    print(f"{len(specs)} queries over {RECORDS} records")
+    print(f"{'query() each':>16}: {separate * 1000:>9.1f} ms")
+    print(f"{'query_many()':>16}: {batch * 1000:>9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Queries restricted to a part of a large document with within_ and max_depth_.
+
+The records under data/*/items are surrounded by large sibling subtrees (metadata, links
+and included resources) which hold the same keys. A query plus a post-filter on the paths
+of its results has to visit all of them; a query with within_="data/*/items" doesn't
+traverse the subtrees which can't lead to that path, and max_depth_ stops the traversal
+below a given level. Visited nodes are counted by wrapping the match of the query plan.
+
+Usage
+-----
+    python -m benchmarks.bench_query_scope
+"""
+import gc
+import time
+
+import jsonutils.base as base
+from jsonutils.base import JSONObject
+
+RESOURCES = 1000
+ITEMS = 10
+SIBLINGS = 20
+
+
+def make_document():
+    def resource(i):
+        return {
+            "id": i,
+            "items": [
+                {"id": j, "price": j, "options": [{"price": j + k} for k in range(3)]}
+                for j in range(ITEMS)
+            ],
+            "metadata": {f"field{k}": {"price": k, "id": k} for k in range(SIBLINGS)},
+            "links": [{"href": f"/items/{i}/{k}", "price": k} for k in range(SIBLINGS)],
+        }
+
+    return {
+        "data": [resource(i) for i in range(RESOURCES)],
+        "included": [resource(i) for i in range(RESOURCES)],
+    }
+
+
+class CountedPlan:
+    """Query plan which counts the nodes it checks"""
+
+    visits = 0
+
+    def __init__(self, plan):
+        self.plan = plan
+
+    def __getattr__(self, name):
+        return getattr(self.plan, name)
+
+    def match(self, node):
+        CountedPlan.visits += 1
+        return self.plan.match(node)
+
+
+def count_visits():
+    """Wrap the compilation of queries so that the nodes checked by their plans are counted"""
+
+    compile_query = base._compile_query
+    base._compile_query = lambda *args, **q: CountedPlan(compile_query(*args, **q))
+    return lambda: setattr(base, "_compile_query", compile_query)
+
+
+def in_items(node, max_depth=None):
+    path = node.jsonpath.keys
+    return (
+        len(path) > 3
+        and path[0] == "data"
+        and path[2] == "items"
+        and (max_depth is None or len(path) <= max_depth)
+    )
+
+
+# pairs of queries with the same results: a full query filtered by the paths of its
+# results, and the same query with a scope
+QUERIES = {
+    "within_": (
+        lambda obj: [node for node in obj.query(price__gte=5) if in_items(node)],
+        lambda obj: list(obj.query(price__gte=5, within_="data/*/items")),
+    ),
+    "within_ + max_depth_": (
+        lambda obj: [node for node in obj.query(price__gte=5) if in_items(node, 5)],
+        lambda obj: list(
+            obj.query(price__gte=5, within_="data/*/items", max_depth_=5)
+        ),
+    ),
+}
+
+
+def timed(function, *args):
+    gc.collect()
+    start = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    obj = JSONObject(make_document())
+    restore = count_visits()
+    print(
+        f"{'scope':>22} {'filter (ms)':>11} {'scoped (ms)':>11} "
+        f"{'visited':>10} {'scoped':>8} {'results':>8}"
+    )
+    try:
+        for name, (filtered, scoped) in QUERIES.items():
+            CountedPlan.visits = 0
+            filter_time, expected = timed(filtered, obj)
+            filter_visits, CountedPlan.visits = CountedPlan.visits, 0
+            scoped_time, result = timed(scoped, obj)
+            assert result == expected
+            print(
+                f"{name:>22} {filter_time * 1000:>11.1f} {scoped_time * 1000:>11.1f} "
+                f"{filter_visits:>10} {CountedPlan.visits:>8} {len(result):>8}"
+            )
+    finally:
+        restore()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Peak memory of JSONObject instances with and without shared leaves.
+
+Documents are telemetry-like records, mostly made of nulls, booleans and a small set of
+repeated strings and ints. Peak memory is measured with tracemalloc.
+
+Usage
+-----
+    python -m benchmarks.bench_shared_leaves
+"""
+import time
+import tracemalloc
+
+from jsonutils.base import JSONObject
+
+STATUSES = ("ok", "warning", "error", "unknown")
+
+
+def make_records(size):
+    return [
+        {
+            "device": f"sensor-{i % 50}",
+            "status": STATUSES[i % len(STATUSES)],
+            "code": 200 if i % 7 else 500,
+            "online": i % 3 != 0,
+            "error": None,
+            "battery": None if i % 5 else 100,
+            "flags": [False, True, None, False],
+        }
+        for i in range(size)
+    ]
+
+
+def measure(data, share_leaves):
+    tracemalloc.start()
+    start = time.perf_counter()
+    obj = JSONObject(data, share_leaves=share_leaves)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del obj
+    return elapsed, peak
+
+
+def main():
+    print(
+        f"{'records':>10} {'plain (s)':>10} {'shared (s)':>11} "
+        f"{'plain (MB)':>11} {'shared (MB)':>12}"
+    )
+    for size in (1000, 10000, 50000):
+        data = make_records(size)
+        plain_time, plain_peak = measure(data, share_leaves=False)
+        shared_time, shared_peak = measure(data, share_leaves=True)
+        print(
+            f"{size:>10} {plain_time:>10.3f} {shared_time:>11.3f} "
+            f"{plain_peak / 2**20:>11.2f} {shared_peak / 2**20:>12.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Text searches over a synthetic log corpus, with and without a trigram index.
+
+Without an index, every query checks each message with _contains/_icontains/_regex.
+With the index built by JSONCompose.create_index(key, kind="text"), only the messages
+which have all the trigrams of the requested text are checked.
+
+Usage
+-----
+    python -m benchmarks.bench_text_index
+"""
+import gc
+import random
+import time
+
+from jsonutils.base import JSONObject
+
+RECORDS = 200000
+
+TEMPLATES = [
+    "GET /api/v1/items/{id} 200 in {ms}ms",
+    "POST /api/v1/orders 201 in {ms}ms",
+    "user {id} logged in from 10.0.{a}.{b}",
+    "cache miss for key item:{id}",
+    "Connection TIMEOUT to db-{a} after {ms}ms",
+    "worker {a} finished job {id}",
+]
+RARE = "upstream timeout while reading response header from node-{a}"
+
+QUERIES = {
+    "icontains('timeout')": lambda obj: obj.query(message__icontains="timeout"),
+    "contains('upstream')": lambda obj: obj.query(message__contains="upstream"),
+    "regex(r'node-1\\d$')": lambda obj: obj.query(message__regex=r"node-1\d$"),
+    "regex('(?i)db-7 after')": lambda obj: obj.query(message__regex="(?i)db-7 after"),
+}
+FILTERS = {
+    "filter(icontains=...)": lambda errors: errors.filter(
+        message__icontains="upstream timeout"
+    ),
+}
+
+
+def make_logs(size):
+    rnd = random.Random(0)
+    logs = []
+    for i in range(size):
+        template = RARE if i % 5000 == 0 else rnd.choice(TEMPLATES)
+        values = dict(id=i, ms=rnd.randrange(1000), a=rnd.randrange(20), b=i % 256)
+        logs.append(
+            {
+                "timestamp": f"2021-05-01 08:{i // 60 % 60:02d}:{i % 60:02d}",
+                "level": rnd.choice(["info", "warn", "error"]),
+                "message": template.format(**values),
+            }
+        )
+    return {"logs": logs}
+
+
+def timed(function, *args):
+    # a full collection of the large corpus would otherwise land in whichever query runs first
+    gc.collect()
+    start = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    obj = JSONObject(make_logs(RECORDS))
+    print(f"{'query':>26} {'scan (ms)':>10} {'index (ms)':>10} {'results':>8}")
+    errors = obj.query(level="error")
+    scans = {name: timed(query, obj) for name, query in QUERIES.items()}
+    scans.update((name, timed(query, errors)) for name, query in FILTERS.items())
+
+    elapsed, _ = timed(obj.create_index, "message", "text")
+    for name, query in {**QUERIES, **FILTERS}.items():
+        scan, expected = scans[name]
+        indexed, result = timed(query, errors if name in FILTERS else obj)
+        assert result == expected
+        print(
+            f"{name:>26} {scan * 1000:>10.1f} {indexed * 1000:>10.1f} {len(result):>8}"
+        )
+    print(f"\nbuild index: {elapsed * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Range queries over a large tree, with and without sorted value indexes.
+
+Without an index, every query walks the whole tree and parses each candidate leaf
+(JSONStr.__gt__ -> parse_datetime/parse_float). With the indexes built by
+JSONCompose.create_index, values are parsed once and each query is a binary search.
+The indexes are kept up to date as the tree is modified, which is timed too.
+
+Usage
+-----
+    python -m benchmarks.bench_value_index
+"""
+import time
+
+from jsonutils.base import JSONObject
+
+RECORDS = 100000
+UPDATES = 1000
+
+QUERIES = {
+    "timestamp__gte": lambda obj: obj.query(timestamp__gte="2021-05-01 23:50:00"),
+    "timestamp range": lambda obj: obj.query(
+        timestamp__gte="2021-05-01 10:00:00", timestamp__lt="2021-05-01 10:10:00"
+    ),
+    "price__lt": lambda obj: obj.query(price__lt=100),
+    "name__startswith": lambda obj: obj.query(name__startswith="item-9999"),
+}
+
+
+def make_records(size):
+    return {
+        "records": [
+            {
+                "id": i,
+                "name": f"item-{i}",
+                "price": f"$ {i * 0.5:.2f}",
+                "timestamp": f"2021-05-01 {i // 3600 % 24:02d}:{i // 60 % 60:02d}:00",
+            }
+            for i in range(size)
+        ]
+    }
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start, result
+
+
+def update(obj):
+    for i in range(UPDATES):
+        obj["records"][i].price = i
+
+
+def main():
+    obj = JSONObject(make_records(RECORDS))
+    print(f"{'query':>18} {'walk (ms)':>10} {'index (ms)':>10} {'results':>8}")
+    walks = {name: timed(query, obj) for name, query in QUERIES.items()}
+
+    start = time.perf_counter()
+    obj.create_index("timestamp", kind="datetime")
+    obj.create_index("price", kind="number")
+    obj.create_index("name", kind="string")
+    elapsed = time.perf_counter() - start
+    for name, query in QUERIES.items():
+        walk, expected = walks[name]
+        indexed, result = timed(query, obj)
+        assert result == expected
+        print(
+            f"{name:>18} {walk * 1000:>10.1f} {indexed * 1000:>10.3f} {len(result):>8}"
+        )
+
+    print(f"\nbuild indexes: {elapsed * 1000:.1f} ms")
+    indexes, obj._indexes = obj._indexes, None
+    plain, _ = timed(update, obj)
+    obj._indexes = indexes
+    for index in indexes:
+        index.rebuild()
+    indexed, _ = timed(update, obj)
+    assert all(index.is_fresh for index in indexes)
+    print(
+        f"{UPDATES} updates: {plain * 1000:.1f} ms without indexes, "
+        f"{indexed * 1000:.1f} ms with indexes"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,23 @@
 """
 This module contains the base objects of the JSON structure
 """
+import copy
 import json
+import pickle
 import sys
+import weakref
 from datetime import date, datetime, time
+from functools import wraps
+from itertools import islice
 from pathlib import Path
-from uuid import uuid4
 
 import requests
 from bs4 import BeautifulSoup
 
+import jsonutils.columnar as columnar
 import jsonutils.config as config
-from jsonutils.cache import memoized_method
+import jsonutils.parallel as parallel
+from jsonutils.cache import LRUCache
 from jsonutils.encoders import JSONObjectEncoder
 from jsonutils.exceptions import (
     JSONDecodeException,
@@ -19,15 +25,20 @@ from jsonutils.exceptions import (
     JSONQueryException,
     JSONQueryMultipleValues,
 )
+from jsonutils.functions.arrays import _numeric_array
 from jsonutils.functions.decorators import (
     catch_exceptions,
     dummy,
     return_value_on_exception,
 )
 from jsonutils.functions.parsers import (
+    _BatchPlan,
+    _compile_query,
+    _compile_query_key,
+    _frozen,
+    _is_datetime_string,
+    _PathScope,
     _parse_html_table,
-    _parse_query,
-    _parse_query_key,
     _to_django_model,
     parse_bool,
     parse_datetime,
@@ -42,9 +53,10 @@ from jsonutils.functions.seekers import (
     _set_object,
     empty,
 )
-from jsonutils.query import All, KeyQuerySet, ParentList, QuerySet
+from jsonutils.indexes import _MISSING, HashIndex, KeyIndex, TextIndex, ValueIndex
+from jsonutils.query import All, KeyQuerySet, LazyQuerySet, ParentList, QuerySet
 from jsonutils.utils.dict import (
-    UUIDdict,
+    ChildObjects,
     ValuesDict,
     _rename_keys,
     _rename_keys_inplace,
@@ -111,6 +123,102 @@ def NumpyInt8():
 
 # ----------------------
 
+# raw values whose nodes can be shared among several positions of a tree (see share_leaves argument)
+_SHAREABLE_TYPES = (str, int, float, bool, type(None))
+
+# query arguments which can't be evaluated within the traversal of query_many
+_UNBATCHED_ARGUMENTS = ("workers_", "within_", "max_depth_")
+
+
+def _intern_key(key):
+    """Dict key as it is stored in node keys: trees have few distinct keys, so str keys are interned"""
+
+    if key.__class__ is str:
+        return sys.intern(key)
+    return key
+
+
+def _json_key(key):
+    """Dict key as it is serialized by the json encoder (keys of a JSON object are always strings)"""
+
+    if key.__class__ is str:
+        return key
+    elif key is True:
+        return "true"
+    elif key is False:
+        return "false"
+    elif key is None:
+        return "null"
+    elif isinstance(key, float):
+        return json.dumps(key)
+    elif isinstance(key, int):
+        return int.__repr__(key)
+    raise TypeError(
+        f"keys must be str, int, float, bool or None, not {key.__class__.__name__}"
+    )
+
+
+def _native_copy(data):
+    """
+    Deep copy of a native python object (made of dicts, lists and scalars).
+    A pickle round trip is much faster than a recursive copy for this kind of objects.
+    """
+    try:
+        return pickle.loads(pickle.dumps(data, pickle.HIGHEST_PROTOCOL))
+    except Exception:  # maybe unknown objects which can't be pickled
+        return copy.deepcopy(data)
+
+
+def _native(value):
+    """Native python object of a child, which can be a node or a raw python object (children of lazy nodes)"""
+
+    if not isinstance(value, JSONNode):
+        value = JSONObject(value, lazy=True)
+    return value._data
+
+
+def _iter_results(nodes, include_parent):
+    """Results of a query from the nodes which satisfy it (or their parents, if include_parent)"""
+
+    for node in nodes:
+        yield node.parent if include_parent else node
+
+
+def _iter_matches(nodes, plan, include_parent):
+    """Results of a query from the candidate nodes which satisfy its compiled plan"""
+
+    match = plan.match
+    for node in nodes:
+        if match(node):
+            yield node.parent if include_parent else node
+
+
+def _query_options(q):
+    """
+    (q, recursive, include_parent, stop_at_match, native_types) tuple from the arguments of a query,
+    where q keeps the query arguments only and the options which are not set take their config values.
+    """
+
+    q = dict(q)
+    recursive = q.pop("recursive_", None)
+    include_parent = q.pop("include_parent_", None)
+    stop_at_match = q.pop("stop_at_match_", None)
+    native_types = q.pop("native_types_", None)
+    if not isinstance(stop_at_match, (int, type(None))):
+        raise TypeError(
+            f"Argument stop_at_match_ must be an integer or NoneType, not {type(stop_at_match)}"
+        )
+
+    # ---- DYNAMIC CONFIG ----
+    if recursive is None:
+        recursive = config.RECURSIVE_QUERIES
+    if include_parent is None:
+        include_parent = config.INCLUDE_PARENTS
+    if native_types is None:
+        native_types = config.NATIVE_TYPES
+    # ------------------------
+    return q, recursive, include_parent, stop_at_match or None, native_types
+
 
 class JSONPath:
     """
@@ -212,12 +320,28 @@ class JSONObject:
         "_key",
         "_index",
         "parent",
-        "_id",
-        "_child_objects",
+        "_parent",
         "_is_annotation",
+        "_lazy",
+        "_annotations",
+        "_leaf_pool",
+        "_data_cache",
+        "_cow",
+        "_weak_parents",
+        "_indexes",
+        "_query_cache",
+        "_ancestor_cache",
     )
 
-    def __new__(cls, data=None, raise_exception=False, serialize_nodes=False):
+    def __new__(
+        cls,
+        data=None,
+        raise_exception=False,
+        serialize_nodes=False,
+        lazy=False,
+        share_leaves=False,
+        weak_parents=False,
+    ):
         """
         Params:
         ------
@@ -226,20 +350,38 @@ class JSONObject:
                 instance will be created for such a data.
             serialize_nodes: if True and data represents a node instance, then take it as a raw data, discarding
                 all its old node attributes (like jsonpath, parent, etc).
+            lazy: if True, composed objects keep their raw children and only wrap them into nodes
+                when they are first accessed (by key, query, path evaluation or iteration).
+            share_leaves: if True, equal str, int, float, bool and null leaves are stored only once in the whole tree.
+                Their position is given by the parent when they are accessed, so each occurrence keeps
+                its own jsonpath. A dict can also be passed, and it will be used as the pool of shared leaves
+                (to share them among several objects).
+            weak_parents: if True, child nodes keep a weak reference to their parent, so the tree has no reference
+                cycles and it is freed as soon as it is no longer used (without waiting for the garbage collector).
+                Then, a node whose root object is not referenced anymore loses its parent (and its jsonpath).
         """
         if not isinstance(raise_exception, bool):
             raise TypeError(
                 f"raise_exception argument must be a boolean, not {type(raise_exception)}"
             )
+        leaf_pool = cls._resolve_leaf_pool(share_leaves)
+
         if isinstance(data, JSONNode):
             if serialize_nodes:
-                return cls(data._data)
+                return cls(
+                    data._data,
+                    lazy=lazy,
+                    share_leaves=share_leaves,
+                    weak_parents=weak_parents,
+                )
             else:
                 return data
         elif isinstance(data, type(None)):
             return JSONNull(data)
         elif isinstance(data, dict):
-            return JSONDict(data)
+            return JSONDict._new_node(
+                data, lazy=lazy, leaf_pool=leaf_pool, weak_parents=weak_parents
+            )
         elif isinstance(data, bool):
             return JSONBool(data)
         elif isinstance(data, str):
@@ -252,9 +394,20 @@ class JSONObject:
             return JSONInt(data)
         # data from external libraries
         elif isinstance(data, (list, tuple, DjangoQuerySet())):
-            return JSONList(data)
+            if JSONNumericList._is_numeric(data):
+                return JSONNumericList._new_node(
+                    data, leaf_pool=leaf_pool, weak_parents=weak_parents
+                )
+            return JSONList._new_node(
+                data, lazy=lazy, leaf_pool=leaf_pool, weak_parents=weak_parents
+            )
         elif isinstance(data, PandasDataFrame()):
-            return JSONDict(json.loads(data.to_json()))
+            return cls(
+                json.loads(data.to_json()),
+                lazy=lazy,
+                share_leaves=share_leaves,
+                weak_parents=weak_parents,
+            )
         elif isinstance(data, (NumpyFloat64(), NumpyFloat32(), NumpyFloat16())):
             return JSONFloat(data)
         elif isinstance(data, (NumpyInt64(), NumpyInt8())):
@@ -265,12 +418,53 @@ class JSONObject:
             else:
                 raise JSONDecodeException(f"Wrong data's format: {type(data)}")
 
+    @staticmethod
+    def _resolve_leaf_pool(share_leaves):
+        """Returns the pool of shared leaves for a share_leaves argument (None if leaves are not shared)"""
+
+        if isinstance(share_leaves, dict):
+            return share_leaves
+        elif share_leaves:
+            return {}
+        return None
+
+    @staticmethod
+    def _decoder_hooks(leaf_pool=None, weak_parents=False):
+        """
+        Keyword arguments for the json decoder, so that the node tree is built while parsing (in a single pass).
+        Each JSON object is built as a JSONDict node as soon as it is parsed, and its children
+        (nodes of nested objects, raw lists and raw values) are linked to it at that moment.
+        """
+
+        def object_pairs_hook(pairs):
+            return JSONDict._from_pairs(
+                pairs, leaf_pool=leaf_pool, weak_parents=weak_parents
+            )
+
+        return {"object_pairs_hook": object_pairs_hook}
+
     @classmethod
-    def open(cls, file, raise_exception=True, **kwargs):
+    def open(
+        cls,
+        file,
+        raise_exception=True,
+        lazy=False,
+        share_leaves=False,
+        weak_parents=False,
+        **kwargs,
+    ):
         """
         Open an external JSON file.
-        If a valid url string is passed, then it will try to make a get/post request to such a target and decode a json file
+        If a valid url string is passed, then it will try to make a get/post request to such a target and decode a json file.
+        If lazy is True, child nodes will be built only when they are first accessed.
+        If share_leaves is True, equal leaf values will be stored only once.
+        If weak_parents is True, child nodes will keep a weak reference to their parent.
+        Unless lazy is True, nodes are built by the json decoder while parsing.
         """
+        leaf_pool = cls._resolve_leaf_pool(share_leaves)
+        hooks = {} if lazy else cls._decoder_hooks(leaf_pool, weak_parents)
+        options = dict(lazy=lazy, share_leaves=leaf_pool, weak_parents=weak_parents)
+
         # decide whether to use requests.get or requests.post by checking kwargs
         if kwargs.get("json") or kwargs.get("data"):
             FUNCTION = requests.post
@@ -282,22 +476,28 @@ class JSONObject:
                 FUNCTION, file, raise_exception=raise_exception, **kwargs
             )
             try:
-                data = req.json()
+                data = req.json(**hooks)
             except Exception as e:
                 raise JSONDecodeException(
                     f"Selected URL has no valid json file. Details: {e}"
                 )
             else:
-                return cls(data)
+                return cls(data, **options)
         with open(file) as f:
-            data = json.load(f)
-        return cls(data)
+            data = json.load(f, **hooks)
+        return cls(data, **options)
 
     @classmethod
-    def loads(cls, string, **kwargs):
+    def loads(
+        cls, string, lazy=False, share_leaves=False, weak_parents=False, **kwargs
+    ):
         """
-        This is a wrapper for json.loads. It takes a json string as argument and returns a JSONNode instance
+        This is a wrapper for json.loads. It takes a json string as argument and returns a JSONNode instance.
+        Unless lazy is True (or custom object hooks are passed), nodes are built by the json decoder while parsing.
         """
+        leaf_pool = cls._resolve_leaf_pool(share_leaves)
+        if not lazy and not {"object_hook", "object_pairs_hook"} & kwargs.keys():
+            kwargs.update(cls._decoder_hooks(leaf_pool, weak_parents))
 
         try:
             data = json.loads(string, **kwargs)
@@ -306,7 +506,9 @@ class JSONObject:
                 f"Error when parsing the json string. Error message: {e}"
             )
         else:
-            return cls(data)
+            return cls(
+                data, lazy=lazy, share_leaves=leaf_pool, weak_parents=weak_parents
+            )
 
     @staticmethod
     def read_html_table(
@@ -421,13 +623,18 @@ class JSONNode:
 
     Attributes:
     -----------
-        _child_objects:
         _key: last dict parent key where the object comes from
         _index: las list parent index where the object comes from
-        parent: last parent object where this object comes from
-        _id: unique uuid4 hex identifier of object
+        _parent: last parent object where this object comes from (or a weak reference to it, see parent)
+
+    Node attributes are stored in __slots__ (declared by each concrete class, since builtin bases
+    like dict or str don't allow slots in more than one base), so nodes have no instance __dict__.
+    The only exception is JSONInt, because int subclasses can't have non-empty slots.
     """
 
+    __slots__ = ()
+    _NODE_SLOTS = ("_key", "_index", "_parent")
+
     __odir__ = object.__dir__  # rename old __dir__ method to __odir__
     __osetattr__ = object.__setattr__
 
@@ -435,14 +642,32 @@ class JSONNode:
 
         self._key = None
         self._index = None
-        self.parent = None
-        self._id = uuid4().hex
-        self._child_objects = UUIDdict()
-
-    def _set_new_uuid(self):
+        self._parent = None
 
-        self._id = uuid4().hex
-        return self._id
+    @property
+    def parent(self):
+        """
+        Last parent object where this object comes from (None for root nodes).
+        Parents of trees in weak_parents mode are only weakly referenced, so it is None as well
+        once they are no longer in use.
+        """
+        parent = self._parent
+        if parent.__class__ is weakref.ref:
+            return parent()
+        return parent
+
+    @parent.setter
+    def parent(self, node):
+        if (
+            self.is_composed
+            and self._ancestor_cache is not None
+            and node is not self.parent
+        ):
+            # the ancestors of this node (and of its descendants) change
+            self._drop_ancestor_chains()
+        if node is not None and node._weak_parents:
+            node = weakref.ref(node)
+        self._parent = node
 
     def json_encode(self, **kwargs):
         return json.dumps(self, cls=JSONObjectEncoder, **kwargs)
@@ -450,48 +675,85 @@ class JSONNode:
     @property
     def is_leaf(self):
         """Check if this node is a leaf node (no childs)"""
-        try:
-            child_number = self._child_objects.__len__()
-        except AttributeError:
-            return True
-        return not bool(child_number)
+        return True
+
+    @property
+    def subtree_version(self):
+        """
+        A counter which is increased whenever this node or any of its descendants is modified.
+        Singleton nodes can't be modified (they are replaced within their parent), so their version is always 0.
+        """
+        return 0
+
+    @property
+    def _is_annotation(self):
+        """
+        Whether this node was added by an annotate call.
+        Annotated keys are registered in the parent dict, so leaf nodes don't need an extra field.
+        """
+        parent = self.parent
+        return (
+            isinstance(parent, JSONDict)
+            and parent._annotations is not None
+            and self._key in parent._annotations
+        )
+
+    @_is_annotation.setter
+    def _is_annotation(self, value):
+        parent = self.parent
+        if not isinstance(parent, JSONDict):
+            return
+        if value:
+            if parent._annotations is None:
+                parent._annotations = set()
+            parent._annotations.add(self._key)
+        elif parent._annotations is not None:
+            parent._annotations.discard(self._key)
 
     @property
     def json_decode(self):
         return json.loads(json.dumps(self, cls=JSONObjectEncoder))
 
+    @property
+    def _native_result(self):
+        """Native python object of this node, as it is returned to the user (who can modify it)"""
+        return self._data
+
     @property
     def jsonpath(self):
-        parent = self
-        path = JSONPath()
-        while parent is not None:
-            path._update(key=parent._key, index=parent._index)
-            parent = parent.parent
-        return path
+        keys = []
+        for node in (self,) + self._ancestor_chain():
+            if node._key is not None:
+                keys.append(node._key)
+            elif node._index is not None:
+                keys.append(node._index)
+        keys.reverse()
+        return JSONPath(tuple(keys))
 
     @property
     def parent_list(self):
-        pl = ParentList()
-
-        parent = self
-        last = parent
-        while parent is not None:
-            last = parent
-            parent = parent.parent
-            pl.append(last)
-
-        return pl[1:]
+        return ParentList(self._ancestor_chain())
 
     @property
     def root(self):
         """Get root object from current node object"""
 
-        parent = self
-        last = parent
-        while parent is not None:
-            last = parent
-            parent = parent.parent
-        return last
+        ancestors = self._ancestor_chain()
+        return ancestors[-1] if ancestors else self
+
+    @property
+    def depth(self):
+        """Number of ancestors of this node (0 for root nodes)"""
+
+        return len(self._ancestor_chain())
+
+    def _ancestor_chain(self):
+        """Tuple of the ancestors of this node, from its parent up to its root"""
+
+        parent = self.parent
+        if parent is None:
+            return ()
+        return (parent,) + parent._ancestor_chain()
 
     def update(self, new_obj):
         """
@@ -538,7 +800,7 @@ class JSONNode:
             while True:
                 if isinstance(obj, JSONDict):
                     if key in obj:
-                        output_dict[key] = obj[key]._data
+                        output_dict[key] = obj[key]._native_result
                         break
                 if (
                     search_upwards
@@ -563,7 +825,7 @@ class JSONNode:
                 while True:
                     if isinstance(obj, JSONDict):
                         if v in obj:
-                            output_dict[k] = obj[v]._data
+                            output_dict[k] = obj[v]._native_result
                             break
                     if search_upwards:
                         obj = obj.parent
@@ -591,7 +853,7 @@ class JSONNode:
             else:
                 return
         if isinstance(res, JSONNode):
-            res = res._data
+            res = res._native_result
         return res
 
     def __str__(self):
@@ -716,28 +978,473 @@ class JSONCompose(JSONNode):
     Composed objects can send queries to children (which can be also compose or singleton objects)
     """
 
+    __slots__ = ()
+
     is_composed = True
 
     def __init__(self, *args, **kwargs):
         """
-        By initializing instance, it assign types to child items
+        By initializing instance, it assign types to child items (unless it is a lazy node)
         """
         super().__init__(*args, **kwargs)
-        self._assign_children()
+        if not self._lazy:
+            self._assign_children()
+
+    def _ancestor_chain(self):
+        """
+        Tuple of the ancestors of this node, from its parent up to its root.
+        Chains are cached in the compose nodes (unless parents are weakly referenced), so a chain is only
+        built by walking up to the nearest ancestor with a cached one. Cached chains are dropped
+        when their node, or any of its ancestors, is moved to another parent.
+        """
+        chain = self._ancestor_cache
+        if chain is not None:
+            return chain
+
+        stale = []
+        node = self
+        while node is not None:
+            chain = node._ancestor_cache
+            if chain is not None:
+                break
+            stale.append(node)
+            node = node.parent
+        else:
+            chain = ()
+        # node is the nearest ancestor with a cached chain (or None), so chains are built downwards from it.
+        # Nothing is cached below a node with weak parents, so the parent of any node with a cached chain
+        # has its own chain cached too (see _drop_ancestor_chains)
+        cache = True
+        for child in reversed(stale):
+            chain = () if node is None else (node,) + chain
+            cache = cache and not child._weak_parents
+            if cache:
+                child._ancestor_cache = chain
+            node = child
+        return chain
+
+    def _drop_ancestor_chains(self):
+        """Drop the cached ancestor chains of this node and of its descendants"""
+
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            node._ancestor_cache = None
+            children = (
+                dict.values(node) if isinstance(node, dict) else list.__iter__(node)
+            )
+            # descendants of a node without a cached chain have none either
+            stack.extend(
+                child
+                for child in children
+                if isinstance(child, JSONCompose) and child._ancestor_cache is not None
+            )
+
+    @classmethod
+    def _new_node(cls, data, lazy=False, leaf_pool=None, weak_parents=False):
+        """
+        Build a compose node from raw data.
+        If lazy, its children are kept as raw python objects, and they will be wrapped into nodes on first access.
+        If a leaf_pool is given, equal leaves will be taken from it instead of being built again.
+        If weak_parents, its children will only keep a weak reference to it.
+        """
+        obj = cls.__new__(cls)
+        obj._lazy = lazy
+        obj._leaf_pool = leaf_pool
+        obj._weak_parents = weak_parents
+        cls.__init__(obj, data)
+        return obj
+
+    def _new_child(self, value, serialize_nodes=False):
+        """
+        Wrap a value into a child node, with the same tree modes as this object.
+        Shared leaves are returned as they are in the pool, without any position data.
+        """
+        pool = self._leaf_pool
+        if pool is not None:
+            raw = value._data if isinstance(value, JSONSingleton) else value
+            # 0.0 and -0.0 are equal, but they must be serialized in a different way
+            if isinstance(raw, _SHAREABLE_TYPES) and not (
+                raw.__class__ is float and not raw
+            ):
+                pool_key = (raw.__class__, raw)
+                leaf = pool.get(pool_key)
+                if leaf is None:
+                    leaf = pool[pool_key] = JSONObject(raw)
+                return leaf
+        return JSONObject(
+            value,
+            serialize_nodes=serialize_nodes,
+            lazy=self._lazy,
+            share_leaves=pool,
+            weak_parents=self._weak_parents,
+        )
+
+    def _place_child(self, child, key=None, index=None):
+        """
+        Return a child node as it is located in this object.
+        A shared leaf is not linked to any parent, so a copy of it with its position within this object is returned.
+        """
+        if child.parent is self or child.is_composed:
+            return child
+        node = child.__class__(child._data)
+        node._key = key
+        node._index = index
+        node.parent = self
+        return node
+
+    def _foreign_child(self, child, key=None, index=None):
+        """
+        Return a child which is not linked to this object, as it is located in this object.
+        It can be a shared leaf, or a node of the object this one was copied from (see copy).
+        """
+        if self._cow is not None and self._shares(child):
+            return self._adopt_child(child, key=key, index=index)
+        if self._leaf_pool is not None:
+            return self._place_child(child, key=key, index=index)
+        return child
+
+    def _shares(self, child):
+        """Check whether child belongs to the object this one was copied from (or to its own originals)"""
+        origin = self._cow.origin
+        while origin is not None:
+            if child.parent is origin:
+                return True
+            origin = origin._cow.origin
+        return False
+
+    def _adopt_child(self, child, key=None, index=None):
+        """
+        Replace a child which is shared with the original object by a copy of its own, which is returned.
+        Compose children are copied shallowly, so their own children are still shared.
+        """
+        if child.is_composed:
+            node = child._shallow_copy()
+            _register_clone(child, node)
+        else:
+            node = child.__class__(child._data)
+        if isinstance(self, JSONDict):
+            node._key = key
+            dict.__setitem__(self, key, node)
+        else:
+            node._index = index
+            list.__setitem__(self, index, node)
+        node.parent = self
+        return node
+
+    def _stored_child(self, original):
+        """Child stored at the position of original node (None if there is not such a position)"""
+        if isinstance(self, JSONDict):
+            return dict.get(self, original._key)
+        index = original._index
+        if index is not None and 0 <= index < self.__len__():
+            return list.__getitem__(self, index)
+        return None
+
+    def _privatize(self, chain):
+        """
+        This object is a copy of some node, whose descendants along chain (from top to bottom) are going to be modified.
+        Shared nodes along chain are replaced by copies of them, so that this object keeps their current data.
+        """
+        node = self
+        for original in chain:
+            child = node._stored_child(original)
+            if child is original:
+                child = node._adopt_child(
+                    original, key=original._key, index=original._index
+                )
+            elif (
+                not isinstance(child, JSONNode)
+                or child.parent is not node
+                or not child.is_composed
+            ):
+                return  # this object doesn't share that path (maybe it was replaced by a leaf)
+            node = child
+
+    def copy(self):
+        """
+        Copy-on-write copy of this object.
+        The copy shares the child nodes of this object, until they are accessed from the copy or modified from
+        any of them. Then, only the nodes along the accessed (or modified) path are copied.
+        """
+        obj = self._shallow_copy()
+        _register_clone(self, obj)
+        return obj
+
+    def _materialize(self):
+        """Wrap all remaining raw children of a lazy node (only one level depth)"""
+        if self._lazy:
+            self._assign_children(raw_only=True)
+            self._lazy = False
+
+    @property
+    def is_leaf(self):
+        """Check if this node is a leaf node (no childs)"""
+        return not self.__len__()
+
+    def _iter_query_children(self, keyed=False):
+        """
+        Iterate over the children which must be checked by a query.
+        If keyed, only the children with a key (not list items) can satisfy the query.
+        """
+        return self._iter_children()
+
+    @property
+    def _child_objects(self):
+        """
+        Ordered view over the child nodes.
+        Children are stored only in the compose object itself (dict values or list items),
+        so their key or index is their identifier within this parent.
+        """
+        return ChildObjects(self)
 
     @property
     def _data(self):
-        return super().json_decode
+        """
+        Native python object (dict or list) of this node, built by walking its children.
+        It is cached until this node (or any of its descendants) is modified, and it is shared
+        with the cached data of its ancestors, so it must not be modified.
+        """
+        data = self._data_cache
+        if data is None:
+            data = self._data_cache = self._native()
+        return data
 
-    def _assign_children(self):
-        """Any JSON object can be a child for a given compose object"""
+    @property
+    def json_decode(self):
+        """A new native python object (dict or list) with the data of this node"""
+        return _native_copy(self._data)
+
+    @property
+    def _native_result(self):
+        # cached data is shared with the ancestors, so users get their own copy
+        return self.json_decode
+
+    @property
+    def subtree_version(self):
+        """
+        A counter which is increased whenever this node or any of its descendants is modified.
+        Results computed from this node can be cached along with its version, and they will be
+        fresh as long as the version doesn't change.
+        """
+        return self._version
+
+    def _touch(self):
+        """
+        It must be called right before this node is modified.
+        It increases the version of this node and all its ancestors, and invalidates their cached native data.
+        Copies of any of them which still share this node get their own copy of the path to it first.
+
+        Returns the up to date indexes which cover this node (None if there is not any). They must be updated
+        after the modification (see _update_indexes), otherwise they will be rebuilt when they are used again.
+        """
+        node = self
+        below = []  # nodes from the modified one up to the current one
+        indexes = None
+        while node is not None:
+            if node._cow is not None and below and node._cow.clones:
+                chain = below[::-1]
+                for clone in node._cow.live_clones():
+                    clone._privatize(chain)
+            if node._indexes is not None:
+                fresh = [index for index in node._indexes if index.is_fresh]
+                indexes = fresh if indexes is None else indexes + fresh
+            # a dict key named _version is set by the attribute setter of dicts
+            object.__setattr__(node, "_version", node._version + 1)
+            node._data_cache = None
+            below.append(node)
+            node = node.parent
+        return indexes
+
+    def _update_indexes(self, indexes, key, old, new):
+        """
+        Update indexes (returned by _touch) after the child under key (or list index) of this node
+        has been replaced. old or new can be _MISSING, if the child has been added or deleted.
+        """
+        if indexes:
+            for index in indexes:
+                index.update(self, key, old, new)
+
+    def build_key_index(self):
+        """
+        Build an inverted index of the keys of all the descendants of this node.
+        Then, queries sent from this node (query, get, query_key, get_key) only check the nodes
+        under the requested keys, instead of walking the whole tree.
+        The index is kept up to date as the tree is modified.
+        """
+        self._indexes = [
+            index for index in self._indexes or () if not isinstance(index, KeyIndex)
+        ]
+        index = KeyIndex(self)
+        self._indexes.append(index)
+        return index
+
+    def create_index(self, key, kind="string"):
+        """
+        Build an index of the values under key of all the descendants of this node.
+        The index is kept up to date as the tree is modified.
+
+        If kind is "hash", exact and in queries sent from this node over that key are solved
+        with dict lookups (leaves are compared as in an exact query).
+
+        If kind is "text", strings are indexed by their trigrams, so contains, icontains and regex
+        queries over that key only check the strings which have all the trigrams of the requested text.
+
+        Otherwise, it is a sorted index, and values are parsed once according to kind:
+        "number", "datetime" or "string". Then, range queries sent from this node over that key
+        (gt, gte, lt, lte, and startswith for strings) only check the nodes within the requested range.
+
+        Example
+        -------
+
+        >> data.create_index("timestamp", kind="datetime")
+        >> data.query(timestamp__gte="2021-05-01")
+
+        >> data.create_index("sku", kind="hash")
+        >> data.get(sku="ABC")
+
+        >> data.create_index("message", kind="text")
+        >> data.query(message__icontains="timeout")
+        """
+        if kind == HashIndex.kind:
+            index = HashIndex(self, key)
+        elif kind == TextIndex.kind:
+            index = TextIndex(self, key)
+        else:
+            index = ValueIndex(self, key, kind=kind)
+        self._indexes = [
+            other
+            for other in self._indexes or ()
+            if not (
+                isinstance(other, (HashIndex, TextIndex, ValueIndex))
+                and other.key == key
+                and other.kind == kind
+            )
+        ]
+        # value indexes are more selective than the key index, so they are checked first
+        self._indexes.insert(0, index)
+        return index
+
+    def _query_candidates(self, plan):
+        """
+        Nodes which can satisfy a compiled query plan, taken from the indexes of this node
+        (rebuilt if they are not up to date), or None if they can't narrow them.
+        """
+        if self._indexes is not None:
+            for index in self._indexes:
+                if not index.is_fresh:
+                    index.rebuild()
+                nodes = index.candidates(plan)
+                if nodes is not None:
+                    return nodes
+        return None
+
+    def enable_query_cache(self, maxsize=128):
+        """
+        Cache the results of the queries sent from this node (query, get, query_key, get_key)
+        in a LRUCache of maxsize entries. A cached result is reused only while this node
+        and its descendants are not modified (or the whole tree, if the query has parent lookups),
+        so the cache doesn't need to be cleared when the tree is modified.
+        Returns the cache, whose cache_info method has the hits, misses and evictions.
+
+        Example
+        -------
+
+        >> data.enable_query_cache(maxsize=256)
+        >> data.get(name="timeout")  # the tree is walked
+        >> data.get(name="timeout")  # cached
+        >> data.query_cache_info()
+            CacheInfo(hits=1, misses=1, evictions=0, maxsize=256, currsize=1)
+        """
+        self._query_cache = LRUCache(maxsize)
+        return self._query_cache
+
+    def disable_query_cache(self):
+        self._query_cache = None
+
+    def query_cache_info(self):
+        """Statistics of the query cache of this node (see enable_query_cache), or None if it is not enabled"""
+
+        if self._query_cache is None:
+            return None
+        return self._query_cache.cache_info()
+
+    def _query_version(self, plan):
+        """Versions which the results of a query plan sent from this node depend on"""
+
+        if not plan.looks_upwards:
+            return self._version
+        # parent lookups can reach the ancestors of this node
+        versions = []
+        node = self
+        while node is not None:
+            versions.append((id(node), node._version))
+            node = node.parent
+        return tuple(versions)
+
+    def _query_matches(
+        self,
+        plan,
+        recursive,
+        include_parent,
+        stop_at_match,
+        cache_key,
+        workers=None,
+        scope=None,
+    ):
+        """
+        Nodes which satisfy a compiled query plan sent from this node (at most stop_at_match of them).
+        If the query cache is enabled, they are taken from it while they are fresh.
+        If workers is greater than 1, the children of this node are checked by that number of processes
+        (unless the traversal is bounded by a scope).
+        """
+        cache = self._query_cache
+        if cache is not None:
+            try:
+                cache_key = (
+                    self._query_version(plan),
+                    recursive,
+                    include_parent,
+                    stop_at_match,
+                    config.QUERY_EXCEPTIONS,
+                    config.DECIMAL_SEPARATOR,
+                    config.THOUSANDS_SEPARATOR,
+                    scope and scope.cache_key,
+                    _frozen(cache_key),
+                )
+                nodes = cache.get(cache_key)
+            except TypeError:  # unhashable query values
+                cache = None
+            else:
+                if nodes is not None:
+                    return nodes
+
+        if workers is not None and workers > 1 and len(self) > 1 and scope is None:
+            matches = parallel.query_matches(
+                self, plan, recursive, include_parent, workers
+            )
+        else:
+            matches = self._iter_query_plan(plan, recursive, include_parent, scope)
+        # the traversal stops as soon as there are stop_at_match results
+        nodes = tuple(islice(matches, stop_at_match or None))
+        if cache is not None:
+            cache.put(cache_key, nodes)
+        return nodes
+
+    def _assign_children(self, raw_only=False):
+        """
+        Any JSON object can be a child for a given compose object.
+        If raw_only, only children which are not nodes yet are initialized.
+        """
         if isinstance(self, JSONDict):
-            for key, value in self.items():
-                self.__setitem__(key, value)
+            for key, value in dict.items(self):
+                if not (raw_only and isinstance(value, JSONNode)):
+                    self._set_child(key, value)
 
         elif isinstance(self, JSONList):
-            for index, item in enumerate(self):
-                self.__setitem__(index, item)
+            for index, item in enumerate(list.__iter__(self)):
+                if not (raw_only and isinstance(item, JSONNode)):
+                    self._set_child(index, item)
 
     def path_exists(self, iterable):
         """
@@ -795,18 +1502,67 @@ class JSONCompose(JSONNode):
 
     def query(
         self,
+        *args,
         recursive_=None,
         include_parent_=None,
         stop_at_match_=None,
         native_types_=None,
+        workers_=None,
+        within_=None,
+        max_depth_=None,
         **q,
     ):
         if not isinstance(stop_at_match_, (int, type(None))):
             raise TypeError(
                 f"Argument stop_at_match_ must be an integer or NoneType, not {type(stop_at_match_)}"
             )
+        if workers_ is not None and not (isinstance(workers_, int) and workers_ > 0):
+            raise TypeError(
+                f"Argument workers_ must be a positive integer or NoneType, not {workers_!r}"
+            )
 
-        # within a particular parent node, each child in _child_objects registry must have a unique key
+        # ---- DYNAMIC CONFIG ----
+        if recursive_ is None:
+            recursive_ = config.RECURSIVE_QUERIES
+        if include_parent_ is None:
+            include_parent_ = config.INCLUDE_PARENTS
+        if native_types_ is None:
+            native_types_ = config.NATIVE_TYPES
+        # ------------------------
+        queryset = self._new_queryset(QuerySet, native_types_)
+        queryset.extend(
+            self._query_matches(
+                _compile_query(*args, **q),
+                recursive_,
+                include_parent_,
+                stop_at_match_,
+                cache_key=("query", native_types_, args, q),
+                workers=workers_,
+                scope=self._query_scope(within_, max_depth_),
+            )
+        )
+        return queryset
+
+    def iquery(
+        self,
+        *args,
+        recursive_=None,
+        include_parent_=None,
+        native_types_=None,
+        within_=None,
+        max_depth_=None,
+        **q,
+    ):
+        """
+        Like query, but the tree is traversed as the results are requested, instead of all at once.
+        It returns a LazyQuerySet: iterating over it yields each node as soon as it is found, and
+        first or exists stop the traversal at the first match.
+
+        Example
+        -------
+
+        >> data.iquery(price__gt=100).first()
+        """
 
         # ---- DYNAMIC CONFIG ----
         if recursive_ is None:
@@ -816,37 +1572,136 @@ class JSONCompose(JSONNode):
         if native_types_ is None:
             native_types_ = config.NATIVE_TYPES
         # ------------------------
-        queryset = QuerySet()
-        if native_types_:
+        return LazyQuerySet(
+            self._iter_query_plan(
+                _compile_query(*args, **q),
+                recursive_,
+                include_parent_,
+                self._query_scope(within_, max_depth_),
+            ),
+            self._new_queryset(QuerySet, native_types_),
+        )
+
+    def _new_queryset(self, queryset_class, native_types):
+        queryset = queryset_class()
+        if native_types:
             queryset._native_types = True
         queryset._root = self  # the node which sends the query
-        children = self._child_objects.values()
-        for child in children:
-            # if child satisfies query request, it will be appended to the queryset object
-            check, obj = _parse_query(child, include_parent_, **q)
-            if check:
-                queryset.append(obj)
-                if stop_at_match_ and queryset.count() >= stop_at_match_:
-                    return queryset
-
-            # if child is also a compose object, it will send the same query to its children recursively
-            if child.is_composed and recursive_:
-                queryset += child.query(
-                    recursive_=recursive_,
-                    include_parent_=include_parent_,
-                    stop_at_match_=stop_at_match_,
-                    native_types_=native_types_,
-                    **q,
-                )
         return queryset
 
+    @staticmethod
+    def _query_scope(within, max_depth):
+        """_PathScope of the within_ and max_depth_ arguments of a query (None if they are not set)"""
+
+        if within is None and max_depth is None:
+            return None
+        return _PathScope(within, max_depth)
+
+    def _iter_query_items(self, keyed=False):
+        """(key, child) pairs of the children which must be checked by a query (key is the index of list items)"""
+
+        children = self._iter_query_children(keyed)
+        if isinstance(self, JSONDict):
+            return zip(dict.keys(self), children)
+        return enumerate(children)
+
+    def _iter_query_plan(self, plan, recursive, include_parent, scope=None):
+        """
+        Iterate over the descendants of this node which satisfy a compiled query plan,
+        in depth-first order (each child is checked before its own children).
+        The tree is only traversed as the results are requested.
+        If there is a scope, only the subtrees within it are traversed.
+        """
+        if scope is not None:
+            yield from self._iter_scoped_query_plan(
+                plan, recursive, include_parent, scope
+            )
+            return
+
+        nodes = self._query_candidates(plan) if recursive else None
+        if nodes is not None:
+            yield from _iter_matches(nodes, plan, include_parent)
+            return
+
+        # lists of records are queried by columns (see columnar)
+        columns = columnar.ColumnarQuery(plan) if recursive else None
+        if columns is not None and self.__class__ is JSONList:
+            nodes = columns.matches(self)
+            if nodes is not None:
+                yield from _iter_results(nodes, include_parent)
+                return
+
+        yield from self._walk_query_plan(plan, recursive, include_parent, columns)
+
+    def _walk_query_plan(self, plan, recursive, include_parent, columns):
+        """
+        Like _iter_query_plan, but the whole subtree is traversed
+        (except for the lists of records which can be queried by columns).
+        """
+
+        match = plan.match
+        keyed = plan.keyed
+        stack = [self._iter_query_children(keyed)]
+        while stack:
+            for child in stack[-1]:
+                # if child satisfies query request, it will be yielded
+                if match(child):
+                    yield child.parent if include_parent else child
+                # if child is also a compose object, its children are checked before its next siblings
+                if recursive and child.is_composed:
+                    if child.__class__ is JSONList:
+                        nodes = columns.matches(child)
+                        if nodes is not None:
+                            yield from _iter_results(nodes, include_parent)
+                            continue
+                    stack.append(child._iter_query_children(keyed))
+                    break
+            else:
+                stack.pop()
+
+    def _iter_scoped_query_plan(self, plan, recursive, include_parent, scope):
+        """Like _iter_query_plan, but only the subtrees within a _PathScope are traversed"""
+
+        match = plan.match
+        keyed = plan.keyed
+        max_depth = scope.max_depth
+        stack = [(self._iter_query_items(keyed), scope.start)]
+        while stack:
+            items, states = stack[-1]
+            for key, child in items:
+                if states is None:  # within the scope
+                    if match(child):
+                        yield child.parent if include_parent else child
+                    descend = recursive
+                else:
+                    child_states = scope.advance(states, key)
+                    # children of the nodes at the scope path are checked, other nodes only lead to them
+                    descend = child_states is None or bool(child_states)
+                if (
+                    descend
+                    and child.is_composed
+                    and (max_depth is None or len(stack) < max_depth)
+                ):
+                    stack.append(
+                        (
+                            child._iter_query_items(keyed),
+                            None if states is None else child_states,
+                        )
+                    )
+                    break
+            else:
+                stack.pop()
+
     def get(
         self,
+        *args,
         recursive_=None,
         include_parent_=None,
         throw_exceptions_=None,
         native_types_=None,
         default_=dummy,
+        within_=None,
+        max_depth_=None,
         **q,
     ):
 
@@ -861,10 +1716,13 @@ class JSONCompose(JSONNode):
             native_types_ = config.NATIVE_TYPES
         # ------------------------
         query = self.query(
+            *args,
             recursive_=recursive_,
             include_parent_=include_parent_,
             stop_at_match_=2,
             native_types_=native_types_,
+            within_=within_,
+            max_depth_=max_depth_,
             **q,
         )
 
@@ -883,6 +1741,72 @@ class JSONCompose(JSONNode):
         else:
             return query.first()
 
+    def query_many(self, specs):
+        """
+        Evaluate several queries in a single traversal of the tree, instead of walking it once for each query.
+        specs is a dict of name -> query arguments (the same ones as query, including recursive_,
+        include_parent_, stop_at_match_ and native_types_). Returns a dict of name -> QuerySet.
+        Queries which can be solved with the indexes of this node are solved with them instead,
+        and queries with workers_, within_ or max_depth_ are sent apart (see query).
+
+        Example
+        -------
+
+        >> data.query_many({"errors": {"level": "error"}, "slow": {"elapsed__gt": 1000}})
+            {"errors": ["error", "error"], "slow": [1500]}
+        """
+
+        querysets = {}
+        walked = []  # (plan, queryset, recursive, include_parent, stop_at_match)
+        for name, q in specs.items():
+            if any(q.get(argument) is not None for argument in _UNBATCHED_ARGUMENTS):
+                # they have their own traversal
+                querysets[name] = self.query(**q)
+                continue
+            options = _query_options(q)
+            q, recursive, include_parent, stop_at_match, native_types = options
+            plan = _compile_query(**q)
+            queryset = querysets[name] = self._new_queryset(QuerySet, native_types)
+            nodes = self._query_candidates(plan) if recursive else None
+            if nodes is None:
+                walked.append(
+                    (plan, queryset, recursive, include_parent, stop_at_match)
+                )
+            else:
+                queryset.extend(
+                    islice(_iter_matches(nodes, plan, include_parent), stop_at_match)
+                )
+        if walked:
+            self._walk_query_batch(walked)
+        return querysets
+
+    def _walk_query_batch(self, walked):
+        """
+        Fill the querysets of several query plans in a single traversal of this node
+        (a list of (plan, queryset, recursive, include_parent, stop_at_match) tuples, see query_many).
+        """
+
+        batch = _BatchPlan([plan for plan, *_ in walked])
+        pending = len(walked)  # queries which can still have more results
+        recursive = any(options[2] for options in walked)
+        stack = [self._iter_query_children(batch.keyed)]
+        while stack and pending:
+            for child in stack[-1]:
+                for number in batch.match(child):
+                    _, queryset, deep, include_parent, stop_at_match = walked[number]
+                    if len(queryset) == stop_at_match or not (deep or len(stack) == 1):
+                        continue
+                    queryset.append(child.parent if include_parent else child)
+                    if len(queryset) == stop_at_match:
+                        pending -= 1
+                        if not pending:
+                            return
+                if recursive and child.is_composed:
+                    stack.append(child._iter_query_children(batch.keyed))
+                    break
+            else:
+                stack.pop()
+
     def annotate(self, **kwargs):
         """
         Annotate key:value pairs in each dict's child.
@@ -940,18 +1864,15 @@ class JSONCompose(JSONNode):
             for key, value in kwargs.items():
                 # if key from annotation is not in dict keys, register it
                 if key not in self.keys():
-                    child = JSONObject(value)
-                    child._key = key
-                    child.parent = self
-                    child._is_annotation = True
-                    self.__setitem__(key, child)
-                    _registered_keys.add(child._id)
-
-            for ch in self._child_objects.values_except(_registered_keys):
-                if ch.is_composed:
+                    self.__setitem__(key, value)
+                    self[key]._is_annotation = True
+                    _registered_keys.add(key)
+
+            for ch in self._iter_children():
+                if ch.is_composed and ch._key not in _registered_keys:
                     ch.annotate(**kwargs)
         elif isinstance(self, JSONList):
-            for ch in self._child_objects.values():
+            for ch in self._iter_children():
                 if ch.is_composed:
                     ch.annotate(**kwargs)
         return self
@@ -963,14 +1884,19 @@ class JSONCompose(JSONNode):
         include_parent_=None,
         stop_at_match_=None,
         native_types_=None,
+        workers_=None,
+        within_=None,
+        max_depth_=None,
         **q,
     ):
         if not isinstance(stop_at_match_, (int, type(None))):
             raise TypeError(
                 f"Argument stop_at_match_ must be an integer or NoneType, not {type(stop_at_match_)}"
             )
-
-        # within a particular parent node, each child in _child_objects registry must have a unique key
+        if workers_ is not None and not (isinstance(workers_, int) and workers_ > 0):
+            raise TypeError(
+                f"Argument workers_ must be a positive integer or NoneType, not {workers_!r}"
+            )
 
         # ---- DYNAMIC CONFIG ----
         if recursive_ is None:
@@ -980,31 +1906,50 @@ class JSONCompose(JSONNode):
         if native_types_ is None:
             native_types_ = config.NATIVE_TYPES
         # ------------------------
-        queryset = KeyQuerySet()
-        if native_types_:
-            queryset._native_types = True
-        queryset._root = self  # the node which sends the query
-        children = self._child_objects.values()
-        for child in children:
-            # if child satisfies query request, it will be appended to the queryset object
-            check, obj = _parse_query_key(child, pattern, include_parent_, **q)
-            if check:
-                queryset.append(obj)
-                if stop_at_match_ and queryset.count() >= stop_at_match_:
-                    return queryset
-
-            # if child is also a compose object, it will send the same query to its children recursively
-            if child.is_composed and recursive_:
-                queryset += child.query_key(
-                    pattern,
-                    recursive_=recursive_,
-                    include_parent_=include_parent_,
-                    stop_at_match_=stop_at_match_,
-                    native_types_=native_types_,
-                    **q,
-                )
+        queryset = self._new_queryset(KeyQuerySet, native_types_)
+        queryset.extend(
+            self._query_matches(
+                _compile_query_key(pattern, **q),
+                recursive_,
+                include_parent_,
+                stop_at_match_,
+                cache_key=("query_key", native_types_, pattern, q),
+                workers=workers_,
+                scope=self._query_scope(within_, max_depth_),
+            )
+        )
         return queryset
 
+    def iquery_key(
+        self,
+        pattern,
+        recursive_=None,
+        include_parent_=None,
+        native_types_=None,
+        within_=None,
+        max_depth_=None,
+        **q,
+    ):
+        """Like query_key, but it returns a LazyQuerySet (see iquery)"""
+
+        # ---- DYNAMIC CONFIG ----
+        if recursive_ is None:
+            recursive_ = config.RECURSIVE_QUERIES
+        if include_parent_ is None:
+            include_parent_ = config.INCLUDE_PARENTS
+        if native_types_ is None:
+            native_types_ = config.NATIVE_TYPES
+        # ------------------------
+        return LazyQuerySet(
+            self._iter_query_plan(
+                _compile_query_key(pattern, **q),
+                recursive_,
+                include_parent_,
+                self._query_scope(within_, max_depth_),
+            ),
+            self._new_queryset(KeyQuerySet, native_types_),
+        )
+
     def get_key(
         self,
         pattern,
@@ -1013,6 +1958,8 @@ class JSONCompose(JSONNode):
         throw_exceptions_=None,
         native_types_=None,
         default_=dummy,
+        within_=None,
+        max_depth_=None,
         **q,
     ):
         # ---- DYNAMIC CONFIG ----
@@ -1031,6 +1978,8 @@ class JSONCompose(JSONNode):
             include_parent_=include_parent_,
             stop_at_match_=2,
             native_types_=native_types_,
+            within_=within_,
+            max_depth_=max_depth_,
             **q,
         )
 
@@ -1053,7 +2002,7 @@ class JSONCompose(JSONNode):
 
         if isinstance(self, JSONDict):
             for key, value in list(self.items()):
-                if "_is_annotation" in value.__odir__():
+                if value._is_annotation:
                     self.pop(key)
                 if value.is_composed and recursive:
                     value._remove_annotations()
@@ -1095,7 +2044,7 @@ class JSONCompose(JSONNode):
             )
 
         if native_types_:
-            res = _eval_object(self, path)._data
+            res = _eval_object(self, path)._native_result
         else:
             res = _eval_object(self, path)
         return res
@@ -1111,8 +2060,7 @@ class JSONCompose(JSONNode):
 
         output_list = QuerySet()
 
-        children = self._child_objects.values()
-        for child in children:
+        for child in self._iter_children():
             serialized_child = child._data
             output_list.append(
                 JSONObject({"path": child.jsonpath.keys, "value": serialized_child})
@@ -1152,10 +2100,9 @@ class JSONCompose(JSONNode):
         """
         output_dict = {}
 
-        children = self._child_objects.values()
-        for child in children:
+        for child in self._iter_children():
             if child.is_leaf:
-                serialized_child = child._data
+                serialized_child = child._native_result
                 output_dict[child.jsonpath.keys] = serialized_child
             if child.is_composed:
                 output_dict.update(child.to_path())
@@ -1246,14 +2193,16 @@ class JSONSingleton(JSONNode):
     Singleton object might be: JSONStr, JSONFloat, JSONInt, JSONBool, JSONNull.
     """
 
+    __slots__ = ()
+
     is_composed = False
 
-    def query(self, **kwargs):
+    def query(self, *args, **kwargs):
         queryset = QuerySet()
         queryset._native_types = kwargs.get("native_types_") or config.NATIVE_TYPES
         return queryset
 
-    def get(self, **kwargs):
+    def get(self, *args, **kwargs):
         if kwargs.get("native_types_") or config.NATIVE_TYPES:
             return
         return JSONNull(None)
@@ -1264,20 +2213,144 @@ class JSONSingleton(JSONNode):
         return JSONNull(None)
 
 
+def _touching(method):
+    """Wrap a builtin mutator method of a compose node, so that the cached data of the node is invalidated"""
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        self._touch()
+        return method(self, *args, **kwargs)
+
+    return wrapper
+
+
+class _CowLinks:
+    """
+    Copy-on-write links of a compose node (see JSONCompose.copy).
+
+    Attributes:
+    -----------
+        origin: the node this one was copied from (None if it is not a copy)
+        clones: weak references to the nodes which share the children of this one
+            (its copies, and the copies of its copies)
+    """
+
+    __slots__ = ("origin", "clones")
+
+    def __init__(self, origin=None):
+        self.origin = origin
+        self.clones = []
+
+    def add_clone(self, clone):
+        clones = self.clones
+        # dead references are dropped from time to time, so that the list doesn't grow forever
+        if len(clones) >= 8 and not len(clones) & (len(clones) - 1):
+            clones[:] = [ref for ref in clones if ref() is not None]
+        clones.append(weakref.ref(clone))
+
+    def live_clones(self):
+        clones = (ref() for ref in self.clones)
+        return [clone for clone in clones if clone is not None]
+
+
+def _register_clone(origin, clone):
+    """
+    Link clone, a shallow copy of origin, to it.
+    The clone shares the children of origin, and also those of the nodes origin was copied from,
+    so it is registered in all of them.
+    """
+    clone._cow = _CowLinks(origin)
+    node = origin
+    while node is not None:
+        if node._cow is None:
+            node._cow = _CowLinks()
+        node._cow.add_clone(clone)
+        node = node._cow.origin
+
+
 # ---- COMPOSE OBJECTS ----
 class JSONDict(dict, JSONCompose):
-    """A Dict object"""
+    """
+    A Dict object
+
+    Attributes:
+    -----------
+        _lazy: if True, some children are still raw python objects
+        _annotations: set of keys added by annotate (None if there is none)
+        _leaf_pool: dict of shared leaves of the tree (None if leaves are not shared)
+        _data_cache: cached native data (None if it must be built again)
+        _version: subtree version (see subtree_version)
+        _cow: copy-on-write links with its original object and its copies (None if there is not any)
+        _weak_parents: if True, its children keep a weak reference to it
+        _indexes: list of indexes over its descendants (None if there is not any)
+        _query_cache: LRUCache of query results (None if it is not enabled)
+        _ancestor_cache: tuple of its cached ancestors (see _ancestor_chain), or None
+    """
+
+    __slots__ = JSONNode._NODE_SLOTS + (
+        "_lazy",
+        "_annotations",
+        "_leaf_pool",
+        "_data_cache",
+        "_version",
+        "_cow",
+        "_weak_parents",
+        "_indexes",
+        "_query_cache",
+        "_ancestor_cache",
+        "__weakref__",
+    )
 
     _DEFAULT = object()
     get = JSONCompose.get  # override get method
     _get = dict.get  # original get method
     values = JSONNode.values
 
+    def __new__(cls, *args, **kwargs):
+        obj = super().__new__(cls, *args, **kwargs)
+        obj._lazy = False
+        obj._annotations = None
+        obj._leaf_pool = None
+        obj._data_cache = None
+        object.__setattr__(obj, "_version", 0)  # d._version = ... sets a key
+        obj._cow = None
+        obj._weak_parents = False
+        obj._indexes = None
+        obj._query_cache = None
+        obj._ancestor_cache = None
+        return obj
+
     def __init__(self, *args, **kwargs):
 
         super().__init__(*args, **kwargs)
         JSONCompose.__init__(self, *args, **kwargs)
 
+    @classmethod
+    def _from_pairs(cls, pairs, leaf_pool=None, weak_parents=False):
+        """
+        Build a dict node from the key/value pairs of a decoded JSON object, whose nested objects are already nodes.
+        Leaves are built straight from their raw type.
+        """
+        if leaf_pool is not None:
+            return cls._new_node(
+                pairs, leaf_pool=leaf_pool, weak_parents=weak_parents
+            )
+
+        obj = cls()
+        obj._weak_parents = weak_parents
+        link = weakref.ref(obj) if weak_parents else obj
+        for key, value in pairs:
+            key = _intern_key(key)
+            leaf_cls = _LEAF_CLASSES.get(value.__class__)
+            if leaf_cls is not None:
+                child = leaf_cls(value)
+            else:
+                child = JSONObject(value, weak_parents=weak_parents)
+            child._key = key
+            child._parent = link
+            dict.__setitem__(obj, key, child)
+        return obj
+
     def __dir__(self):
         # for autocompletion stuff
         if config.AUTOCOMPLETE_ONLY_NODES:
@@ -1319,32 +2392,89 @@ class JSONDict(dict, JSONCompose):
                 return
             return JSONNull(None)
 
-    def __setitem__(self, k, v):
+    def __getitem__(self, k):
+        child = super().__getitem__(k)
+        if self._lazy and not isinstance(child, JSONNode):
+            # lazy node: wrap the raw child on first access
+            self._set_child(k, child)
+            child = super().__getitem__(k)
+        if child.parent is not self:
+            return self._foreign_child(child, key=k)
+        return child
+
+    def items(self):
+        self._materialize()
+        if self._leaf_pool is not None or self._cow is not None:
+            return [
+                (k, v if v.parent is self else self._foreign_child(v, key=k))
+                for k, v in super().items()
+            ]
+        return super().items()
+
+    def _iter_children(self):
+        """Iterate over child nodes, in insertion order"""
+        self._materialize()
+        if self._leaf_pool is not None or self._cow is not None:
+            return (
+                v if v.parent is self else self._foreign_child(v, key=k)
+                for k, v in dict.items(self)
+            )
+        return iter(dict.values(self))
+
+    def _set_child(self, k, v):
         """
-        When setting a new child, we must follow this steps:
-            1 - Initialize child
-            2 - Remove old child item from _child_objects dictionary
-            3 - Assign new child item to _child_objects dictionary
+        When setting a new child, we must initialize it (wrap it into a node and link it to this parent).
+        The old child under the same key, if any, is simply replaced.
         """
 
         # ---- initalize child ----
-        child = JSONObject(v)
-        child._key = k
-        child.parent = self
+        k = _intern_key(k)
+        child = self._new_child(v)
+        if self._leaf_pool is None or child.is_composed:
+            child._key = k
+            child.parent = self
 
-        # ---- remove old child ----
-        prev_child = super().get(k)  # old child (maybe None)
-        try:
-            self._child_objects.pop(
-                prev_child._id, None
-            )  # we must remove current child item. If not, it would still appear in queries
-        except AttributeError:
-            pass
+        return super().__setitem__(k, child)
 
-        # ---- assign new child ----
-        self._child_objects[child._id] = child
+    def __setitem__(self, k, v):
 
-        return super().__setitem__(k, child)
+        indexes = self._touch()
+        old = dict.get(self, k, _MISSING)
+        self._set_child(k, v)
+        if self._annotations is not None:
+            self._annotations.discard(k)  # a new child is not an annotation anymore
+        self._update_indexes(indexes, k, old, dict.__getitem__(self, k))
+
+    def _native(self):
+        return {_json_key(k): _native(v) for k, v in dict.items(self)}
+
+    def update(self, *args, **kwargs):
+        """dict update, but new children are initialized as in setitem"""
+        for k, v in dict(*args, **kwargs).items():
+            self.__setitem__(k, v)
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self.__setitem__(key, default)
+        return self[key]
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def __delitem__(self, k):
+        indexes = self._touch()
+        old = dict.get(self, k, _MISSING)
+        dict.__delitem__(self, k)
+        self._update_indexes(indexes, k, old, _MISSING)
+
+    def popitem(self):
+        indexes = self._touch()
+        k, old = dict.popitem(self)
+        self._update_indexes(indexes, k, old, _MISSING)
+        return k, old
+
+    clear = _touching(dict.clear)
 
     def __setattr__(self, name, value):
         """To define behaviour when setting an atributte. It must register a new node if not a reserved keyword"""
@@ -1354,9 +2484,19 @@ class JSONDict(dict, JSONCompose):
         else:
             return self.__setitem__(name, value)
 
-    def copy(self):
-        cls = self.__class__
-        obj = cls(self.json_decode)
+    copy = JSONCompose.copy
+
+    def _shallow_copy(self):
+        """A new root node with the same children as this one (children are not linked to it)"""
+        obj = self.__class__.__new__(self.__class__)
+        JSONNode.__init__(obj)
+        dict.update(obj, self)
+        obj._lazy = self._lazy
+        obj._leaf_pool = self._leaf_pool
+        obj._weak_parents = self._weak_parents
+        if self._annotations:
+            obj._annotations = set(self._annotations)
+        obj._data_cache = self._data_cache  # it holds the same data
         return obj
 
     def get_fields(self, *args, inplace=False):
@@ -1388,13 +2528,13 @@ class JSONDict(dict, JSONCompose):
 
     def pop(self, key, default=_DEFAULT):
         """
-        When removing a key from dict, we also must unregister the corresponding child
-        from _child_objects dictionary
+        Remove a key from dict and return its child node.
         """
         if key in self or default is self._DEFAULT:
             child = self[key]  # getting the child
             del self[key]
-            self._child_objects.pop(child._id, None)  # unregister child
+            if self._annotations is not None:
+                self._annotations.discard(key)
             return child
         else:
             return default
@@ -1458,7 +2598,53 @@ class JSONDict(dict, JSONCompose):
 
 
 class JSONList(list, JSONCompose):
-    """A list object"""
+    """
+    A list object
+
+    Attributes:
+    -----------
+        _lazy: if True, some children are still raw python objects
+        _leaf_pool: dict of shared leaves of the tree (None if leaves are not shared)
+        _data_cache: cached native data (None if it must be built again)
+        _version: subtree version (see subtree_version)
+        _cow: copy-on-write links with its original object and its copies (None if there is not any)
+        _weak_parents: if True, its children keep a weak reference to it
+        _indexes: list of indexes over its descendants (None if there is not any)
+        _query_cache: LRUCache of query results (None if it is not enabled)
+        _ancestor_cache: tuple of its cached ancestors (see _ancestor_chain), or None
+        _columns: _RecordTable with the parsed columns of its records (see columnar), or None
+    """
+
+    __slots__ = JSONNode._NODE_SLOTS + (
+        "_lazy",
+        "_leaf_pool",
+        "_data_cache",
+        "_version",
+        "_cow",
+        "_weak_parents",
+        "_indexes",
+        "_query_cache",
+        "_ancestor_cache",
+        "_columns",
+        "__weakref__",
+    )
+
+    # names of the attributes which are not list items (others are set like _0, _1, etc)
+    _RESERVED_ATTRIBUTES = JSONObject._RESERVED_ATTRIBUTES + ("_version", "_columns")
+
+    def __new__(cls, *args, **kwargs):
+        obj = super().__new__(cls, *args, **kwargs)
+        obj._lazy = False
+        obj._leaf_pool = None
+        obj._data_cache = None
+        obj._version = 0
+        obj._cow = None
+        obj._weak_parents = False
+        obj._indexes = None
+        obj._query_cache = None
+        obj._ancestor_cache = None
+        obj._columns = None
+        return obj
 
     def __init__(self, *args, **kwargs):
 
@@ -1467,21 +2653,62 @@ class JSONList(list, JSONCompose):
 
     def append(self, item, serialize_nodes=True):
 
-        child = JSONObject(item, serialize_nodes=serialize_nodes)
-        child._index = self.__len__()
-        child.parent = self
-
-        self._child_objects[child._id] = child
-        return super().append(child)
-
-    def copy(self):
-        cls = self.__class__
-        obj = cls(self.json_decode)
+        indexes = self._touch()
+        child = self._new_child(item, serialize_nodes=serialize_nodes)
+        if self._leaf_pool is None or child.is_composed:
+            child._index = self.__len__()
+            child.parent = self
+
+        super().append(child)
+        self._update_indexes(indexes, None, _MISSING, child)
+
+    copy = JSONCompose.copy
+
+    def _shallow_copy(self):
+        """A new root node with the same children as this one (children are not linked to it)"""
+        obj = self.__class__.__new__(self.__class__)
+        JSONNode.__init__(obj)
+        list.extend(obj, list.__iter__(self))
+        obj._lazy = self._lazy
+        obj._leaf_pool = self._leaf_pool
+        obj._weak_parents = self._weak_parents
+        obj._data_cache = self._data_cache  # it holds the same data
         return obj
 
     def length(self):
         return self.__len__()
 
+    def __getitem__(self, index):
+        child = super().__getitem__(index)
+        if isinstance(index, slice):
+            if self._lazy or self._leaf_pool is not None or self._cow is not None:
+                return [self[i] for i in range(*index.indices(self.__len__()))]
+            return child
+        if self._lazy and not isinstance(child, JSONNode):
+            # lazy node: wrap the raw child on first access
+            if index < 0:
+                index += self.__len__()
+            self._set_child(index, child)
+            child = super().__getitem__(index)
+        if child.parent is not self:
+            if index < 0:
+                index += self.__len__()
+            return self._foreign_child(child, index=index)
+        return child
+
+    def __iter__(self):
+        return self._iter_children()
+
+    def _iter_children(self):
+        """Iterate over child nodes, in index order"""
+        self._materialize()
+        if self._leaf_pool is not None or self._cow is not None:
+            return (
+                item if item.parent is self else self._foreign_child(item, index=i)
+                for i, item in enumerate(super().__iter__())
+            )
+        return super().__iter__()
+
     def __dir__(self):
         if config.AUTOCOMPLETE_ONLY_NODES:
             return [f"_{i}" for i in range(len(self))]
@@ -1499,30 +2726,82 @@ class JSONList(list, JSONCompose):
     def __setattr__(self, name, value):
         """To define behaviour when setting an atributte. It must register a new node if not a reserved keyword"""
 
-        if name in JSONObject._RESERVED_ATTRIBUTES:
+        if name in self._RESERVED_ATTRIBUTES:
             return super().__setattr__(name, value)
         else:
             name = int(name.replace("_", ""))
             return self.__setitem__(name, value)
 
-    def __setitem__(self, index, item):
+    def _set_child(self, index, item):
 
         # ---- initialize child ----
-        child = JSONObject(item)
-        child._index = index
-        child.parent = self
+        child = self._new_child(item)
+        if self._leaf_pool is None or child.is_composed:
+            child._index = index
+            child.parent = self
 
-        # ---- remove old child ----
-        prev_child = super().__getitem__(index)
-        try:
-            self._child_objects.pop(prev_child._id, None)
-        except AttributeError:
-            pass
+        return super().__setitem__(index, child)
 
-        # ---- assign new child ----
-        self._child_objects[child._id] = child
+    def __setitem__(self, index, item):
 
-        return super().__setitem__(index, child)
+        indexes = self._touch()
+        if isinstance(index, slice):  # indexes will be rebuilt
+            return self._set_child(index, item)
+        old = list.__getitem__(self, index)
+        self._set_child(index, item)
+        self._update_indexes(indexes, None, old, list.__getitem__(self, index))
+
+    def _native(self):
+        return [_native(item) for item in list.__iter__(self)]
+
+    def pop(self, index=-1):
+        indexes = self._touch()
+        old = list.pop(self, index)
+        self._update_indexes(indexes, None, old, _MISSING)
+        return old
+
+    def _insert_position(self, index):
+        """Position where list.insert places an item, for an index which can be negative or out of range"""
+        length = self.__len__()
+        if index < 0:
+            return max(index + length, 0)
+        return min(index, length)
+
+    def _renumber(self, start):
+        """Update the index of the items linked to this list, from position start on"""
+        for index in range(start, self.__len__()):
+            child = list.__getitem__(self, index)
+            if isinstance(child, JSONNode) and child.parent is self:
+                child._index = index
+
+    def insert(self, index, item):
+        indexes = self._touch()
+        index = self._insert_position(index)
+        list.insert(self, index, None)
+        self._set_child(index, item)
+        self._renumber(index + 1)
+        self._update_indexes(indexes, None, _MISSING, list.__getitem__(self, index))
+
+    def extend(self, items):
+        indexes = self._touch()
+        for item in list(items):  # items can be this same list
+            index = self.__len__()
+            list.append(self, None)
+            self._set_child(index, item)
+            self._update_indexes(
+                indexes, None, _MISSING, list.__getitem__(self, index)
+            )
+
+    def __iadd__(self, items):
+        self.extend(items)
+        return self
+
+    remove = _touching(list.remove)
+    clear = _touching(list.clear)
+    sort = _touching(list.sort)
+    reverse = _touching(list.reverse)
+    __delitem__ = _touching(list.__delitem__)
+    __imul__ = _touching(list.__imul__)
 
     # ---- COMPARISON METHODS ----
     def __eq__(self, other):
@@ -1557,12 +2836,200 @@ class JSONList(list, JSONCompose):
             return result
 
 
+def _rebuilding_array(method):
+    """Wrap a list method of JSONNumericList so that its array buffer is rebuilt after the list is modified"""
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        result = method(self, *args, **kwargs)
+        self._array = _numeric_array(list(list.__iter__(self)))
+        return result
+
+    return wrapper
+
+
+class JSONNumericList(JSONList):
+    """
+    A list of numbers (int or float), built automatically from lists of numbers
+    with at least config.NUMERIC_ARRAY_MIN_LENGTH items.
+
+    Items are stored as raw python numbers, and their JSONInt/JSONFloat nodes are only built when they are accessed
+    (those nodes are not stored). An array buffer with the same numbers is kept, so that comparison actions
+    between the list and a sequence of numbers (gt, gte, lt, lte, exact, in) are evaluated in a vectorised way.
+
+    Attributes:
+    -----------
+        _array: array.array buffer with the list items (None if the list is no longer an homogeneous numeric list)
+    """
+
+    __slots__ = ("_array",)
+
+    _RESERVED_ATTRIBUTES = JSONList._RESERVED_ATTRIBUTES + ("_array",)
+
+    def __new__(cls, *args, **kwargs):
+        obj = super().__new__(cls, *args, **kwargs)
+        obj._array = None
+        return obj
+
+    @staticmethod
+    def _is_numeric(data):
+        """Check whether a raw list must be stored as a numeric list"""
+
+        min_length = config.NUMERIC_ARRAY_MIN_LENGTH
+        if min_length is None or len(data) < min_length:
+            return False
+        return _numeric_array(data) is not None
+
+    @staticmethod
+    def _raw_number(value):
+        """Raw python number of value, or None if it is not a number"""
+
+        if isinstance(value, (JSONInt, JSONFloat)):
+            value = value._data
+        return value if value.__class__ in (int, float) else None
+
+    def _assign_children(self):
+        # items are kept as raw numbers, so only the array buffer is built
+        self._array = _numeric_array(list(list.__iter__(self)))
+
+    def _item_node(self, index, item):
+        """Node of a list item (which is built if it is a raw number)"""
+
+        if isinstance(item, JSONNode):
+            return item
+        if item.__class__ is float:
+            node = JSONFloat(item)
+        elif item.__class__ is int:
+            node = JSONInt(item)
+        else:
+            node = JSONObject(item)
+        node._index = index
+        node.parent = self
+        return node
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self.__len__()))]
+        item = list.__getitem__(self, index)
+        if index < 0:
+            index += self.__len__()
+        return self._item_node(index, item)
+
+    def _iter_children(self):
+        """Iterate over child nodes, in index order"""
+        return (
+            self._item_node(index, item)
+            for index, item in enumerate(list.__iter__(self))
+        )
+
+    def _iter_query_children(self, keyed=False):
+        # items of a list have no key and numbers have no children, so they can't match a keyed query
+        if keyed and self._array is not None:
+            return iter(())
+        return self._iter_children()
+
+    def __setitem__(self, index, item):
+        number = self._raw_number(item)
+        if number is None or isinstance(index, slice):
+            super().__setitem__(index, item)
+            self._array = _numeric_array(list(list.__iter__(self)))
+            return
+        indexes = self._touch()
+        old = list.__getitem__(self, index)
+        list.__setitem__(self, index, number)
+        self._update_indexes(indexes, None, old, _MISSING)  # numbers are not indexed
+        if self._array is not None:
+            try:
+                self._array[index] = number
+            except (TypeError, OverflowError):  # an int array must hold a float now
+                self._array = _numeric_array(list(list.__iter__(self)))
+
+    def append(self, item, serialize_nodes=True):
+        number = self._raw_number(item)
+        if number is None:
+            self._array = None
+            return super().append(item, serialize_nodes=serialize_nodes)
+        indexes = self._touch()
+        self._update_indexes(indexes, None, _MISSING, _MISSING)  # numbers are not indexed
+        list.append(self, number)
+        if self._array is not None:
+            try:
+                self._array.append(number)
+            except (TypeError, OverflowError):
+                self._array = _numeric_array(list(list.__iter__(self)))
+
+    def pop(self, index=-1):
+        child = self[index]
+        indexes = self._touch()
+        old = list.pop(self, index)
+        self._update_indexes(indexes, None, old, _MISSING)
+        if self._array is not None:
+            self._array.pop(index)
+        return child
+
+    def insert(self, index, item):
+        number = self._raw_number(item)
+        if number is None:
+            super().insert(index, item)
+        else:
+            indexes = self._touch()
+            self._update_indexes(indexes, None, _MISSING, _MISSING)  # numbers are not indexed
+            index = self._insert_position(index)
+            list.insert(self, index, number)
+            self._renumber(index + 1)
+        self._array = _numeric_array(list(list.__iter__(self)))
+
+    def extend(self, items):
+        items = list(items)
+        numbers = [self._raw_number(item) for item in items]
+        if None in numbers:
+            super().extend(items)
+        else:
+            indexes = self._touch()
+            self._update_indexes(indexes, None, _MISSING, _MISSING)  # numbers are not indexed
+            list.extend(self, numbers)
+        self._array = _numeric_array(list(list.__iter__(self)))
+
+    def _shallow_copy(self):
+        obj = super()._shallow_copy()
+        if self._array is not None:
+            obj._array = self._array[:]
+        return obj
+
+    def _native(self):
+        if self._array is not None:  # all items are raw numbers
+            return list(list.__iter__(self))
+        return super()._native()
+
+    def __eq__(self, other):
+        if self._array is not None and isinstance(other, list):
+            if isinstance(other, JSONNumericList):
+                other_array = other._array
+            else:
+                other_array = _numeric_array(list(other))
+            if other_array is not None:
+                return self._array == other_array
+        # otherwise, compare item nodes (which can parse other types, like strings)
+        return list(self._iter_children()) == other
+
+    __hash__ = None
+
+    remove = _rebuilding_array(JSONList.remove)
+    sort = _rebuilding_array(JSONList.sort)
+    reverse = _rebuilding_array(JSONList.reverse)
+    clear = _rebuilding_array(JSONList.clear)
+    __delitem__ = _rebuilding_array(JSONList.__delitem__)
+    __imul__ = _rebuilding_array(JSONList.__imul__)
+
+
 # ---- SINGLETON OBJECTS ----
 class JSONStr(str, JSONSingleton):
-    def __new__(cls, string):
-        obj = super().__new__(cls, string)
-        obj._data = str(string)
-        return obj
+
+    __slots__ = JSONNode._NODE_SLOTS
+
+    @property
+    def _data(self):
+        return str.__str__(self)
 
     # converters
     def to_float(self, **kwargs):
@@ -1621,9 +3088,7 @@ class JSONStr(str, JSONSingleton):
                 return False
         # if target_value is a str
         elif isinstance(other, str):
-            if parse_datetime(
-                other, only_check=True
-            ):  # if target value is a datetime string
+            if _is_datetime_string(other):  # if target value is a datetime string
                 try:
                     return self.to_datetime() == parse_datetime(other)
                 except Exception:
@@ -1654,9 +3119,7 @@ class JSONStr(str, JSONSingleton):
                 return False
         # if target_value is a str
         elif isinstance(other, str):
-            if parse_datetime(
-                other, only_check=True
-            ):  # if target value is a datetime string
+            if _is_datetime_string(other):  # if target value is a datetime string
                 try:
                     return self.to_datetime() > parse_datetime(other)
                 except Exception:
@@ -1687,9 +3150,7 @@ class JSONStr(str, JSONSingleton):
                 return False
         # if target_value is a str
         elif isinstance(other, str):
-            if parse_datetime(
-                other, only_check=True
-            ):  # if target value is a datetime string
+            if _is_datetime_string(other):  # if target value is a datetime string
                 try:
                     return self.to_datetime() >= parse_datetime(other)
                 except Exception:
@@ -1720,9 +3181,7 @@ class JSONStr(str, JSONSingleton):
                 return False
         # if target_value is a str
         elif isinstance(other, str):
-            if parse_datetime(
-                other, only_check=True
-            ):  # if target value is a datetime string
+            if _is_datetime_string(other):  # if target value is a datetime string
                 try:
                     return self.to_datetime() < parse_datetime(other)
                 except Exception:
@@ -1753,9 +3212,7 @@ class JSONStr(str, JSONSingleton):
                 return False
         # if target_value is a str
         elif isinstance(other, str):
-            if parse_datetime(
-                other, only_check=True
-            ):  # if target value is a datetime string
+            if _is_datetime_string(other):  # if target value is a datetime string
                 try:
                     return self.to_datetime() <= parse_datetime(other)
                 except Exception:
@@ -1771,10 +3228,12 @@ class JSONStr(str, JSONSingleton):
 
 
 class JSONFloat(float, JSONSingleton):
-    def __new__(cls, fl):
-        obj = super().__new__(cls, fl)
-        obj._data = float(fl)
-        return obj
+
+    __slots__ = JSONNode._NODE_SLOTS
+
+    @property
+    def _data(self):
+        return float.__float__(self)
 
     def __hash__(self):
         return super().__hash__()
@@ -1811,10 +3270,11 @@ class JSONFloat(float, JSONSingleton):
 
 
 class JSONInt(int, JSONSingleton):
-    def __new__(cls, i):
-        obj = super().__new__(cls, i)
-        obj._data = int(i)
-        return obj
+    # int subclasses can't define non-empty __slots__, so JSONInt keeps an instance __dict__
+
+    @property
+    def _data(self):
+        return int.__int__(self)
 
     def __hash__(self):
         return super().__hash__()
@@ -1851,6 +3311,9 @@ class JSONInt(int, JSONSingleton):
 
 
 class JSONBool(JSONSingleton):
+
+    __slots__ = JSONNode._NODE_SLOTS + ("_data",)
+
     def __init__(self, data):
 
         if not isinstance(data, bool):
@@ -1894,6 +3357,9 @@ class JSONBool(JSONSingleton):
 
 
 class JSONNull(JSONSingleton):
+
+    __slots__ = JSONNode._NODE_SLOTS + ("_data",)
+
     def __init__(self, data):
 
         if not isinstance(data, type(None)):
@@ -1938,7 +3404,19 @@ class JSONNull(JSONSingleton):
 class JSONUnknown(JSONSingleton):
     """Unknown object"""
 
+    __slots__ = JSONNode._NODE_SLOTS + ("_data", "_type")
+
     def __init__(self, data):
         super().__init__()
         self._data = data
         self._type = type(data)
+
+
+# node classes of raw leaf values
+_LEAF_CLASSES = {
+    str: JSONStr,
+    int: JSONInt,
+    float: JSONFloat,
+    bool: JSONBool,
+    type(None): JSONNull,
+}
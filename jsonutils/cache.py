@@ -1,24 +1,98 @@
 import functools
+import threading
 import weakref
+from collections import OrderedDict, namedtuple
 
 
 def memoized_method(*lru_args, **lru_kwargs):
-    # TODO implement in jsonnode
+    """
+    Cache the results of a method of a compose node (JSONDict or JSONList), with functools.lru_cache
+    (lru_args and lru_kwargs are passed to it).
+    Cached results are discarded whenever the node or any of its descendants is modified,
+    by checking the subtree_version of the node.
+    """
+
     def decorator(func):
+        # id(node) -> (weak reference to node, node version, cached method)
+        caches = {}
+
         @functools.wraps(func)
         def wrapped_func(self, *args, **kwargs):
-            # We're storing the wrapped method inside the instance. If we had
-            # a strong reference to self the instance would never die.
-            self_weak = weakref.ref(self)
+            key = id(self)
+            version = self.subtree_version
+            entry = caches.get(key)
+
+            if entry is None or entry[0]() is not self or entry[1] != version:
+                # We're storing a weak reference to the instance. If we had
+                # a strong reference to self the instance would never die.
+                self_weak = weakref.ref(self, lambda _: caches.pop(key, None))
 
-            @functools.wraps(func)
-            @functools.lru_cache(*lru_args, **lru_kwargs)
-            def cached_method(*args, **kwargs):
-                return func(self_weak(), *args, **kwargs)
+                @functools.wraps(func)
+                @functools.lru_cache(*lru_args, **lru_kwargs)
+                def cached_method(*args, **kwargs):
+                    return func(self_weak(), *args, **kwargs)
 
-            self.__osetattr__(func.__name__, cached_method)
-            return cached_method(*args, **kwargs)
+                entry = caches[key] = (self_weak, version, cached_method)
+
+            return entry[2](*args, **kwargs)
 
         return wrapped_func
 
     return decorator
+
+
+CacheInfo = namedtuple(
+    "CacheInfo", ["hits", "misses", "evictions", "maxsize", "currsize"]
+)
+
+
+class LRUCache:
+    """
+    A bounded mapping: when it is full, the least recently used entry is evicted to make room for a new one.
+    Hits, misses and evictions are counted (see cache_info). It can be shared between threads.
+    """
+
+    __slots__ = ("maxsize", "hits", "misses", "evictions", "_entries", "_lock")
+
+    def __init__(self, maxsize=128):
+        if not isinstance(maxsize, int) or maxsize < 1:
+            raise ValueError(f"maxsize must be a positive integer, not {maxsize!r}")
+        self.maxsize = maxsize
+        self.hits = self.misses = self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """Value under key (which becomes the most recently used one), or default if there is not any"""
+
+        with self._lock:
+            try:
+                value = self._entries[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Remove all the entries (statistics are kept)"""
+
+        with self._lock:
+            self._entries.clear()
+
+    def cache_info(self):
+        return CacheInfo(
+            self.hits, self.misses, self.evictions, self.maxsize, len(self._entries)
+        )
+
+    def __len__(self):
+        return len(self._entries)
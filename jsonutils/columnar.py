@@ -0,0 +1,258 @@
+"""
+Columnar evaluation of queries over lists of records.
+A list of flat dicts with the same keys (records) is queried by columns, instead of node by node:
+the children under each key of the query are parsed once into a numpy array, and each condition
+is checked against all the records at once, as a boolean mask.
+
+Columns are parsed like the values of a ValueIndex: "number" columns as float64 (numeric strings
+are converted too), "datetime" columns as datetime64 and "string" columns as unicode arrays.
+Records whose child can't be parsed as the kind of the column (like a null in a number column)
+are checked against the query node by node, so results are the same as those of a traversal.
+Columns are cached in the list until it (or any of its records) is modified.
+
+numpy is an optional dependency: without it, lists of records are always queried node by node.
+"""
+import operator
+from datetime import datetime, timedelta, timezone
+
+import jsonutils.base as base
+import jsonutils.config as config
+import jsonutils.functions.parsers as parsers
+import jsonutils.indexes as indexes
+from jsonutils.functions.arrays import _MAX_EXACT_FLOAT_INT, _numpy
+
+# checks of a ColumnarQuery which are not compiled yet
+_UNCOMPILED = object()
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+# comparison actions which can be checked against a whole column
+_OPERATORS = {
+    "exact": operator.eq,
+    "gt": operator.gt,
+    "gte": operator.ge,
+    "lt": operator.lt,
+    "lte": operator.le,
+}
+
+
+def _query_bound(query_value):
+    """
+    (kind, bound) pair to compare a column with a query value, following the comparison methods
+    of the nodes, or None if the query value can't be compared by columns.
+    """
+
+    value_type = query_value.__class__
+    if value_type is int or value_type is float:
+        # ints must be exactly representable as floats
+        if value_type is int and abs(query_value) > _MAX_EXACT_FLOAT_INT:
+            return None
+        bound = indexes._number_bound(query_value)
+        return None if bound is indexes._MISSING else ("number", bound)
+    elif isinstance(query_value, datetime) or (
+        value_type is str and parsers._is_datetime_string(query_value)
+    ):
+        bound = indexes._datetime_bound(query_value)
+        if bound is indexes._MISSING or bound.utcoffset() is None:
+            return None
+        return "datetime", (bound - _EPOCH) // _MICROSECOND
+    elif value_type is str and "\x00" not in query_value:
+        return "string", query_value
+    return None
+
+
+def _compile_checks(plan):
+    """
+    List of (key, kind, bound, operator) tuples with the conditions of a compiled query plan,
+    to be checked against the columns of a list of records.
+    If any condition can't be checked by columns (or numpy is not installed), None will be returned.
+    """
+
+    if (
+        _numpy() is None
+        or plan.__class__ is not parsers._QueryPlan
+        or plan.key_pattern is not None
+        or plan.target_key is None
+    ):
+        return None
+
+    operators = {
+        function: _OPERATORS[name]
+        for name, function in parsers._node_actions().items()
+        if name in _OPERATORS
+    }
+    checks = []
+    for key, conditions in ((plan.target_key, plan.conditions), *plan.siblings):
+        for steps, query_value in conditions:
+            if len(steps) != 1 or steps[0][0] != parsers._ACTION:
+                return None
+            op = operators.get(steps[0][1])
+            if op is None:
+                return None
+            if op is operator.eq and query_value == base.All:
+                continue  # any child satisfies it
+            bound = _query_bound(query_value)
+            if bound is None:
+                return None
+            checks.append((key, *bound, op))
+    return checks
+
+
+class _RecordTable:
+    """
+    The records of a list, and the columns parsed from them.
+
+    Attributes:
+    -----------
+        stamp: subtree version of the list and number separators of the config, when it was built
+        records: tuple of the records of the list, or None if it is not a list of records
+        keys: frozenset of the keys of the records
+        columns: dict of (values, unknown) pairs of numpy arrays, by (key, kind) pairs.
+            Values which can't be parsed are flagged as unknown.
+    """
+
+    __slots__ = ("stamp", "records", "keys", "columns")
+
+    def __init__(self, stamp, records, keys):
+        self.stamp = stamp
+        self.records = records
+        self.keys = keys
+        self.columns = {}
+
+    def column(self, np, key, kind):
+        """Parsed column of the children under key (it is parsed on its first request)"""
+
+        column = self.columns.get((key, kind))
+        if column is None:
+            children = [dict.__getitem__(record, key) for record in self.records]
+            column = self.columns[key, kind] = _parse_column(np, children, kind)
+        return column
+
+
+def _parse_child(child, kind):
+    """Parsed value of a child, as it is stored in a column of kind (_MISSING if it can't be parsed)"""
+
+    if kind == "number":
+        try:
+            return indexes._parse_number(child)
+        except OverflowError:  # huge ints
+            return indexes._MISSING
+    elif kind == "datetime":
+        value = indexes._parse_datetime(child)
+        if value is indexes._MISSING or value.utcoffset() is None:
+            return indexes._MISSING
+        return (value - _EPOCH) // _MICROSECOND
+    value = indexes._parse_string(child)
+    # numpy strips trailing null characters
+    if value is not indexes._MISSING and "\x00" in value:
+        return indexes._MISSING
+    return value
+
+
+_PLACEHOLDERS = {"number": 0.0, "datetime": 0, "string": ""}
+_DTYPES = {"number": "float64", "datetime": "datetime64[us]", "string": "str"}
+
+
+def _parse_column(np, children, kind):
+    """(values, unknown) pair of numpy arrays with the parsed values of children"""
+
+    placeholder = _PLACEHOLDERS[kind]
+    values = []
+    unknown = []
+    for child in children:
+        value = _parse_child(child, kind)
+        if value is indexes._MISSING:
+            values.append(placeholder)
+            unknown.append(True)
+        else:
+            values.append(value)
+            unknown.append(False)
+    return np.array(values, dtype=_DTYPES[kind]), np.array(unknown, dtype=bool)
+
+
+def _collect_records(obj):
+    """(records, keys) pair of a list of flat dicts with the same keys, otherwise (None, None)"""
+
+    if obj._leaf_pool is not None or obj._cow is not None:
+        return None, None  # their children are positioned as they are requested
+    obj._materialize()
+    records = tuple(list.__iter__(obj))
+    keys = None
+    for record in records:
+        if not isinstance(record, base.JSONDict) or record._cow is not None:
+            return None, None
+        record._materialize()
+        if keys is None:
+            keys = frozenset(dict.keys(record))
+        elif dict.keys(record) != keys:
+            return None, None
+        for child in dict.values(record):
+            if child.is_composed:
+                return None, None
+    return records, keys
+
+
+def _record_table(obj):
+    """Table of the records of a list, cached in the list until it is modified"""
+
+    stamp = (obj._version, config.DECIMAL_SEPARATOR, config.THOUSANDS_SEPARATOR)
+    table = obj._columns
+    if table is None or table.stamp != stamp:
+        table = obj._columns = _RecordTable(stamp, *_collect_records(obj))
+    return table
+
+
+class ColumnarQuery:
+    """
+    A compiled query plan, to be checked against the columns of the lists of records of a tree.
+    Its conditions are compiled when the first list of enough records is reached.
+    """
+
+    __slots__ = ("plan", "_checks")
+
+    def __init__(self, plan):
+        self.plan = plan
+        self._checks = _UNCOMPILED
+
+    def matches(self, obj):
+        """
+        List of the children of the records of list obj which satisfy the query plan, in the same
+        order as a traversal. If obj can't be queried by columns, None will be returned.
+        """
+
+        min_records = config.COLUMNAR_MIN_RECORDS
+        if min_records is None or list.__len__(obj) < min_records:
+            return None
+        if self._checks is _UNCOMPILED:
+            self._checks = _compile_checks(self.plan)
+        if self._checks is None:
+            return None
+        table = _record_table(obj)
+        records = table.records
+        if records is None:
+            return None
+        plan = self.plan
+        if plan.target_key not in table.keys or not plan.sibling_keys <= table.keys:
+            return []  # records are flat, so no descendant has all the keys
+
+        np = _numpy()
+        selected = np.ones(len(records), dtype=bool)
+        unknown = np.zeros(len(records), dtype=bool)
+        for key, kind, bound, op in self._checks:
+            values, column_unknown = table.column(np, key, kind)
+            if kind == "datetime":
+                bound = np.datetime64(bound, "us")
+            selected &= op(values, bound) | column_unknown
+            unknown |= column_unknown
+
+        rows = np.flatnonzero(selected)
+        target_key = plan.target_key
+        match = plan.match
+        matches = []
+        for row, doubtful in zip(rows.tolist(), unknown[rows].tolist()):
+            child = dict.__getitem__(records[row], target_key)
+            # children which can't be parsed are checked by the query itself
+            if not doubtful or match(child):
+                matches.append(child)
+        return matches
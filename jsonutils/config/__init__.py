@@ -7,3 +7,4 @@ from .queries import (
     QUERY_EXCEPTIONS,
     RECURSIVE_QUERIES,
 )
+from .arrays import COLUMNAR_MIN_RECORDS, NUMERIC_ARRAY_MIN_LENGTH
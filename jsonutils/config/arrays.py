@@ -0,0 +1,2 @@
+NUMERIC_ARRAY_MIN_LENGTH = 32  # lists of numbers with at least this length are stored as numeric arrays (None to disable)
+COLUMNAR_MIN_RECORDS = 256  # lists of at least this many records are queried by columns, if numpy is installed (None to disable)
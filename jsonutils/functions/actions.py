@@ -29,6 +29,7 @@ JSONDict -----> list/tuple
     .
 """
 
+import operator
 import re
 from datetime import date, datetime
 
@@ -40,15 +41,31 @@ from jsonutils.base import (
     JSONInt,
     JSONList,
     JSONNull,
+    JSONNumericList,
     JSONSingleton,
     JSONStr,
     JSONUnknown,
 )
 from jsonutils.exceptions import JSONQueryException
+from jsonutils.functions.arrays import _array_isin, _compare_arrays, _numeric_array
 from jsonutils.functions.parsers import parse_datetime, parse_float, url_validator
 from jsonutils.query import All
 
 
+def _numeric_arrays(node, requested_value):
+    """
+    If node is an homogeneous numeric list and requested value a sequence of numbers,
+    returns the array buffers of both of them, so that actions can be evaluated in a vectorised way.
+    Otherwise, returns None.
+    """
+    if not isinstance(node, JSONNumericList) or node._array is None:
+        return None
+    requested_array = _numeric_array(requested_value)
+    if requested_array is None:
+        return None
+    return node._array, requested_array
+
+
 def _gt(node, requested_value):
     """
     Greather than action
@@ -75,6 +92,9 @@ def _gt(node, requested_value):
         if isinstance(requested_value, (list, tuple)):
             requested_value = list(requested_value)
 
+            if (array := _numeric_arrays(node, requested_value)) is not None:
+                return _compare_arrays(*array, operator.gt)
+
             len_node = len(node)
             len_requ = len(requested_value)
             length = min((len_node, len_requ))
@@ -103,6 +123,9 @@ def _gte(node, requested_value):
         if isinstance(requested_value, (list, tuple)):
             requested_value = list(requested_value)
 
+            if (array := _numeric_arrays(node, requested_value)) is not None:
+                return _compare_arrays(*array, operator.ge)
+
             len_node = len(node)
             len_requ = len(requested_value)
             length = min((len_node, len_requ))
@@ -131,6 +154,9 @@ def _lt(node, requested_value):
         if isinstance(requested_value, (list, tuple)):
             requested_value = list(requested_value)
 
+            if (array := _numeric_arrays(node, requested_value)) is not None:
+                return _compare_arrays(*array, operator.lt)
+
             len_node = len(node)
             len_requ = len(requested_value)
             length = min((len_node, len_requ))
@@ -159,6 +185,9 @@ def _lte(node, requested_value):
         if isinstance(requested_value, (list, tuple)):
             requested_value = list(requested_value)
 
+            if (array := _numeric_arrays(node, requested_value)) is not None:
+                return _compare_arrays(*array, operator.le)
+
             len_node = len(node)
             len_requ = len(requested_value)
             length = min((len_node, len_requ))
@@ -212,7 +241,7 @@ def _exact(node, requested_value):
             return False
     elif isinstance(node, JSONList):
         if isinstance(requested_value, (list, tuple)):
-            return node == list(requested_value)
+            return node == list(requested_value)  # numeric lists compare their arrays
         else:
             return False
     elif isinstance(node, JSONSingleton):
@@ -356,6 +385,8 @@ def _in(node, requested_value):
             return node in requested_value
     elif isinstance(node, JSONList):
         if isinstance(requested_value, (list, tuple)):
+            if (array := _numeric_arrays(node, list(requested_value))) is not None:
+                return _array_isin(*array)
             return all(x in requested_value for x in node)
     elif isinstance(node, JSONDict):
         if isinstance(requested_value, (list, tuple)):
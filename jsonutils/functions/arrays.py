@@ -0,0 +1,92 @@
+# Functions to handle homogeneous numeric sequences as array buffers
+
+from array import array
+
+# the biggest integer which can be exactly represented as a float
+_MAX_EXACT_FLOAT_INT = 2**53
+
+
+def _numpy():
+    """Returns numpy module if it is installed (it is an optional dependency), otherwise None"""
+
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def _numeric_typecode(items):
+    """
+    Returns the array typecode of a sequence of numbers:
+        'q' if all of them are ints, 'd' if they are floats (or floats and ints).
+    If items is not an homogeneous numeric sequence, None will be returned.
+    Booleans are not taken as numbers.
+    """
+
+    types = set(map(type, items))
+    if types == {int}:
+        return "q"
+    elif types == {float}:
+        return "d"
+    elif types == {int, float}:
+        # ints must be exactly representable as floats
+        if any(
+            abs(item) > _MAX_EXACT_FLOAT_INT for item in items if item.__class__ is int
+        ):
+            return None
+        return "d"
+    return None
+
+
+def _numeric_array(items):
+    """
+    Returns an array buffer with the items of a numeric sequence.
+    If items is not an homogeneous numeric sequence (or numbers are out of range), None will be returned.
+    """
+
+    typecode = _numeric_typecode(items)
+    if typecode is None:
+        return None
+    try:
+        return array(typecode, items)
+    except OverflowError:
+        return None
+
+
+def _to_ndarray(np, buffer):
+    """A numpy view over an array buffer (no data is copied)"""
+    return np.frombuffer(buffer, dtype=buffer.typecode)
+
+
+def _compare_arrays(left, right, op):
+    """
+    Apply comparison op elementwise over the common length of two array buffers.
+    Returns True only if all comparisons succeed (and there is at least one of them).
+    """
+
+    length = min(len(left), len(right))
+    if not length:
+        return False
+
+    np = _numpy()
+    if np is not None:
+        result = op(_to_ndarray(np, left)[:length], _to_ndarray(np, right)[:length])
+        return bool(result.all())
+    return all(map(op, left, right))
+
+
+def _array_isin(values, choices):
+    """Returns True if all values of an array buffer are contained in choices array buffer"""
+
+    if not len(values):
+        return True
+    if not len(choices):
+        return False
+
+    np = _numpy()
+    if np is not None:
+        result = np.isin(_to_ndarray(np, values), _to_ndarray(np, choices))
+        return bool(result.all())
+    choices = set(choices)
+    return all(map(choices.__contains__, values))
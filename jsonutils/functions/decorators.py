@@ -147,7 +147,7 @@ def return_native_types(func):
     def wrapper(self):
         res = func(self)
         if self._native_types:
-            return res._data
+            return res._native_result
         return res
 
     return wrapper
@@ -3,7 +3,8 @@
 import ast
 import re
 from datetime import date, datetime
-from functools import reduce
+from functools import lru_cache, reduce
+from itertools import chain
 from json import JSONDecoder
 
 import jsonutils.base as base
@@ -12,7 +13,7 @@ import requests
 import jsonutils.config as config
 from jsonutils.exceptions import JSONQueryException, JSONSingletonException
 from jsonutils.functions.decorators import catch_exceptions, return_str_or_datetime
-from jsonutils.query import All, AllChoices, ExtractYear, I, QuerySet
+from jsonutils.query import All, AllChoices, ExtractYear, I, Q, QuerySet
 from jsonutils.utils.retry import retry_function
 from jsonutils.utils.urls import join_paths
 
@@ -28,124 +29,306 @@ _DEFAULT_UNITS_FACTOR_DICT = {
 }
 
 
-def _parse_query(node, include_parent_, **q):
+# ---- QUERY PLANS ----
+# A query (the **q arguments of query, get, query_key...) is compiled once into a plan, which is then checked
+# against every node of the traversal. Each query argument becomes a list of steps: modificators which move
+# the object to be checked (parent, parents, c_<key>, <index>, year) and actions which check it.
+_PARENT = 0
+_PARENTS = 1
+_CHILD = 2
+_INDEX = 3
+_YEAR = 4
+_ACTION = 5  # an action function, called as function(obj, query_value)
+_METHOD = 6  # an action method name of a non node object (like ExtractYear)
+_ERROR = 7  # a bad query, which raises an exception when it is reached
+
+_QUERY_VALUE_TYPES = (
+    type,
+    float,
+    int,
+    str,
+    type(None),
+    bool,
+    dict,
+    list,
+    tuple,
+    date,
+    datetime,
+    AllChoices,
+)
+
+# action name -> action function (see _node_actions)
+_NODE_ACTIONS = {}
+
+
+def _node_actions():
+    """Returns the node actions (without the action suffix), mapped to the functions which implement them"""
+
+    if not _NODE_ACTIONS:
+        from jsonutils.functions import actions
+
+        functions = {}
+        for name in dir(base.JSONNode):
+            if name.endswith("action"):
+                action = name.replace("_action", "")
+                functions[action] = getattr(actions, f"_{action}")
+        _NODE_ACTIONS.update(functions)
+    return _NODE_ACTIONS
+
+
+def _check_query_value(query_value):
+
+    if not isinstance(query_value, _QUERY_VALUE_TYPES):
+        raise JSONQueryException(
+            f"Target value of query has invalid type: {type(query_value)}. Valid types are: float, int, str, None, bool, dict, list, tuple, date, datetime, allchoices"
+        )
+
+
+def _compile_actions(target_actions):
     """
-    We must determine whether the child passed as input argument matches the conditions given by the query q.
-    If required actions don't match the child type, it won't throw any exception, just returns False for such an object, and
-    it won't be appended to the queryset.
-    Query q must be structured as follows:
-        <key>__<modificator>__<query>
+    Compile a list of modificators and actions (the splitted key of a query argument, without its target key)
+    into a list of (operation, argument) steps.
     """
 
-    # grab a list of node actions, without the action suffix
-    node_actions = [
-        i.replace("_action", "") for i in dir(base.JSONNode) if i.endswith("action")
-    ]
+    node_actions = _node_actions()
+    steps = []
+    check_modificators = True
+    actions_count = len(target_actions)
+    for idx, action in enumerate(target_actions):
+        is_last = idx == actions_count - 1
+        if check_modificators:
+            # ---- MODIFICATORS ----
+            # modify obj before apply actions
+            if action == "parent":
+                steps.append((_PARENT, None))
+                if not is_last:
+                    continue
+                action = "exact"  # if parent is last action, take exact as the default one
+            elif action == "parents":  # multiparents modificator
+                remaining_actions = target_actions[idx + 1 :]
+                if "parents" in remaining_actions:
+                    steps.append((_PARENTS, None))  # it raises an exception
+                else:
+                    steps.append((_PARENTS, _compile_actions(remaining_actions)))
+                return steps  # remaining actions are checked against each parent
+            elif match := re.fullmatch(r"c_(\w+)", action):  # child modificator
+                steps.append((_CHILD, match.group(1)))
+                if not is_last:
+                    continue
+                action = "exact"  # if child is last action, take exact as the default one
+            elif action.isdigit():
+                steps.append((_INDEX, int(action)))
+                if not is_last:
+                    continue
+                action = "exact"  # if digit is last action, take exact as the default one
+            elif action == "year":
+                if len(target_actions[idx + 1 :]) > 1:
+                    steps.append(
+                        (_ERROR, "After year lookup, cannot set more actions")
+                    )
+                    return steps
+                steps.append((_YEAR, None))
+                check_modificators = False  # year object has no modificators
+                if not is_last:
+                    continue
+                action = "exact"  # if year is last action, take exact as the default one
+        # ---- MATCH ----
+        # node actions can't interfer with modificators
+        if action not in node_actions:
+            steps.append((_ERROR, f"Bad query: {action}"))
+            return steps
+        if check_modificators:
+            steps.append((_ACTION, node_actions[action]))
+        else:
+            steps.append((_METHOD, action + "_action"))
+    return steps
+
+
+def _descend(obj, operation, argument):
+    """Node reached from obj by a _CHILD, _INDEX or _PARENT step (None if there is no such node)"""
+
+    if operation == _PARENT:
+        return obj.parent
+    elif operation == _CHILD:
+        # missing keys are usual (like in the ancestors of a parents lookup), so they are
+        # checked before raising an exception
+        if isinstance(obj, dict):
+            if not dict.__contains__(obj, argument):
+                return None
+        elif isinstance(obj, list):  # child keys are never list indexes
+            return None
+        try:
+            return obj.__getitem__(argument)
+        except Exception:
+            return None
+    if not isinstance(obj, list):
+        return None
+    try:
+        return obj[argument]
+    except IndexError:
+        return None
 
-    class UniqueList(list):
-        """A list but appending only unique values"""
-
-        def append(self, object):
-            return super().append(object) if object not in self else None
-
-    def make_actions(obj, target_actions, query_value):
-        MODIFICATOR_CHECK = True
-        actions_count = len(target_actions)
-        for idx, action in enumerate(target_actions):
-            if MODIFICATOR_CHECK:
-                # ---- MODIFICATORS ----
-                # modify obj before apply actions
-                if action == "parent":
-                    obj = obj.parent
-                    if obj is None:
-                        return False
-                    if idx == actions_count - 1:
-                        action = "exact"  # if parent is last action, take exact as the default one
-                    else:
-                        continue  # continue to next action or modificator
-                elif action == "parents":  # multiparents modificator
-                    parents = obj.parent_list
-                    if not parents:
-                        return False
-                    if "parents" in target_actions[idx + 1 :]:
-                        raise JSONQueryException(
-                            "Lookup parents can only be included once"
-                        )
 
-                    results = (
-                        make_actions(i, target_actions[idx + 1 :], query_value)
-                        for i in parents
-                    )
-                    if any(results):
-                        return True  # no more actions, continue with next query
-                    else:
-                        return False
-                elif match := re.fullmatch(r"c_(\w+)", action):  # child modificator
-                    try:
-                        obj = obj.__getitem__(match.group(1))
-                    except Exception:
-                        return False
-                    if idx == actions_count - 1:
-                        action = "exact"  # if child is last action, take exact as the default one
-                    else:
-                        continue  # continue to next action or modificator
-                elif action.isdigit():
-                    if not isinstance(obj, list):
-                        return False
-                    try:
-                        obj = obj[int(action)]
-                    except IndexError:
-                        return False
-                    if idx == actions_count - 1:
-                        action = "exact"  # if digit is last action, take exact as the default one
-                    else:
-                        continue  # continue to next action or modificator
-                elif action == "year":  # TODO add test for year
-                    if len(target_actions[idx + 1 :]) > 1:
-                        raise JSONQueryException(
-                            f"After year lookup, cannot set more actions"
-                        )
-                    obj = ExtractYear(obj)
-                    if idx == actions_count - 1:
-                        action = "exact"  # if year is last action, take exact as the default one
-                    else:
-                        MODIFICATOR_CHECK = False
-                        continue  # continue to next action without cheking more modificators
-            # ---- MATCH ----
-            # all comparisons have child object to the left, and the underlying algorithm is contained in the magic methods of the JSON objects
+_DESCENDING_STEPS = (_CHILD, _INDEX, _PARENT)
+
+
+def _run_steps(obj, steps, query_value):
+    """Check a compiled query argument against obj"""
+
+    for operation, argument in steps:
+        if operation == _ACTION:
+            # all comparisons have child object to the left, and the underlying algorithm is contained in the actions
             # no errors will be thrown, if types are not compatible, just returns False
-            # node actions can't interfer with modificators
-            if action in node_actions:  # call corresponding node method
-                result = getattr(obj, action + "_action")(query_value)
-                if not result:
+            if not argument(obj, query_value):
+                return False
+        elif operation in _DESCENDING_STEPS:
+            obj = _descend(obj, operation, argument)
+            if obj is None:
+                return False
+        elif operation == _PARENTS:
+            parents = obj._ancestor_chain()
+            if not parents:
+                return False
+            if argument is None:
+                raise JSONQueryException("Lookup parents can only be included once")
+            return any(_run_steps(i, argument, query_value) for i in parents)
+        elif operation == _YEAR:
+            obj = ExtractYear(obj)
+        elif operation == _METHOD:
+            if not getattr(obj, argument)(query_value):
+                return False
+        else:
+            raise JSONQueryException(argument)
+    return True
+
+
+# actions which read the key path of the node (or any data, like the function of apply)
+_UPWARD_ACTIONS = {"path", "notpath", "nchild", "apply"}
+
+
+def _looks_upwards(steps):
+    """Whether any step of a compiled query argument reads the ancestors of the node"""
+
+    return any(
+        operation in (_PARENT, _PARENTS)
+        or (operation == _ACTION and argument.__name__[1:] in _UPWARD_ACTIONS)
+        for operation, argument in steps
+    )
+
+
+class _QueryPlan:
+    """
+    A compiled query, to be checked against the nodes of a tree.
+
+    Attributes:
+    -----------
+        key_pattern: compiled regex which node keys must fully match (query_key), or None
+        match_key: _KeyMatcher of key_pattern, or None
+        target_key: key which nodes must have (query), or None
+        conditions: list of (steps, query_value) pairs, one for each query argument of the target key
+        siblings: tuple of (key, conditions) pairs, for the other keys of a multiquery, which are
+            checked against the children of the same dict (record) as the nodes
+        sibling_keys: frozenset of the keys of siblings
+    """
+
+    __slots__ = (
+        "key_pattern",
+        "match_key",
+        "target_key",
+        "conditions",
+        "siblings",
+        "sibling_keys",
+    )
+
+    def __init__(self, conditions, target_key=None, key_pattern=None, siblings=()):
+        self.conditions = conditions
+        self.target_key = target_key
+        self.key_pattern = key_pattern
+        self.match_key = None if key_pattern is None else _key_matcher(key_pattern)
+        self.siblings = siblings
+        self.sibling_keys = frozenset(key for key, _ in siblings)
+
+    @property
+    def keyed(self):
+        """Whether only the nodes with a key (not list items) can satisfy the query"""
+        return bool(self.conditions) or self.match_key is not None
+
+    @property
+    def looks_upwards(self):
+        """
+        Whether any condition is checked against the ancestors of the nodes
+        (parent lookups, or actions which read the key path of the nodes)
+        """
+
+        return any(
+            _looks_upwards(steps)
+            for steps, _ in chain(
+                self.conditions,
+                *(conditions for _, conditions in self.siblings),
+            )
+        )
+
+    def match(self, node):
+        """Check whether node satisfies the query"""
+
+        if self.match_key is not None:
+            if not self.match_key(node._key):
+                return False
+        elif self.conditions and node._key != self.target_key:
+            return False
+
+        siblings = self.siblings
+        if siblings:
+            # all the keys must be in the record before any action is run
+            record = node.parent
+            if record is None or not dict.keys(record) >= self.sibling_keys:
+                return False
+
+        for steps, query_value in self.conditions:
+            if not _run_steps(node, steps, query_value):
+                return False
+        return not siblings or self._match_siblings(record)
+
+    def _record(self, node):
+        """Parent dict of node, if it has all the other keys of a multiquery (otherwise None)"""
+
+        record = node.parent
+        if record is None or not dict.keys(record) >= self.sibling_keys:
+            return None
+        return record
+
+    def _match_siblings(self, record):
+        """Check the conditions of the other keys of a multiquery against the children of record"""
+
+        # children of plain records are taken straight from the dict (otherwise, they may have to be
+        # wrapped or linked to the record first)
+        direct = not (
+            record._lazy or record._leaf_pool is not None or record._cow is not None
+        )
+        for key, conditions in self.siblings:
+            sibling = dict.__getitem__(record, key) if direct else record[key]
+            for steps, query_value in conditions:
+                if not _run_steps(sibling, steps, query_value):
                     return False
-            else:
-                raise JSONQueryException(f"Bad query: {action}")
         return True
 
-    target_keys = UniqueList()
 
+def _compile_query(*args, **q):
+    """
+    Compile the arguments of a query into a _QueryPlan.
+    Query arguments must be structured as follows:
+        <key>__<modificator>__<action>
+    If several target keys are requested (multiquery mode), nodes must have the first one,
+    and the other ones are checked against the children of their parent (siblings of the plan),
+    each of them fetched once per record.
+    If there are Q objects (args), they are joined with the query arguments into a _QPlan.
+    """
+    if args:
+        return _QPlan(Q(*args, **q))
+
+    conditions = {}  # target key -> [(steps, query_value)]
     for query_key, query_value in q.items():
-        if not isinstance(
-            query_value,
-            (
-                type,
-                float,
-                int,
-                str,
-                type(None),
-                bool,
-                dict,
-                list,
-                tuple,
-                date,
-                datetime,
-                AllChoices,
-            ),
-        ):
-            raise JSONQueryException(
-                f"Target value of query has invalid type: {type(query_value)}. Valid types are: float, int, str, None, bool, dict, list, tuple, date, datetime, allchoices"
-            )
+        _check_query_value(query_value)
         splitted_query = [i for i in query_key.split("__") if i]
 
         if not splitted_query:
@@ -154,31 +337,264 @@ def _parse_query(node, include_parent_, **q):
         target_key = splitted_query[0]
         target_actions = splitted_query[1:] or ["exact"]
 
-        target_keys.append(target_key)
+        conditions.setdefault(target_key, []).append(
+            (_compile_actions(target_actions), query_value)
+        )
 
-        if len(target_keys) > 1:  # MULTIQUERY MODE
-            # in a multiquery mode, we take the outer dict which contains the first target key
-            # so we prepend __parent__c_<target_key> in the target_actions list
-            target_actions = ["parent", f"c_{target_key}"] + target_actions
-            target_key = target_keys[0]
+    if not conditions:
+        return _QueryPlan([])
+    # MULTIQUERY MODE: the other target keys are checked within the dict of the first one
+    (target_key, target_conditions), *siblings = conditions.items()
+    return _QueryPlan(
+        target_conditions, target_key=target_key, siblings=tuple(siblings)
+    )
+
+
+# ---- Q OBJECTS ----
+# estimated cost of checking an action against a node, so that the cheapest conditions of a Q object
+# are checked first: key and type checks, then comparisons, then text searches, and regexes or functions last
+_ACTION_COSTS = {
+    "isnull": 0,
+    "type": 0,
+    "key": 0,
+    "index": 0,
+    "length": 0,
+    "nchild": 0,
+    "bool": 0,
+    "exact": 1,
+    "in": 1,
+    "gt": 1,
+    "gte": 1,
+    "lt": 1,
+    "lte": 1,
+    "startswith": 1,
+    "endswith": 1,
+    "contains": 2,
+    "icontains": 2,
+}
+_MAX_ACTION_COST = 3  # regex, fullregex, path, notpath, apply, and comparisons with datetimes
+
+
+def _condition_cost(steps, query_value):
+    """Estimated cost of checking a compiled query argument against a node"""
+
+    cost = 0
+    for operation, argument in steps:
+        if operation == _ACTION:
+            action_cost = _ACTION_COSTS.get(argument.__name__[1:], _MAX_ACTION_COST)
+            # datetime values make nodes to be parsed as datetimes
+            if isinstance(query_value, (date, datetime)) or (
+                isinstance(query_value, str) and _is_datetime_string(query_value)
+            ):
+                action_cost = _MAX_ACTION_COST
+            cost += action_cost
+        elif operation == _PARENTS:
+            # remaining steps are checked against each parent
+            remaining = _condition_cost(argument or (), query_value)
+            return cost + _MAX_ACTION_COST + remaining
+        elif operation in (_YEAR, _METHOD):
+            cost += _MAX_ACTION_COST
+    return cost
+
+
+class _QCondition:
+    """A query argument of a Q object, checked against the child of a record under its target key"""
+
+    __slots__ = ("steps", "query_value", "cost")
+
+    def __init__(self, query_key, query_value):
+        _check_query_value(query_value)
+        splitted_query = [i for i in query_key.split("__") if i]
+        if not splitted_query:
+            raise JSONQueryException("Bad query. Missing target key")
+
+        self.steps = [(_CHILD, splitted_query[0])] + _compile_actions(
+            splitted_query[1:] or ["exact"]
+        )
+        self.query_value = query_value
+        self.cost = _condition_cost(self.steps, query_value)
+
+    def check(self, record):
+        return _run_steps(record, self.steps, self.query_value)
 
-        # first of all, if target key of query argument does not match child's key, we won't append it to querylist
-        if target_key != node._key:
-            return False, None
 
-        obj = node
+class _QGroup:
+    """
+    Compiled Q object: its children are sorted by their estimated cost, so that the cheapest ones
+    are checked first, and checking stops as soon as the result is known.
+    """
+
+    __slots__ = ("connector", "negated", "children", "cost")
+
+    def __init__(self, q):
+        self.connector = q.connector
+        self.negated = q.negated
+        self.children = []
+        for child in q.children:
+            if not isinstance(child, Q):
+                self.children.append(_QCondition(*child))
+                continue
+            group = _QGroup(child)
+            # nested groups with the same connector are merged, so all their children are sorted together
+            if not group.negated and (
+                group.connector == self.connector or len(group.children) == 1
+            ):
+                self.children.extend(group.children)
+            else:
+                self.children.append(group)
+        self.children.sort(key=lambda child: child.cost)
+        self.cost = sum(child.cost for child in self.children)
 
-        result = make_actions(obj, target_actions, query_value)
-        if result is False:
-            return False, None
-    return (True, node.parent if include_parent_ else node)
+    def check(self, record):
+        if self.connector == Q.OR:
+            result = any(child.check(record) for child in self.children)
+        else:
+            result = all(child.check(record) for child in self.children)
+        return result != self.negated
 
+    def iter_conditions(self):
+        for child in self.children:
+            if isinstance(child, _QGroup):
+                yield from child.iter_conditions()
+            else:
+                yield child
 
-def _parse_query_key(node, pattern, include_parent_, **q):
-    """ """
-    # --- first checks ----
-    if not node._key:
-        return False, None
+
+class _QPlan(_QueryPlan):
+    """
+    A compiled query made of Q objects. It is checked against the dicts of a tree (records),
+    and it has no conditions for the indexes, which can't narrow it.
+    """
+
+    __slots__ = ("group",)
+
+    def __init__(self, q):
+        super().__init__([])
+        self.group = _QGroup(q)
+
+    @property
+    def keyed(self):
+        return True  # only dicts are checked
+
+    @property
+    def looks_upwards(self):
+        return any(
+            _looks_upwards(condition.steps)
+            for condition in self.group.iter_conditions()
+        )
+
+    def match(self, node):
+        return isinstance(node, dict) and self.group.check(node)
+
+
+# ---- QUERY SCOPES ----
+class _PathScope:
+    """
+    Bounds of the traversal of a query (within_ and max_depth_ arguments).
+
+    within is a path relative to the node which sends the query (a string like "data/*/items",
+    a tuple of keys or a JSONPath), where "*" matches any key or list index, and "**" any number of them.
+    Only the descendants of the nodes at that path are checked, and subtrees which can't lead to them
+    are not traversed. max_depth is the deepest level of the traversal (children of the node are at level 1).
+
+    Positions of within reached by a node (its states) are followed as the tree is traversed:
+    None means that the node is already within the scope, and an empty set that it can't lead to it.
+    """
+
+    __slots__ = ("segments", "max_depth", "start")
+
+    def __init__(self, within=None, max_depth=None):
+        if max_depth is not None and not (isinstance(max_depth, int) and max_depth > 0):
+            raise TypeError(
+                f"Argument max_depth_ must be a positive integer or NoneType, not {max_depth!r}"
+            )
+        if within is None:
+            segments = ()
+        elif isinstance(within, base.JSONPath):
+            segments = within.keys
+        elif isinstance(within, str):
+            segments = [i for i in within.split("/") if i]
+        elif isinstance(within, (tuple, list)):
+            segments = within
+        else:
+            raise TypeError(
+                f"Argument within_ must be a str, tuple or JSONPath instance, not {type(within)}"
+            )
+        self.segments = tuple(str(segment) for segment in segments)
+        self.max_depth = max_depth
+        self.start = self._reached({0})
+
+    def _reached(self, positions):
+        # "**" can match no key at all, so the next position is also reached
+        positions = set(positions)
+        for position in sorted(positions):
+            while (
+                position < len(self.segments) and self.segments[position] == "**"
+            ):
+                position += 1
+                positions.add(position)
+        if len(self.segments) in positions:
+            return None
+        return frozenset(positions)
+
+    def advance(self, states, key):
+        """States of the child under key of a node with the given states"""
+
+        if states is None:
+            return None
+        key = str(key)
+        positions = set()
+        for position in states:
+            segment = self.segments[position]
+            if segment == "**":
+                positions.add(position)
+            elif segment == "*" or segment == key:
+                positions.add(position + 1)
+        return self._reached(positions)
+
+    @property
+    def cache_key(self):
+        return self.segments, self.max_depth
+
+
+# ---- KEY PATTERNS ----
+# Trees have few distinct keys, but many nodes under them (node keys are interned as they are loaded).
+# The result of matching a key pattern against each distinct key is cached, and shared by all the queries
+# with the same pattern, so nodes are checked with a dict lookup instead of a regex match.
+_MAX_KEY_MATCHES = 65536  # distinct keys remembered by each key pattern
+
+
+class _KeyMatcher:
+    """Check whether keys fully match a compiled regex, remembering the result for each key"""
+
+    __slots__ = ("pattern", "matches")
+
+    def __init__(self, pattern):
+        self.pattern = pattern
+        self.matches = {}  # key -> bool
+
+    def __call__(self, key):
+        if not key:  # list items
+            return False
+        try:
+            return self.matches[key]
+        except KeyError:
+            pass
+        result = self.pattern.fullmatch(key) is not None
+        if len(self.matches) < _MAX_KEY_MATCHES:
+            self.matches[key] = result
+        return result
+
+
+@lru_cache(maxsize=256)
+def _key_matcher(pattern):
+    """_KeyMatcher of a compiled key pattern"""
+
+    return _KeyMatcher(pattern)
+
+
+def _compile_query_key(pattern, **q):
+    """Compile the arguments of a query_key into a _QueryPlan"""
 
     if pattern == "*":
         pattern = ".*"
@@ -194,125 +610,93 @@ def _parse_query_key(node, pattern, include_parent_, **q):
     if not q:
         q = {"exact": All}
 
-    # --------------------
-
-    # grab a list of node actions, without the action suffix
-    node_actions = [
-        i.replace("_action", "") for i in dir(base.JSONNode) if i.endswith("action")
-    ]
-
-    def make_actions(obj, target_actions, query_value):
-        MODIFICATOR_CHECK = True
-        actions_count = len(target_actions)
-        for idx, action in enumerate(target_actions):
-            if MODIFICATOR_CHECK:
-                # ---- MODIFICATORS ----
-                # modify obj before apply actions
-                if action == "parent":
-                    obj = obj.parent
-                    if obj is None:
-                        return False
-                    if idx == actions_count - 1:
-                        action = "exact"  # if parent is last action, take exact as the default one
-                    else:
-                        continue  # continue to next action or modificator
-                elif action == "parents":  # multiparents modificator
-                    parents = obj.parent_list
-                    if not parents:
-                        return False
-                    if "parents" in target_actions[idx + 1 :]:
-                        raise JSONQueryException(
-                            "Lookup parents can only be included once"
-                        )
-
-                    results = (
-                        make_actions(i, target_actions[idx + 1 :], query_value)
-                        for i in parents
-                    )
-                    if any(results):
-                        return True  # no more actions, continue with next query
-                    else:
-                        return False
-                elif match := re.fullmatch(r"c_(\w+)", action):  # child modificator
-                    try:
-                        obj = obj.__getitem__(match.group(1))
-                    except Exception:
-                        return False
-                    if idx == actions_count - 1:
-                        action = "exact"  # if child is last action, take exact as the default one
-                    else:
-                        continue  # continue to next action or modificator
-                elif action.isdigit():
-                    if not isinstance(obj, list):
-                        return False
-                    try:
-                        obj = obj[int(action)]
-                    except IndexError:
-                        return False
-                    if idx == actions_count - 1:
-                        action = "exact"  # if digit is last action, take exact as the default one
-                    else:
-                        continue  # continue to next action or modificator
-                elif action == "year":  # TODO add test for year
-                    if len(target_actions[idx + 1 :]) > 1:
-                        raise JSONQueryException(
-                            f"After year lookup, cannot set more actions"
-                        )
-                    obj = ExtractYear(obj)
-                    if idx == actions_count - 1:
-                        action = "exact"  # if year is last action, take exact as the default one
-                    else:
-                        MODIFICATOR_CHECK = False
-                        continue  # continue to next action without cheking more modificators
-            # ---- MATCH ----
-            # all comparisons have child object to the left, and the underlying algorithm is contained in the magic methods of the JSON objects
-            # no errors will be thrown, if types are not compatible, just returns False
-            # node actions can't interfer with modificators
-            if action in node_actions:  # call corresponding node method
-                result = getattr(obj, action + "_action")(query_value)
-                if not result:
-                    return False
-            else:
-                raise JSONQueryException(f"Bad query: {action}")
-        return True
-
+    conditions = []
     for query_key, query_value in q.items():
-        if not isinstance(
-            query_value,
-            (
-                type,
-                float,
-                int,
-                str,
-                type(None),
-                bool,
-                dict,
-                list,
-                tuple,
-                date,
-                datetime,
-                AllChoices,
-            ),
-        ):
-            raise JSONQueryException(
-                f"Target value of query has invalid type: {type(query_value)}. Valid types are: float, int, str, None, bool, dict, list, tuple, date, datetime, allchoices"
-            )
+        _check_query_value(query_value)
         target_actions = [i for i in query_key.split("__") if i]
 
         if not target_actions:
             raise JSONQueryException("Bad query. Missing actions")
 
-        # first of all, if target key of query argument does not match child's key, we won't append it to querylist
-        if not pattern.fullmatch(node._key):
-            return False, None
+        conditions.append((_compile_actions(target_actions), query_value))
+
+    return _QueryPlan(conditions, key_pattern=pattern)
+
+
+def _frozen(value):
+    """
+    Hashable form of a query value, which tells apart values of different types
+    (1, 1.0 and True are equal and have the same hash, but they aren't the same query)
+    """
+
+    if isinstance(value, (list, tuple)):
+        return value.__class__, tuple(_frozen(item) for item in value)
+    elif isinstance(value, Q):
+        return Q, value.connector, value.negated, _frozen(value.children)
+    elif isinstance(value, dict):
+        return value.__class__, tuple((k, _frozen(v)) for k, v in value.items())
+    return value.__class__, value
+
 
-        obj = node
+class _BatchPlan:
+    """
+    Several compiled queries, to be checked against the nodes of a tree in a single traversal.
+    Queries are grouped by their target key, so each node is only checked against the queries
+    which can match its key. Conditions repeated by several queries are checked once per node.
+    """
 
-        result = make_actions(obj, target_actions, query_value)
-        if result is False:
-            return False, None
+    __slots__ = ("by_key", "anywhere")
+
+    def __init__(self, plans):
+        # target key -> [(query number, [(condition id, steps, query value)], plan)]
+        self.by_key = {}
+        self.anywhere = []  # numbers of the queries without conditions, which match any node
+        ids = {}
+        for number, plan in enumerate(plans):
+            if not plan.conditions:
+                self.anywhere.append(number)
+                continue
+            conditions = []
+            for steps, query_value in plan.conditions:
+                try:
+                    condition = ids.setdefault(
+                        (_frozen(steps), _frozen(query_value)), len(ids)
+                    )
+                except TypeError:  # unhashable query value, which can't be shared
+                    condition = ids[object()] = len(ids)
+                conditions.append((condition, steps, query_value))
+            self.by_key.setdefault(plan.target_key, []).append(
+                (number, conditions, plan)
+            )
 
-    return (True, node.parent if include_parent_ else node)
+    @property
+    def keyed(self):
+        """Whether only the nodes with a key (not list items) can satisfy any of the queries"""
+        return not self.anywhere
+
+    def match(self, node):
+        """Numbers of the queries which node satisfies"""
+
+        matched = list(self.anywhere)
+        queries = self.by_key.get(node._key)
+        if queries:
+            checked = {}
+            for number, conditions, plan in queries:
+                for condition, steps, query_value in conditions:
+                    result = checked.get(condition)
+                    if result is None:
+                        result = checked[condition] = _run_steps(
+                            node, steps, query_value
+                        )
+                    if not result:
+                        break
+                else:
+                    if plan.siblings:
+                        record = plan._record(node)
+                        if record is None or not plan._match_siblings(record):
+                            continue
+                    matched.append(number)
+        return matched
 
 
 @catch_exceptions
@@ -606,6 +990,21 @@ def parse_datetime(
     raise JSONSingletonException(f"Can't parse target datetime: {s}")
 
 
+def _is_datetime_string(s):
+    """
+    parse_datetime(s, only_check=True), memoized for plain strings:
+    the same query value is compared with every node of a traversal.
+    """
+    if s.__class__ is str:
+        return _check_datetime_string(s)
+    return parse_datetime(s, only_check=True)
+
+
+@lru_cache(maxsize=1024)
+def _check_datetime_string(s):
+    return parse_datetime(s, only_check=True)
+
+
 @catch_exceptions
 def parse_timestamp(s, kind="milliseconds", **kwargs):
     """
@@ -0,0 +1,919 @@
+"""
+Indexes over the nodes of a JSON tree.
+Queries sent from an indexed node take their candidate nodes from its indexes, instead of walking the whole tree.
+Candidates are still checked against the query, so an index only has to return a superset of its results.
+
+Indexes are updated by the compose nodes as they are modified (see JSONCompose._touch and
+JSONCompose._update_indexes). Modifications which are not tracked leave the index stale
+(its version doesn't match the subtree_version of its root), and then it is rebuilt when it is used again.
+"""
+import math
+import re
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime
+
+import jsonutils.base as base
+import jsonutils.functions.parsers as parsers
+from jsonutils.query import All
+
+try:
+    from re import _constants as sre_constants
+    from re import _parser as sre_parse
+except ImportError:  # python < 3.11
+    import sre_constants
+    import sre_parse
+
+# a missing child (a key which is added or deleted)
+_MISSING = object()
+
+
+def _iter_positions(root):
+    """
+    Iterate over (parent, key, child) tuples of all the descendants of root, in the same order
+    as they are checked by a query (each child before its own children). key is None for list items.
+    """
+
+    stack = [(root, _iter_items(root))]
+    while stack:
+        parent, items = stack[-1]
+        for key, child in items:
+            yield parent, key, child
+            if child.is_composed:
+                stack.append((child, _iter_items(child)))
+                break
+        else:
+            stack.pop()
+
+
+def _iter_items(node):
+    """(key, child) pairs of a compose node (key is None for list items)"""
+
+    if isinstance(node, base.JSONDict):
+        return iter(node.items())
+    return ((None, child) for child in node._iter_query_children(keyed=True))
+
+
+def _sort_positions(root, pairs):
+    """
+    Sort (dict parent, key) pairs of a tree in document order of the children of parent under key,
+    which is the order of a query.
+    """
+
+    positions = _Positions(root)
+    try:
+        return sorted(pairs, key=lambda pair: positions.of(*pair))
+    except _BrokenPath:
+        # there are nodes which don't know their parent: number all the children of the tree instead
+        order = {
+            (id(parent), key): idx
+            for idx, (parent, key, _) in enumerate(_iter_positions(root))
+        }
+        return sorted(pairs, key=lambda pair: order[id(pair[0]), pair[1]])
+
+
+class _BrokenPath(Exception):
+    """A node of the tree doesn't know its parent"""
+
+
+class _Positions:
+    """
+    Compute the position of nodes within a tree (a list of ordinals from the root), so that they can be
+    sorted in document order. The ordinals of the children of each parent are computed only once.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self._ordinals = {}  # id(parent) -> {key or id(child): ordinal}
+        self._paths = {}  # id(node) -> ordinals from the root
+
+    def _ordinal(self, parent, key=None, child=None):
+        if isinstance(parent, base.JSONDict):
+            ordinals = self._ordinals.get(id(parent))
+            if ordinals is None:
+                ordinals = self._ordinals[id(parent)] = {
+                    k: i for i, k in enumerate(dict.keys(parent))
+                }
+            return ordinals[key if child is None else child._key]
+
+        index = child._index
+        if index is not None and 0 <= index < len(parent):
+            if list.__getitem__(parent, index) is child:
+                return index
+        # list items are shifted when an item is inserted or removed
+        ordinals = self._ordinals.get(id(parent))
+        if ordinals is None:
+            ordinals = self._ordinals[id(parent)] = {
+                id(item): i for i, item in enumerate(list.__iter__(parent))
+            }
+        return ordinals[id(child)]
+
+    def of(self, parent, key):
+        """Position of the child under key of a dict parent"""
+
+        return self._path(parent) + (self._ordinal(parent, key=key),)
+
+    def _path(self, node):
+        # the paths of the parents are shared by their children, so they are computed only once
+        path = self._paths.get(id(node))
+        if path is None:
+            if node is self.root:
+                path = ()
+            else:
+                parent = node.parent
+                if parent is None:
+                    raise _BrokenPath
+                path = self._path(parent) + (self._ordinal(parent, child=node),)
+            self._paths[id(node)] = path
+        return path
+
+
+class _TreeIndex:
+    """
+    Base class of indexes.
+
+    Attributes:
+    -----------
+        root: the indexed node (only its descendants are indexed)
+        version: subtree_version of root when the index was built or last updated
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.rebuild()
+
+    @property
+    def is_fresh(self):
+        return self.version == self.root.subtree_version
+
+    def rebuild(self):
+        raise NotImplementedError
+
+    def update(self, parent, key, old, new):
+        """
+        The child of parent under key (or list index) has been replaced: old and new children can be _MISSING,
+        if the key has been added or deleted.
+        """
+        raise NotImplementedError
+
+    def candidates(self, plan):
+        """
+        Nodes which can satisfy a compiled query plan, in document order,
+        or None if the index can't narrow them.
+        """
+        raise NotImplementedError
+
+
+class KeyIndex(_TreeIndex):
+    """
+    Inverted index of the dict keys of a tree: each key is mapped to the dict nodes which contain it.
+    Queries with a literal key (query, get) or a key pattern (query_key, get_key) only check the children
+    of those dicts under the requested keys.
+
+    Attributes:
+    -----------
+        _entries: key -> {id(dict node): dict node}, in document order of their children under key
+        _unsorted: keys whose entries may not be in document order anymore
+    """
+
+    def rebuild(self):
+        """Index all the descendants of root"""
+
+        entries = {}
+        for parent, key, _ in _iter_positions(self.root):
+            if isinstance(parent, base.JSONDict):
+                entry = entries.get(key)
+                if entry is None:
+                    entry = entries[key] = {}
+                entry[id(parent)] = parent
+        self._entries = entries
+        self._unsorted = set()
+        self.version = self.root.subtree_version
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        entry = self._entries.get(key)
+        return bool(entry)
+
+    def keys(self):
+        return [key for key, entry in self._entries.items() if entry]
+
+    # ---- UPDATES ----
+    def update(self, parent, key, old, new):
+
+        if isinstance(parent, base.JSONDict):
+            if old is _MISSING:
+                self._add(parent, key)
+            elif new is _MISSING:
+                self._discard(parent, key)
+        if isinstance(old, base.JSONCompose):
+            for p, k, _ in _iter_positions(old):
+                if isinstance(p, base.JSONDict):
+                    self._discard(p, k)
+        if isinstance(new, base.JSONCompose):
+            for p, k, _ in _iter_positions(new):
+                if isinstance(p, base.JSONDict):
+                    self._add(p, k)
+        self.version = self.root.subtree_version
+
+    def _add(self, parent, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = self._entries[key] = {}
+        if entry:
+            self._unsorted.add(key)
+        entry[id(parent)] = parent
+
+    def _discard(self, parent, key):
+        entry = self._entries.get(key)
+        if entry is not None:
+            entry.pop(id(parent), None)
+
+    # ---- LOOKUPS ----
+    def _sorted_entry(self, key):
+        """Dict nodes which contain key, in document order of their children under key"""
+
+        entry = self._entries.get(key)
+        if not entry:
+            return ()
+        if key in self._unsorted:
+            pairs = _sort_positions(self.root, [(p, key) for p in entry.values()])
+            parents = [p for p, _ in pairs]
+            entry.clear()
+            entry.update((id(p), p) for p in parents)
+            self._unsorted.discard(key)
+        return list(entry.values())
+
+    def nodes(self, *keys):
+        """Nodes of the tree under any of keys, in document order"""
+
+        if len(keys) == 1:
+            key = keys[0]
+            return [parent[key] for parent in self._sorted_entry(key)]
+
+        pairs = [(p, key) for key in keys for p in self._entries.get(key, {}).values()]
+        pairs = _sort_positions(self.root, pairs)
+        return [parent[key] for parent, key in pairs]
+
+    def candidates(self, plan):
+
+        if plan.match_key is not None:
+            return self.nodes(*filter(plan.match_key, self.keys()))
+        if plan.conditions:
+            return self.nodes(plan.target_key)
+        return None
+
+
+# ---- VALUE INDEXES ----
+# Each kind of value index parses the children under its key into sortable values. Children which can't be
+# parsed are kept apart, and they are always candidates of a query.
+# Its query bound function returns the value to compare with (or _MISSING if the index can't be used with the
+# query value): they follow the comparison methods of the nodes (JSONStr.__gt__, JSONInt.__gt__...),
+# so the sorted values give the same results as the nodes.
+
+
+def _parse_number(child):
+    if isinstance(child, base.JSONBool):
+        return _MISSING
+    if isinstance(child, (base.JSONInt, base.JSONFloat)):
+        value = float(child)
+    elif isinstance(child, base.JSONStr):
+        try:
+            value = child.to_float()
+        except Exception:
+            return _MISSING
+    else:
+        return _MISSING
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        if not math.isnan(value):
+            return float(value)
+    return _MISSING
+
+
+def _number_bound(query_value):
+    if isinstance(query_value, (int, float)) and not isinstance(query_value, bool):
+        try:
+            value = float(query_value)
+        except OverflowError:
+            return _MISSING
+        if not math.isnan(value):
+            return value
+    return _MISSING
+
+
+def _parse_datetime(child):
+    if isinstance(child, base.JSONStr):
+        try:
+            value = child.to_datetime()
+        except Exception:
+            return _MISSING
+        if isinstance(value, datetime):
+            return value
+    return _MISSING
+
+
+def _datetime_bound(query_value):
+    if isinstance(query_value, datetime) or (
+        isinstance(query_value, str)
+        and parsers.parse_datetime(query_value, only_check=True)
+    ):
+        try:
+            return parsers.parse_datetime(query_value)
+        except Exception:
+            pass
+    return _MISSING
+
+
+def _parse_string(child):
+    if isinstance(child, base.JSONStr):
+        return str.__str__(child)
+    return _MISSING
+
+
+def _string_bound(query_value):
+    # datetime strings are compared as datetimes
+    if isinstance(query_value, str) and not parsers.parse_datetime(
+        query_value, only_check=True
+    ):
+        return query_value
+    return _MISSING
+
+
+def _string_prefix(query_value):
+    if isinstance(query_value, (str, int)) and not isinstance(query_value, bool):
+        return str(query_value)
+    return _MISSING
+
+
+_VALUE_KINDS = {
+    "number": (_parse_number, _number_bound),
+    "datetime": (_parse_datetime, _datetime_bound),
+    "string": (_parse_string, _string_bound),
+}
+
+
+class ValueIndex(_TreeIndex):
+    """
+    Sorted index of the values of the children under a key.
+    Values are parsed once according to kind ("number", "datetime" or "string"), so that range queries
+    (gt, gte, lt, lte and startswith for strings) over that key are solved with a binary search.
+
+    Attributes:
+    -----------
+        key: indexed key
+        kind: kind of values
+        _values: sorted parsed values
+        _parents: dict nodes which contain each value in _values, under key
+        _others: {id(dict node): dict node} whose children can't be parsed
+        _parsed: id(dict node) -> parsed value of its child (or _MISSING if it can't be parsed)
+    """
+
+    def __init__(self, root, key, kind="string"):
+        if kind not in _VALUE_KINDS:
+            raise ValueError(
+                f"Argument kind must be one of {tuple(_VALUE_KINDS)}, not {kind!r}"
+            )
+        self.key = key
+        self.kind = kind
+        self._parse, self._bound = _VALUE_KINDS[kind]
+        super().__init__(root)
+
+    def rebuild(self):
+        """Index all the descendants of root"""
+
+        self._others = {}
+        self._parsed = {}
+        pairs = []
+        for parent, key, child in _iter_positions(self.root):
+            if key == self.key and isinstance(parent, base.JSONDict):
+                value = self._parsed[id(parent)] = self._parse(child)
+                if value is _MISSING:
+                    self._others[id(parent)] = parent
+                else:
+                    pairs.append((value, parent))
+        pairs.sort(key=lambda pair: pair[0])
+        self._values = [value for value, _ in pairs]
+        self._parents = [parent for _, parent in pairs]
+        self.version = self.root.subtree_version
+
+    def __len__(self):
+        return len(self._parsed)
+
+    # ---- UPDATES ----
+    def update(self, parent, key, old, new):
+
+        if key == self.key and isinstance(parent, base.JSONDict):
+            if old is not _MISSING:
+                self._discard(parent)
+            if new is not _MISSING:
+                self._add(parent, new)
+        for subtree, add in ((old, False), (new, True)):
+            if isinstance(subtree, base.JSONCompose):
+                for p, k, child in _iter_positions(subtree):
+                    if k == self.key and isinstance(p, base.JSONDict):
+                        if add:
+                            self._add(p, child)
+                        else:
+                            self._discard(p)
+        self.version = self.root.subtree_version
+
+    def _add(self, parent, child):
+        value = self._parsed[id(parent)] = self._parse(child)
+        if value is _MISSING:
+            self._others[id(parent)] = parent
+            return
+        idx = bisect_right(self._values, value)
+        self._values.insert(idx, value)
+        self._parents.insert(idx, parent)
+
+    def _discard(self, parent):
+        value = self._parsed.pop(id(parent), _MISSING)
+        if value is _MISSING:
+            self._others.pop(id(parent), None)
+            return
+        lo = bisect_left(self._values, value)
+        hi = bisect_right(self._values, value)
+        for idx in range(lo, hi):
+            if self._parents[idx] is parent:
+                del self._values[idx]
+                del self._parents[idx]
+                return
+
+    # ---- LOOKUPS ----
+    def _range(self, action, query_value):
+        """
+        Slice of _values which contains all the values satisfying action (None if the index can't be used).
+        Bounds are inclusive, since parsed values may be rounded.
+        """
+
+        if action == "startswith":
+            prefix = _string_prefix(query_value) if self.kind == "string" else _MISSING
+            if prefix is _MISSING:
+                return None
+            lo = bisect_left(self._values, prefix)
+            hi = lo
+            while hi < len(self._values) and self._values[hi].startswith(prefix):
+                hi += 1
+            return lo, hi
+
+        bound = self._bound(query_value)
+        if bound is _MISSING:
+            return None
+        if action in ("gt", "gte"):
+            return bisect_left(self._values, bound), len(self._values)
+        return 0, bisect_right(self._values, bound)
+
+    def candidates(self, plan):
+
+        if plan.key_pattern is not None or plan.target_key != self.key:
+            return None
+        actions = _range_actions()
+        lo, hi = None, None
+        for steps, query_value in plan.conditions:
+            if len(steps) != 1 or steps[0][0] != parsers._ACTION:
+                continue
+            action = actions.get(steps[0][1])
+            if action is None:
+                continue
+            try:
+                bounds = self._range(action, query_value)
+            except TypeError:  # values which can't be compared (like naive and aware datetimes)
+                return None
+            if bounds is not None:
+                lo = bounds[0] if lo is None else max(lo, bounds[0])
+                hi = bounds[1] if hi is None else min(hi, bounds[1])
+        if lo is None:
+            return None
+
+        pairs = [(p, self.key) for p in self._parents[lo:hi]]
+        pairs.extend((p, self.key) for p in self._others.values())
+        return [parent[key] for parent, key in _sort_positions(self.root, pairs)]
+
+
+# ---- HASH INDEXES ----
+# Leaves are hashed by a tagged value, which depends on their type: exact matches compare them with a query value
+# converted as in their __eq__ method (JSONInt == parse_float(value), JSONBool == parse_bool(value)...).
+# Strings are also compared with numbers, bools and datetimes after parsing them, so those parsed values
+# are hashed with their own tags, the first time they are needed.
+_STRING_TAGS = {
+    "str_number": lambda child: child.to_float(),
+    "str_bool": lambda child: child.to_bool(),
+    "str_datetime": lambda child: child.to_datetime(),
+}
+
+
+def _leaf_tag(child):
+    """Tagged value of a leaf, _MISSING if it can't match an exact query, or None if it must always be checked"""
+
+    if isinstance(child, base.JSONStr):
+        return "str", str.__str__(child)
+    if isinstance(child, base.JSONBool):
+        return "bool", child._data
+    if isinstance(child, (base.JSONInt, base.JSONFloat)):
+        try:
+            return "number", float(child)
+        except OverflowError:
+            return None
+    if isinstance(child, base.JSONNull):
+        return "null", None
+    if isinstance(child, base.JSONCompose):
+        return _MISSING  # only leaves are hashed (exact queries of dicts and lists don't use the index)
+    return None
+
+
+def _query_tags(query_value, in_list=False):
+    """
+    Tagged values which a leaf must have to match query_value exactly (None if it can't be hashed).
+    If in_list is True, query_value is an item of the list of an in query.
+    """
+
+    if isinstance(query_value, (dict, list, tuple, type)) or query_value is All:
+        return None
+
+    tags = []
+    if query_value is None:
+        return [("null", None)]
+    # JSONInt and JSONFloat
+    try:
+        number = parsers.parse_float(query_value)
+    except Exception:
+        pass
+    else:
+        if isinstance(number, (int, float)) and not isinstance(number, bool):
+            tags.append(("number", float(number)))
+    # JSONBool
+    try:
+        tags.append(("bool", parsers.parse_bool(query_value)))
+    except Exception:
+        pass
+    # in a list, items are compared first (item == node), so bools are compared with numbers as ints
+    if in_list and isinstance(query_value, bool):
+        tags.append(("number", float(query_value)))
+    # JSONStr
+    if isinstance(query_value, bool):
+        tags.append(("str_bool", query_value))
+    elif isinstance(query_value, (int, float)):
+        tags.append(("str_number", query_value))
+    elif isinstance(query_value, (date, datetime)) or (
+        isinstance(query_value, str)
+        and parsers.parse_datetime(query_value, only_check=True)
+    ):
+        try:
+            tags.append(("str_datetime", parsers.parse_datetime(query_value)))
+        except Exception:
+            pass
+    elif isinstance(query_value, str):
+        tags.append(("str", query_value))
+    return tags
+
+
+class HashIndex(_TreeIndex):
+    """
+    Hash index of the leaves under a key, so that exact (and in) queries over that key are solved
+    with dict lookups.
+
+    Attributes:
+    -----------
+        key: indexed key
+        kind: "hash"
+        _buckets: (tag, value) -> {id(dict node): dict node} whose child under key has that tagged value
+        _tags: id(dict node) -> tagged values of its child
+        _strings: {id(dict node): dict node} whose child is a string
+        _string_tags: tags of parsed strings which are hashed (see _STRING_TAGS)
+        _others: {id(dict node): dict node} whose child must always be checked
+    """
+
+    kind = "hash"
+
+    def __init__(self, root, key):
+        self.key = key
+        super().__init__(root)
+
+    def rebuild(self):
+        """Index all the descendants of root"""
+
+        self._buckets = {}
+        self._tags = {}
+        self._strings = {}
+        self._string_tags = set()
+        self._others = {}
+        for parent, key, child in _iter_positions(self.root):
+            if key == self.key and isinstance(parent, base.JSONDict):
+                self._add(parent, child)
+        self.version = self.root.subtree_version
+
+    def __len__(self):
+        return len(self._tags) + len(self._others)
+
+    # ---- UPDATES ----
+    def update(self, parent, key, old, new):
+
+        if key == self.key and isinstance(parent, base.JSONDict):
+            if old is not _MISSING:
+                self._discard(parent)
+            if new is not _MISSING:
+                self._add(parent, new)
+        for subtree, add in ((old, False), (new, True)):
+            if isinstance(subtree, base.JSONCompose):
+                for p, k, child in _iter_positions(subtree):
+                    if k == self.key and isinstance(p, base.JSONDict):
+                        if add:
+                            self._add(p, child)
+                        else:
+                            self._discard(p)
+        self.version = self.root.subtree_version
+
+    def _add(self, parent, child):
+        tag = _leaf_tag(child)
+        if tag is _MISSING:
+            return
+        if tag is None:
+            self._others[id(parent)] = parent
+            return
+        tags = self._tags[id(parent)] = [tag]
+        if tag[0] == "str":
+            self._strings[id(parent)] = parent
+            for name in self._string_tags:
+                tags.append(self._string_tag(name, child))
+        for tag in tags:
+            self._buckets.setdefault(tag, {})[id(parent)] = parent
+
+    def _discard(self, parent):
+        self._others.pop(id(parent), None)
+        self._strings.pop(id(parent), None)
+        for tag in self._tags.pop(id(parent), ()):
+            bucket = self._buckets.get(tag)
+            if bucket is not None:
+                bucket.pop(id(parent), None)
+
+    @staticmethod
+    def _string_tag(name, child):
+        try:
+            tag = name, _STRING_TAGS[name](child)
+            hash(tag)
+        except Exception:  # the string can't be parsed (or the parsed value can't be hashed)
+            return name, _MISSING
+        return tag
+
+    def _hash_strings(self, name):
+        """Hash the parsed values of all the strings, the first time they are needed"""
+
+        if name in self._string_tags:
+            return
+        self._string_tags.add(name)
+        for parent in self._strings.values():
+            tag = self._string_tag(name, parent[self.key])
+            self._tags[id(parent)].append(tag)
+            self._buckets.setdefault(tag, {})[id(parent)] = parent
+
+    # ---- LOOKUPS ----
+    def _lookup(self, query_value, in_list=False):
+        """{id(dict node): dict node} whose child can be equal to query_value (None if the index can't be used)"""
+
+        tags = _query_tags(query_value, in_list=in_list)
+        if tags is None:
+            return None
+        parents = dict(self._others)
+        for tag in tags:
+            if tag[0] in _STRING_TAGS:
+                self._hash_strings(tag[0])
+            try:
+                parents.update(self._buckets.get(tag, {}))
+            except TypeError:
+                return None
+        return parents
+
+    def candidates(self, plan):
+
+        if plan.key_pattern is not None or plan.target_key != self.key:
+            return None
+        actions = parsers._node_actions()
+        found = None
+        for steps, query_value in plan.conditions:
+            if len(steps) != 1 or steps[0][0] != parsers._ACTION:
+                continue
+            if steps[0][1] is actions["exact"]:
+                parents = self._lookup(query_value)
+            elif steps[0][1] is actions["in"] and isinstance(query_value, (list, tuple)):
+                # a leaf is in a list if it is equal to any of its items
+                parents = {}
+                for item in query_value:
+                    item_parents = self._lookup(item, in_list=True)
+                    if item_parents is None:
+                        parents = None
+                        break
+                    parents.update(item_parents)
+            else:
+                continue
+            if parents is not None:
+                if found is None:
+                    found = parents
+                else:
+                    found = {i: p for i, p in found.items() if i in parents}
+        if found is None:
+            return None
+
+        pairs = [(parent, self.key) for parent in found.values()]
+        return [parent[key] for parent, key in _sort_positions(self.root, pairs)]
+
+
+# ---- TEXT INDEXES ----
+# Strings are indexed by the trigrams of their lowercase version, so a string can contain a needle only if
+# it has all the trigrams of the (lowercase) needle. Case sensitive needles are only split into their ASCII
+# segments, since some non ASCII characters change when they are lowercased depending on their context.
+# Case insensitive regex needles are also split on "i" and "s", which match non ASCII characters (like "ı" or "ſ")
+# that are not lowercased to them.
+_ASCII_SEGMENTS = re.compile(r"[\x00-\x7f]+")
+_IGNORECASE_SEGMENTS = re.compile(r"[\x00-\x68\x6a-\x72\x74-\x7f]+")
+
+
+def _trigrams(text):
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+def _case_sensitive_needles(needle):
+    return [segment.lower() for segment in _ASCII_SEGMENTS.findall(needle)]
+
+
+def _regex_needles(pattern):
+    """
+    Literal strings which any match of a regex pattern must contain (the runs of literal characters
+    of its top level), or None if they can't be computed.
+    """
+
+    if isinstance(pattern, re.Pattern):
+        pattern, flags = pattern.pattern, pattern.flags
+    else:
+        flags = 0
+    if not isinstance(pattern, str):
+        return None
+    try:
+        parsed = sre_parse.parse(pattern, flags)
+    except Exception:
+        return None
+    flags = parsed.state.flags
+
+    needles = []
+    run = []
+    for op, argument in parsed:
+        if op is sre_constants.LITERAL:
+            run.append(chr(argument))
+        else:
+            needles.append("".join(run))
+            run = []
+    needles.append("".join(run))
+    if not flags & re.IGNORECASE:
+        return [segment for needle in needles for segment in _case_sensitive_needles(needle)]
+    if flags & re.ASCII:
+        return [needle.lower() for needle in needles]
+    return [
+        segment for needle in needles for segment in _IGNORECASE_SEGMENTS.findall(needle.lower())
+    ]
+
+
+def _text_needles(action, query_value):
+    """Lowercase strings which a string must contain to satisfy action (None if they can't be computed)"""
+
+    if action in ("regex", "fullregex"):
+        return _regex_needles(query_value)
+    if isinstance(query_value, (list, tuple)):
+        values = query_value
+    elif isinstance(query_value, (str, int, float)) and not isinstance(query_value, bool):
+        values = (query_value,)
+    else:
+        return None
+    needles = []
+    for value in values:
+        if not isinstance(value, (str, int, float)):
+            return None
+        if action == "icontains":
+            needles.append(str(value).lower())
+        else:
+            needles.extend(_case_sensitive_needles(str(value)))
+    return needles
+
+
+class TextIndex(_TreeIndex):
+    """
+    Trigram index of the strings under a key, so that contains, icontains and regex queries over that key
+    only check the strings which have all the trigrams of the requested text.
+
+    Attributes:
+    -----------
+        key: indexed key
+        kind: "text"
+        _postings: trigram -> {id(dict node): dict node} whose (lowercase) string under key has it
+        _grams: id(dict node) -> trigrams of its string
+        _others: {id(dict node): dict node} whose child is not a string, so it must always be checked
+    """
+
+    kind = "text"
+
+    def __init__(self, root, key):
+        self.key = key
+        super().__init__(root)
+
+    def rebuild(self):
+        """Index all the descendants of root"""
+
+        self._postings = {}
+        self._grams = {}
+        self._others = {}
+        for parent, key, child in _iter_positions(self.root):
+            if key == self.key and isinstance(parent, base.JSONDict):
+                self._add(parent, child)
+        self.version = self.root.subtree_version
+
+    def __len__(self):
+        return len(self._grams) + len(self._others)
+
+    # ---- UPDATES ----
+    def update(self, parent, key, old, new):
+
+        if key == self.key and isinstance(parent, base.JSONDict):
+            if old is not _MISSING:
+                self._discard(parent)
+            if new is not _MISSING:
+                self._add(parent, new)
+        for subtree, add in ((old, False), (new, True)):
+            if isinstance(subtree, base.JSONCompose):
+                for p, k, child in _iter_positions(subtree):
+                    if k == self.key and isinstance(p, base.JSONDict):
+                        if add:
+                            self._add(p, child)
+                        else:
+                            self._discard(p)
+        self.version = self.root.subtree_version
+
+    def _add(self, parent, child):
+        if not isinstance(child, base.JSONStr):
+            self._others[id(parent)] = parent
+            return
+        grams = self._grams[id(parent)] = _trigrams(child.lower())
+        postings = self._postings
+        for gram in grams:
+            posting = postings.get(gram)
+            if posting is None:
+                posting = postings[gram] = {}
+            posting[id(parent)] = parent
+
+    def _discard(self, parent):
+        self._others.pop(id(parent), None)
+        for gram in self._grams.pop(id(parent), ()):
+            posting = self._postings[gram]
+            del posting[id(parent)]
+            if not posting:
+                del self._postings[gram]
+
+    # ---- LOOKUPS ----
+    def candidates(self, plan):
+
+        if plan.key_pattern is not None or plan.target_key != self.key:
+            return None
+        actions = _text_actions()
+        grams = set()
+        for steps, query_value in plan.conditions:
+            if len(steps) != 1 or steps[0][0] != parsers._ACTION:
+                continue
+            action = actions.get(steps[0][1])
+            if action is None:
+                continue
+            needles = _text_needles(action, query_value)
+            if needles is not None:
+                for needle in needles:
+                    grams |= _trigrams(needle)
+        if not grams:
+            return None
+
+        postings = sorted(
+            (self._postings.get(gram, {}) for gram in grams), key=len
+        )
+        found = postings[0]
+        for posting in postings[1:]:
+            if not found:
+                break
+            found = {i: p for i, p in found.items() if i in posting}
+        pairs = [(p, self.key) for p in found.values()]
+        pairs.extend((p, self.key) for p in self._others.values())
+        return [parent[key] for parent, key in _sort_positions(self.root, pairs)]
+
+
+def _text_actions():
+    node_actions = parsers._node_actions()
+    return {
+        node_actions[action]: action
+        for action in ("contains", "icontains", "regex", "fullregex")
+    }
+
+
+# action function -> action name, for the actions which can be solved by a value index
+_RANGE_ACTIONS = {}
+
+
+def _range_actions():
+    if not _RANGE_ACTIONS:
+        node_actions = parsers._node_actions()
+        for action in ("gt", "gte", "lt", "lte", "startswith"):
+            _RANGE_ACTIONS[node_actions[action]] = action
+    return _RANGE_ACTIONS
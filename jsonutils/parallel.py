@@ -0,0 +1,83 @@
+"""
+Parallel queries over the children of a large compose node.
+The children of the node are split into contiguous shards, which are checked in a pool of processes.
+Each worker returns the key paths of its matches (relative to the node), and they are resolved back
+into the nodes of the original tree, so results keep the document order and their parent links.
+
+Workers are forked when the platform supports it, so they inherit the tree instead of receiving a copy.
+Otherwise, they rebuild it from its native data (then, parent lookups can't reach above the node).
+"""
+import gc
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import jsonutils.base as base
+
+# shards per worker, so that a slow shard doesn't keep the other workers idle
+_SHARDS_PER_WORKER = 4
+
+# the node which receives the query, within each worker process
+_worker_root = None
+
+
+def _init_worker(root):
+    global _worker_root
+    if isinstance(root, base.JSONNode):
+        # forked workers share the memory of the tree until they write to it, and their first full
+        # collection would write to every object: inherited objects are left out of the collections
+        gc.freeze()
+    else:
+        root = base.JSONObject(root)
+    _worker_root = root
+
+
+def _query_shard(plan, start, stop, recursive, include_parent):
+    """
+    Key paths of the nodes which satisfy a compiled query plan, among the children of the worker root
+    from start to stop (and their descendants, if recursive), in the same order as a query.
+    """
+
+    match = plan.match
+    keyed = plan.keyed
+    paths = []
+    stack = [((), islice(_worker_root._iter_query_items(keyed), start, stop))]
+    while stack:
+        path, items = stack[-1]
+        for key, child in items:
+            if match(child):
+                paths.append(path if include_parent else path + (key,))
+            if recursive and child.is_composed:
+                stack.append((path + (key,), child._iter_query_items(keyed)))
+                break
+        else:
+            stack.pop()
+    return paths
+
+
+def _resolve(root, path):
+    node = root
+    for key in path:
+        node = node[key]
+    return node
+
+
+def query_matches(root, plan, recursive, include_parent, workers):
+    """List of the nodes under root which satisfy a compiled query plan, checked by workers processes"""
+
+    if "fork" in multiprocessing.get_all_start_methods():
+        context, shared = multiprocessing.get_context("fork"), root
+    else:
+        context, shared = multiprocessing.get_context(), root._data
+
+    step = max(1, -(-len(root) // (workers * _SHARDS_PER_WORKER)))
+    with ProcessPoolExecutor(
+        workers, mp_context=context, initializer=_init_worker, initargs=(shared,)
+    ) as executor:
+        shards = [
+            executor.submit(
+                _query_shard, plan, start, start + step, recursive, include_parent
+            )
+            for start in range(0, len(root), step)
+        ]
+        return [_resolve(root, path) for shard in shards for path in shard.result()]
@@ -1,6 +1,7 @@
 import re
 import warnings
 from datetime import date, datetime
+from itertools import islice
 from typing import Union
 
 import jsonutils.base as base
@@ -126,7 +127,10 @@ class SingleQuery:
 
 class Q:
     """
-    A Query object. We can join different queries by means of bitand and bitor operators (& |)
+    A Query object. We can join different queries by means of bitand and bitor operators (& |),
+    and negate them with the invert operator (~).
+    Q objects are checked against the dicts of a tree (records): each query argument against the child
+    under its target key. Then, a query with Q objects returns the dicts which satisfy them.
     Examples
     --------
     >> obj = JSONObject(
@@ -148,42 +152,59 @@ class Q:
 
     >> obj.query(Q(timestamp__gt="2021-05-01 10:00:00") | Q(value__0__gte=0.5))
         [{"timestamp": "2021-05-01 09:00:00","value": [0.5, 0.87]},{"timestamp": 2021-06-01 08:25:30, "value": [0.9, 0.15]}]
-    """
 
-    # TODO make Q object
-    def __init__(self, **kwargs):
+    >> obj.query(~Q(value__1__lt=1), timestamp__lt="2021-06-01")
+        [{"timestamp": "2021-04-02 10:30:00", "value": [-0.23, 1]}]
 
-        self.AND = []
-        self.OR = []
-        self.NOT = []
+    Attributes:
+    -----------
+        connector: how its children are joined (Q.AND or Q.OR)
+        negated: if True, the result of its children is negated
+        children: list of Q objects and (query key, query value) pairs
+    """
 
-        if len(kwargs) > 0:
-            self._parse_args(kwargs)
+    AND = "AND"
+    OR = "OR"
 
-    def _parse_args(self, kwargs):
-        for k, v in kwargs.items():
+    def __init__(self, *args, **kwargs):
 
-            splitted = *k.split("__"), v
-            self.AND.append(splitted)
+        for arg in args:
+            if not isinstance(arg, Q):
+                raise TypeError(
+                    f"Positional arguments must be Q objects, not {type(arg)}"
+                )
+        self.connector = Q.AND
+        self.negated = False
+        self.children = [*args, *kwargs.items()]
 
-    def __and__(self, other):
+    def _combine(self, other, connector):
 
         if not isinstance(other, Q):
             raise TypeError(f"Cannot add instances of {type(self)} and {type(other)}")
 
-        obj = Q()
-        obj.AND = self.AND + other.AND
+        obj = Q(self, other)
+        obj.connector = connector
         return obj
 
+    def __and__(self, other):
+        return self._combine(other, Q.AND)
+
     def __or__(self, other):
+        return self._combine(other, Q.OR)
 
-        if not isinstance(other, Q):
-            raise TypeError(f"Cannot add instances of {type(self)} and {type(other)}")
+    def __invert__(self):
 
-        obj = Q()
-        obj.OR = self.OR + other.OR
+        obj = Q(self)
+        obj.negated = True
         return obj
 
+    def __repr__(self):
+        children = f" {self.connector} ".join(
+            repr(child) if isinstance(child, Q) else f"{child[0]}={child[1]!r}"
+            for child in self.children
+        )
+        return f"{'NOT ' if self.negated else ''}({children})"
+
 
 class ParentList(list):
     pass
@@ -235,6 +256,11 @@ class ValuesList(list):
         return unique_values
 
 
+def _is_number(obj):
+    """Check if obj is an int or float (python number or JSONInt/JSONFloat node). Booleans are not taken as numbers"""
+    return isinstance(obj, (int, float)) and not isinstance(obj, bool)
+
+
 class QuerySet(list):
     """
     This is a queryset object.
@@ -392,28 +418,63 @@ class QuerySet(list):
                     unique_values.append(item)
             return unique_values
 
-    def filter(self, **q):
+    def filter(self, *args, **q):
 
         cls = self.__class__
 
         output = cls()
         output._root = self._root
         output._native_types = self._native_types
+        # Q objects are checked against the dicts of a tree, so the nodes which are queried are checked too
+        records = parsers._compile_query(*args, **q) if args else None
 
         if (
             self._list_of_root_nodes
         ):  # If we are dealing with a list of root nodes, we must call the query function of each of them
             for item in self:
                 item = base.JSONObject(item)
-                if item.query(**q).exists():
+                if (records and records.match(item)) or item.query(
+                    *args, **q
+                ).exists():
                     output.append(item)
             return output
         else:
+            matches = self._indexed_matches(q, parsers._compile_query, *args)
             for item in self:
-                if item.parent.query(**q).exists():
+                if matches is not None:
+                    if id(item.parent) in matches:
+                        output.append(item)
+                elif (records and records.match(item.parent)) or item.parent.query(
+                    *args, **q
+                ).exists():
                     output.append(item)
             return output
 
+    def _indexed_matches(self, q, compile_query, *args):
+        """
+        If the root node has indexes which can solve a query, ids of the nodes which have
+        a descendant satisfying it (as their own query would find). Otherwise, None.
+        """
+
+        root = self._root
+        if getattr(root, "_indexes", None) is None or any(k.endswith("_") for k in q):
+            return None  # dynamic config arguments are checked by the queries of each node
+        plan = compile_query(*args, **q)
+        nodes = root._query_candidates(plan)
+        if nodes is None:
+            return None
+
+        ancestors = set()
+        for node in nodes:
+            if plan.match(node):
+                parent = node.parent
+                while parent is not None and id(parent) not in ancestors:
+                    ancestors.add(id(parent))
+                    if not config.RECURSIVE_QUERIES:
+                        break
+                    parent = parent.parent
+        return ancestors
+
     def filter_key(self, pattern, **q):
         # TODO add test
 
@@ -431,8 +492,12 @@ class QuerySet(list):
                     output.append(item)
             return output
         else:
+            matches = self._indexed_matches(q, parsers._compile_query_key, pattern)
             for item in self:
-                if item.parent.query_key(pattern, **q).exists():
+                if matches is not None:
+                    if id(item.parent) in matches:
+                        output.append(item)
+                elif item.parent.query_key(pattern, **q).exists():
                     output.append(item)
             return output
 
@@ -531,7 +596,10 @@ class QuerySet(list):
 
         result = 0
         for item in self:
-            number = parsers.parse_float(item, fail_silently=True) or 0
+            if _is_number(item):  # numbers don't need to be parsed
+                number = float(item)
+            else:
+                number = parsers.parse_float(item, fail_silently=True) or 0
             result += number
         return result
 
@@ -547,6 +615,10 @@ class QuerySet(list):
         cumulative_sum = 0
         length = 0
         for item in self:
+            if _is_number(item):  # numbers don't need to be parsed
+                cumulative_sum += float(item)
+                length += 1
+                continue
             try:
                 number = parsers.parse_float(item)
             except Exception:
@@ -566,7 +638,7 @@ class QuerySet(list):
 
         output = []
         for item in distinct_values:
-            output.append((item._data, super().count(item)))
+            output.append((item._native_result, super().count(item)))
         return output
 
     def __repr__(self):
@@ -590,6 +662,77 @@ class KeyQuerySet(QuerySet):
         return result
 
 
+class LazyQuerySet:
+    """
+    A queryset whose nodes are found as they are requested (by iteration, first, exists...),
+    so the tree is only traversed as far as needed. Found nodes are kept in an inner queryset,
+    so it can be iterated more than once.
+    Any other QuerySet method (filter, values, order_by...) evaluates the whole query first.
+
+    Attributes:
+    ----------
+        _matches: iterator over the nodes which satisfy the query, not found yet
+        _result: QuerySet (or KeyQuerySet) with the nodes found so far
+    """
+
+    def __init__(self, matches, result):
+        self._matches = matches
+        self._result = result
+
+    def _fetch(self, count=None):
+        """Find nodes until there are count of them (all of them if count is None)"""
+
+        result = self._result
+        if self._matches is not None:
+            if count is None:
+                result.extend(self._matches)
+            else:
+                result.extend(islice(self._matches, max(count - len(result), 0)))
+            if count is None or len(result) < count:
+                self._matches = None  # the traversal is over
+        return result
+
+    def evaluate(self):
+        """Find all the nodes and return them as a QuerySet"""
+        return self._fetch()
+
+    def __iter__(self):
+        idx = 0
+        while True:
+            result = self._fetch(idx + 1)
+            if idx >= len(result):
+                return
+            yield result[idx]
+            idx += 1
+
+    def first(self):
+        return self._fetch(1).first()
+
+    def exists(self):
+        return len(self._fetch(1)) > 0
+
+    def count(self):
+        return len(self._fetch())
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, index):
+        if isinstance(index, int) and index >= 0:
+            return self._fetch(index + 1)[index]
+        return self._fetch()[index]
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self._fetch(), name)
+
+    def __repr__(self):
+        if self._matches is None:
+            return repr(self._result)
+        return f"<{self.__class__.__name__} (not evaluated)>"
+
+
 class AllChoices(type):
     pass
 
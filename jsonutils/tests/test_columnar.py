@@ -0,0 +1,107 @@
+import unittest
+from datetime import datetime
+
+import jsonutils as js
+import pytz
+from jsonutils.base import JSONObject
+from jsonutils.functions.arrays import _numpy
+
+
+@unittest.skipIf(_numpy() is None, "numpy is not installed")
+class ColumnarQueryTest(unittest.TestCase):
+    def setUp(self):
+        js.config.NATIVE_TYPES = False
+        js.config.QUERY_EXCEPTIONS = True
+        self._min_records = js.config.COLUMNAR_MIN_RECORDS
+        js.config.COLUMNAR_MIN_RECORDS = 4
+
+        self.data = {
+            "events": [
+                {"name": "start", "timestamp": "2021-05-01 08:00:00", "price": 10},
+                {"name": "stop", "timestamp": "2021-05-03 10:00:00", "price": "$ 2.5"},
+                {"name": "restart", "timestamp": "2021-05-02 09:30:00", "price": 7.5},
+                {"name": "sync", "timestamp": "not a date", "price": True},
+                {"name": 5, "timestamp": None, "price": "7.5"},
+                {"name": "stage", "timestamp": "2021-05-04 00:00:00", "price": 10**400},
+            ],
+            "nested": {"events": [{"name": "start", "price": 1}] * 4},
+        }
+        self.queries = [
+            {"price__gt": 5},
+            {"price": 7.5},
+            {"price__gte": 2.5, "price__lt": 10},
+            {"price__lte": 7.5, "include_parent_": True},
+            {"timestamp__gte": "2021-05-02"},
+            {"timestamp__lt": datetime(2021, 5, 3, tzinfo=pytz.utc)},
+            {"name": "start"},
+            {"name__gt": "restart"},
+            {"name": 5},
+            {"name": js.All, "price__gt": 1},
+            {"name__gte": "s", "timestamp__lte": "2021-05-03", "price__gt": 0},
+            {"name": "start", "missing": 1},
+        ]
+
+    def tearDown(self):
+        js.config.COLUMNAR_MIN_RECORDS = self._min_records
+
+    def assertColumnar(self, obj):
+        def results():
+            return [
+                [(node.jsonpath, node._data) for node in obj.query(**q)]
+                for q in self.queries
+            ]
+
+        columnar = results()
+        js.config.COLUMNAR_MIN_RECORDS = None
+        try:
+            self.assertEqual(columnar, results())
+        finally:
+            js.config.COLUMNAR_MIN_RECORDS = 4
+
+    def test_columnar_query(self):
+        test = JSONObject(self.data)
+
+        self.assertEqual(test.query(price__gt=5), [10, 7.5, "7.5"])
+        table = test.events._columns
+        self.assertEqual(len(table.records), 6)
+        self.assertIn(("price", "number"), table.columns)
+        # children which can't be parsed are checked node by node
+        self.assertEqual(
+            table.columns["price", "number"][1].tolist(),
+            [False, False, False, True, False, True],
+        )
+        self.assertColumnar(test)
+        self.assertColumnar(test.events)
+        self.assertColumnar(JSONObject(self.data, lazy=True))
+
+        # lists of dicts with different keys (or with compose children) are traversed
+        test.events._0.extra = {"price": 100}
+        self.assertEqual(test.query(price__gt=50), [100])
+        self.assertIsNone(test.events._columns.records)
+        self.assertColumnar(test)
+
+    def test_updates(self):
+        test = JSONObject(self.data)
+        test.query(price__gt=5, name__gte="s")
+        table = test.events._columns
+
+        test.events._0.price = 1
+        self.assertEqual(test.query(price__gt=5).first(), 7.5)
+        self.assertIsNot(test.events._columns, table)
+
+        test.events._1.name = "step"
+        test.events.append({"name": "sale", "timestamp": "2021-05-05", "price": 6})
+        test.events.reverse()
+        test.events.pop(2)
+        self.assertColumnar(test)
+        self.assertEqual(test.events._columns.records, tuple(test.events))
+
+        # numeric strings are parsed again if the separators of the config change
+        test.events[0] = {"name": "sale", "timestamp": None, "price": "1.006,5"}
+        self.assertEqual(test.query(price__gt=1000), [])
+        js.config.DECIMAL_SEPARATOR, js.config.THOUSANDS_SEPARATOR = ",", "."
+        try:
+            self.assertEqual(test.query(price__gt=1000), ["1.006,5"])
+            self.assertColumnar(test)
+        finally:
+            js.config.DECIMAL_SEPARATOR, js.config.THOUSANDS_SEPARATOR = ".", ","
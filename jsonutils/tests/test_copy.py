@@ -0,0 +1,115 @@
+import unittest
+
+import jsonutils as js
+from jsonutils.base import JSONDict, JSONList, JSONNumericList, JSONObject
+
+
+class CopyTest(unittest.TestCase):
+    def setUp(self):
+        js.config.NATIVE_TYPES = False
+        js.config.QUERY_EXCEPTIONS = True
+        self.min_length = js.config.NUMERIC_ARRAY_MIN_LENGTH
+        js.config.NUMERIC_ARRAY_MIN_LENGTH = 4
+
+        self.data = {
+            "order": {
+                "customer": {"name": "John", "country": "ES"},
+                "lines": [{"sku": "A1", "qty": 1}, {"sku": "B2", "qty": 3}],
+            },
+            "prices": [1.5, 2.0, 3.25, 4.0],
+        }
+
+    def tearDown(self):
+        js.config.NUMERIC_ARRAY_MIN_LENGTH = self.min_length
+
+    def test_copy_shares_children(self):
+        test = JSONObject(self.data)
+        copy = test.copy()
+
+        self.assertIsInstance(copy, JSONDict)
+        self.assertIsNone(copy.parent)
+        self.assertEqual(copy.json_decode, self.data)
+        # children are shared until they are accessed from the copy
+        self.assertIs(dict.__getitem__(copy, "order"), test.order)
+
+        order = copy.order
+        self.assertIsNot(order, test.order)
+        self.assertIs(order.parent, copy)
+        self.assertIs(dict.__getitem__(order, "lines"), test.order.lines)
+        self.assertEqual(
+            copy.order.lines._1.qty.jsonpath, ("order", "lines", 1, "qty")
+        )
+
+    def test_modify_copy(self):
+        test = JSONObject(self.data)
+        copy = test.copy()
+
+        copy.order.customer.name = "Ann"
+        copy.order.lines.append({"sku": "C3", "qty": 2})
+        copy.prices[0] = 9.5
+
+        self.assertEqual(test.json_decode, self.data)
+        self.assertEqual(copy.order.customer.name, "Ann")
+        self.assertEqual(len(copy.order.lines), 3)
+        self.assertEqual(copy.prices._0, 9.5)
+        self.assertIsInstance(copy.prices, JSONNumericList)
+        self.assertEqual(list(copy.prices._array), [9.5, 2.0, 3.25, 4.0])
+        # untouched paths are still shared
+        self.assertIs(list.__getitem__(copy.order.lines, 0), test.order.lines._0)
+
+    def test_modify_original(self):
+        test = JSONObject(self.data)
+        customer = test.order.customer
+        copy = test.copy()
+        copy_of_copy = copy.copy()
+
+        customer.name = "Ann"
+        test.order.lines._1.qty = 10
+        test.prices.append(5.0)
+        del test.order["customer"]
+
+        for obj in (copy, copy_of_copy):
+            self.assertEqual(obj.json_decode, self.data)
+            self.assertEqual(obj.order.customer.name, "John")
+            self.assertEqual(obj.order.lines.query(qty__gt=2).first(), 3)
+        self.assertEqual(test.order.lines._1.qty, 10)
+        self.assertEqual(len(test.prices), 5)
+
+    def test_modify_original_after_copy(self):
+        a = JSONObject({"r": {"x": {"y": {"z": 1}}}})
+        b = a.copy()
+        b["r"]["x"] = 5  # the path of the original is replaced by a leaf in the copy
+        a["r"]["x"]["y"]["z"] = 2
+
+        self.assertEqual(a.json_decode, {"r": {"x": {"y": {"z": 2}}}})
+        self.assertEqual(b.json_decode, {"r": {"x": 5}})
+
+    def test_copy_list(self):
+        test = JSONObject(self.data["order"]["lines"])
+        copy = test.copy()
+
+        self.assertIsInstance(copy, JSONList)
+        copy._0.qty = 7
+        test._1.sku = "Z9"
+
+        self.assertEqual(
+            test.json_decode, [{"sku": "A1", "qty": 1}, {"sku": "Z9", "qty": 3}]
+        )
+        self.assertEqual(
+            copy.json_decode, [{"sku": "A1", "qty": 7}, {"sku": "B2", "qty": 3}]
+        )
+        self.assertEqual(copy._1.sku.jsonpath, (1, "sku"))
+
+    def test_copy_tree_modes(self):
+        for kwargs in ({"lazy": True}, {"share_leaves": True}):
+            test = JSONObject(self.data, **kwargs)
+            copy = test.copy()
+
+            copy.order.customer.country = "FR"
+            test.order.lines._0.sku = "A0"
+
+            self.assertEqual(test.order.customer.country, "ES")
+            self.assertEqual(copy.order.lines._0.sku, "A1")
+            self.assertEqual(
+                copy.order.customer.country.jsonpath, ("order", "customer", "country")
+            )
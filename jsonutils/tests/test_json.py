@@ -1,8 +1,11 @@
+import gc
 import json
 import re
+import sys
 import unittest
 from datetime import datetime
 from pathlib import Path
+from types import SimpleNamespace
 
 import jsonutils as js
 import pytz
@@ -21,10 +24,21 @@ from jsonutils.base import (
     JSONStr,
     JSONUnknown,
 )
+from jsonutils.cache import LRUCache, memoized_method
 from jsonutils.encoders import JSONObjectEncoder
 from jsonutils.exceptions import JSONQueryException, JSONQueryMultipleValues
+from jsonutils.functions.parsers import _compile_query, _compile_query_key
 from jsonutils.functions.seekers import empty
-from jsonutils.query import All, ExtractYear, QuerySet, SingleQuery, ValuesList
+from jsonutils.query import (
+    All,
+    ExtractYear,
+    LazyQuerySet,
+    ParentList,
+    Q,
+    QuerySet,
+    SingleQuery,
+    ValuesList,
+)
 
 BASE_PATH = Path(js.__file__).parent.resolve()
 
@@ -217,6 +231,29 @@ class JsonTest(unittest.TestCase):
         self.assertIsInstance(test1[1][1], JSONDict)
         self.assertIsInstance(test1[1][1]["B"], JSONNull)
 
+    def test_list_insert_items(self):
+
+        test = JSONObject({"a": [{"v": 1}]})
+        test.a.insert(0, {"v": 99})
+        test.a.extend([5, {"v": 2}])
+        test.a += [{"v": 3}]
+
+        self.assertEqual(test.query(v__gte=0), [99, 1, 2, 3])
+        self.assertEqual(
+            [node.jsonpath for node in test.query_key("v")],
+            ["a/0/v", "a/1/v", "a/3/v", "a/4/v"],
+        )
+        self.assertIsInstance(test.a[2], JSONInt)
+        self.assertEqual(test.a[2].jsonpath, "a/2")
+
+        test.build_key_index()
+        test.a.insert(-1, {"v": 4})
+        self.assertEqual(test.query(v__gte=0), [99, 1, 2, 4, 3])
+        self.assertEqual(test.a._5.v.jsonpath, "a/5/v")
+        test.a += [{"v": 5}]
+        test.build_key_index()
+        self.assertEqual(test.query_key("v"), [99, 1, 2, 4, 3, 5])
+
     def test_dict_set_items(self):
 
         test3 = self.test3.copy()
@@ -587,6 +624,35 @@ class JsonTest(unittest.TestCase):
             [{"data": {"data": 1, "date": "2021-08-02"}, "date": None}],
         )
 
+        # the other keys are checked against the siblings of the nodes, in any order
+        self.assertEqual(
+            test.query(date__contains="2021-08", data=1, date__startswith="2021"),
+            ["2021-08-02"],
+        )
+        self.assertEqual(
+            test.query(data=1, date__year=2021, data__gte=1, include_parent_=True),
+            test.query(date__year=2021, data=1, include_parent_=True),
+        )
+        self.assertEqual(
+            test.query(data=1, date__parent__parent__parent__c_date__year=2021), [1]
+        )
+        self.assertEqual(
+            test.query_many(
+                {
+                    "dated": {"data": 1, "date__gte": datetime(2021, 8, 1)},
+                    "all": {"data": 1},
+                }
+            ),
+            {
+                "dated": test.query(data=1, date__gte=datetime(2021, 8, 1)),
+                "all": test.query(data=1),
+            },
+        )
+        # no action is run for the records which don't have all the keys
+        calls = []
+        self.assertEqual(test.query(data__apply=(calls.append, None), missing=1), [])
+        self.assertEqual(calls, [])
+
     def test_queries_traversing(self):
 
         test = self.test6
@@ -780,6 +846,20 @@ class JsonTest(unittest.TestCase):
         self.assertEqual(test.query(A=All), [{"A": 1, "B": 2}, "$1", 2])
         self.assertEqual(test.query(B=All), [2, ["A", {"A": 2}]])
 
+    def test_attribute_keys(self):
+        test = JSONObject({"data": {"A": 1}, "numbers": list(range(40))})
+
+        # attributes of other node classes are set as keys of a dict
+        test.data._array = 5
+        test.data._columns = 6
+        self.assertEqual(test.data._data, {"A": 1, "_array": 5, "_columns": 6})
+        self.assertEqual(test.numbers._array.tolist(), list(range(40)))
+        # the subtree versions of dicts can't be overwritten
+        version = test.subtree_version
+        test._version = 0
+        self.assertEqual(test["_version"], 0)
+        self.assertEqual(test.subtree_version, version + 1)
+
     def test_setters(self):
 
         test = JSONObject({"data": [{"A": 1, "B": 2}]})
@@ -807,7 +887,7 @@ class JsonTest(unittest.TestCase):
             test2, JSONObject({"key": 111, "index": 222, "nested": {"index": 333}})
         )
         self.assertEqual(test2.query(key=All), [111])
-        self.assertListEqual(test2.query(index=All), [333, 222])
+        self.assertListEqual(test2.query(index=All), [222, 333])
         self.assertEqual(test2.query(index=333).first().jsonpath, "nested/index")
 
         self.assertTrue(test3.query(A__contains=4).exists())
@@ -863,6 +943,442 @@ class JsonTest(unittest.TestCase):
         self.assertEqual(test, self.test1)
         self.assertFalse(test.query(a1=All).exists())
 
+    def test_loads(self):
+
+        data = {"A": [{"B": 1, "C": [None, "x"]}, [True, {"D": 1.5}]], "E": {}}
+        path = BASE_PATH / "tests/balance-sheet-example-test.json"
+
+        test = JSONObject.loads(json.dumps(data))
+        self.assertEqual(test, JSONObject(data))
+        self.assertEqual(test.json_decode, data)
+        self.assertEqual(test.A._1._1.D.jsonpath, ("A", 1, 1, "D"))
+        self.assertIs(test.A._0.C.parent, test.A._0)
+        self.assertEqual(test.query(D=1.5).first().parent.jsonpath, ("A", 1, 1))
+
+        self.assertEqual(JSONObject.loads("[1, {}]"), [1, {}])
+        self.assertEqual(
+            JSONObject.loads(json.dumps(data), object_pairs_hook=dict), JSONObject(data)
+        )
+
+        with open(path) as f:
+            self.assertEqual(JSONObject.open(path).json_decode, json.load(f))
+
+    def test_native_data(self):
+
+        test = JSONObject({"A": {"B": [1, {"C": None}]}, "D": (1, 2), 3: "3"})
+        data = test._data
+
+        self.assertDictEqual(data, {"A": {"B": [1, {"C": None}]}, "D": [1, 2], "3": "3"})
+        self.assertIs(test._data, data)
+        self.assertIs(test.A._data, data["A"])
+
+        # json_decode returns a new object, which can be modified
+        decoded = test.json_decode
+        decoded["A"]["B"].append(2)
+        self.assertEqual(test._data, {"A": {"B": [1, {"C": None}]}, "D": [1, 2], "3": "3"})
+
+        # mutations invalidate the cached data of the node and its ancestors
+        test.A.B._1.C = 0
+        self.assertEqual(test._data["A"]["B"], [1, {"C": 0}])
+        self.assertIs(test._data["D"], data["D"])
+        test.A.B.append(2)
+        self.assertEqual(test.A._data, {"B": [1, {"C": 0}, 2]})
+        test.A.B.pop(0)
+        self.assertEqual(test.json_decode["A"]["B"], [{"C": 0}, 2])
+        test.A.pop("B")
+        self.assertEqual(test.json_decode["A"], {})
+        test.A.update({"E": 1})
+        self.assertEqual(test.json_decode["A"], {"E": 1})
+        self.assertEqual(test.get(A=All, native_types_=True), {"E": 1})
+        test.D.insert(0, {"F": 0})
+        test.D.extend([{"G": 3}])
+        test.D += [4]
+        self.assertIsInstance(test.D[0], JSONDict)
+        self.assertIs(test.D[0].parent, test.D)
+        self.assertIsInstance(test.D[-2], JSONDict)
+        self.assertEqual(test._data["D"], [{"F": 0}, 1, 2, {"G": 3}, 4])
+
+        # native objects returned to the user are copies too
+        test = JSONObject({"a": {"b": 1, "c": []}})
+        test._data
+        results = [
+            test.get(b=1, include_parent_=True, native_types_=True),
+            test.query(b=1, include_parent_=True, native_types_=True).first(),
+            test.query(a=All).first().apply(lambda node: node),
+            test.eval_path("a", native_types_=True),
+            test.query(b=1).values("a")[0]["a"],
+            test.query(a=All).values_count()[0][0],
+            test.a.to_path()[("a", "c")],
+        ]
+        for result in results[:-1]:
+            result["b"] = 99
+        results[-1].append(99)
+        self.assertEqual(test._data, {"a": {"b": 1, "c": []}})
+        self.assertEqual(test.copy().json_decode, {"a": {"b": 1, "c": []}})
+
+    def test_subtree_version(self):
+
+        test = JSONObject({"A": {"B": [1, {"C": None}]}, "D": {"E": 1}})
+
+        def versions():
+            return (
+                test.subtree_version,
+                test.A.subtree_version,
+                test.A.B.subtree_version,
+                test.D.subtree_version,
+            )
+
+        self.assertEqual(versions(), (0, 0, 0, 0))
+        self.assertEqual(test.D.E.subtree_version, 0)
+
+        test.A.B._1.C = 2
+        self.assertEqual(versions(), (1, 1, 1, 0))
+        test.A.B.append(3)
+        self.assertEqual(versions(), (2, 2, 2, 0))
+        test.set_path(("D", "E"), 2)
+        self.assertEqual(versions(), (3, 2, 2, 1))
+        test.query(E=2).update(3)
+        self.assertEqual(versions(), (4, 2, 2, 2))
+        test.query(C=All).delete()
+        self.assertEqual(versions(), (5, 3, 3, 2))
+        test.annotate(F=1)
+        self.assertGreater(test.D.subtree_version, 2)
+
+        # reading doesn't modify versions
+        version = test.subtree_version
+        test.query(F=All), test.json_decode, test.to_path()
+        self.assertEqual(test.subtree_version, version)
+
+    def test_memoized_method(self):
+
+        calls = []
+
+        class CountingDict(JSONDict):
+            __slots__ = ()
+
+            @memoized_method(maxsize=None)
+            def keys_count(self, prefix=""):
+                calls.append(prefix)
+                return len([k for k in self if k.startswith(prefix)])
+
+        test = CountingDict({"A1": 1, "A2": 2, "B": {"C": 3}})
+
+        self.assertEqual(test.keys_count("A"), 2)
+        self.assertEqual(test.keys_count("A"), 2)
+        self.assertEqual(test.keys_count(), 3)
+        self.assertListEqual(calls, ["A", ""])
+
+        test.B.C = 4  # a descendant is modified
+        self.assertEqual(test.keys_count("A"), 2)
+        self.assertListEqual(calls, ["A", "", "A"])
+
+        test.A3 = 3
+        self.assertEqual(test.keys_count("A"), 3)
+        self.assertEqual(CountingDict({"A": 1}).keys_count("A"), 1)
+        self.assertListEqual(calls, ["A", "", "A", "A", "A"])
+
+    def test_query_cache(self):
+
+        test = JSONObject(
+            {"A": [{"id": 1, "name": "a"}, {"id": 2, "name": "b"}], "B": {"id": 3}}
+        )
+        cache = test.enable_query_cache(maxsize=3)
+        self.assertIsInstance(cache, LRUCache)
+
+        first = test.query(id__gt=1)
+        self.assertEqual(first, [2, 3])
+        self.assertEqual(test.query(id__gt=1), [2, 3])
+        self.assertIsNot(test.query(id__gt=1), first)  # a new queryset each time
+        self.assertEqual(test.query(id=True), [])  # True == 1, but it is another query
+        self.assertEqual(test.get(id=1).parent.name, "a")
+        self.assertEqual(test.query_key("na.*"), ["a", "b"])
+        self.assertEqual(tuple(test.query_cache_info()), (2, 4, 1, 3, 3))
+
+        # results are computed again after the tree is modified
+        test.A._0.id = 5
+        self.assertEqual(test.query(id__gt=1), [5, 2, 3])
+        test.A._0.id = 1
+        self.assertEqual(test.query(id__gt=1), [2, 3])
+        # queries with parent lookups depend on the ancestors of the node
+        records = test.A
+        records.enable_query_cache()
+        self.assertEqual(records.query(id__parent__parent__parent__c_B__c_id=3), [1, 2])
+        test.B.id = 4
+        self.assertEqual(records.query(id__parent__parent__parent__c_B__c_id=3), [])
+        # and so do queries with actions which read the key path of the nodes
+        tree = JSONObject({"A": {"sub": {"x": 1}}})
+        sub = tree.A.sub
+        sub.enable_query_cache()
+        self.assertEqual(sub.query(x__path="A"), [1])
+        self.assertEqual(sub.query(x__notpath="Z"), [1])
+        tree.rename_keys({"A": "Z"}, inplace=True)
+        self.assertEqual(sub.query(x__path="A"), [])
+        self.assertEqual(sub.query(x__notpath="Z"), [])
+        # unhashable query values are not cached
+        self.assertEqual(records.query(id__in=[1, 2, {3}]), [1, 2])
+        self.assertEqual(records.query_cache_info().currsize, 2)
+
+        test.disable_query_cache()
+        self.assertIsNone(test.query_cache_info())
+        self.assertRaises(ValueError, LRUCache, 0)
+
+    def test_parallel_query(self):
+
+        test = JSONObject(
+            [
+                {"id": i, "name": f"item-{i}", "tags": [{"id": i * 10}]}
+                for i in range(25)
+            ]
+        )
+        queries = [
+            dict(id__gt=100),
+            dict(id__gt=100, recursive_=False),
+            dict(name__contains="1", include_parent_=True),
+            dict(id__lt=5, stop_at_match_=3),
+            dict(id__parent__c_name__endswith="7"),
+        ]
+        for q in queries:
+            expected = test.query(**q)
+            result = test.query(workers_=2, **q)
+            self.assertEqual(
+                [node.jsonpath for node in result], [node.jsonpath for node in expected]
+            )
+            # results are the nodes of the original tree
+            self.assertTrue(all(a is b for a, b in zip(result, expected)))
+
+        self.assertEqual(test.query_key("na.*", workers_=3), test.query_key("na.*"))
+        self.assertRaises(TypeError, test.query, id=1, workers_=0)
+        # the garbage collector of this process is left as it was
+        self.assertEqual(gc.get_freeze_count(), 0)
+
+    def test_query_many(self):
+
+        test = JSONObject(
+            {
+                "logs": [
+                    {"level": "error", "elapsed": 1500, "user": {"name": "A"}},
+                    {"level": "info", "elapsed": "20", "user": {"name": "B"}},
+                    {"level": "error", "elapsed": 30.5, "user": None},
+                ],
+                "level": "debug",
+            }
+        )
+        test.create_index("elapsed", kind="number")
+        specs = {
+            "errors": {"level": "error"},
+            "errors_parents": {"level": "error", "include_parent_": True},
+            "first_error": {"level": "error", "stop_at_match_": 1},
+            "top": {"level__contains": "e", "recursive_": False},
+            "slow": {"elapsed__gt": 25},
+            "named": {"name__in": ["A", "C"], "native_types_": True},
+            "multi": {"level": "error", "elapsed__lt": 100},
+            "everything": {},
+            "scoped": {"name": "A", "within_": "logs/*/user"},
+            "shallow": {"level": All, "max_depth_": 1},
+            "parallel": {"level": "error", "workers_": 2},
+        }
+        results = test.query_many(specs)
+
+        self.assertListEqual(list(results), list(specs))
+        for name, q in specs.items():
+            expected = test.query(**q)
+            self.assertEqual(
+                [node.jsonpath for node in results[name]],
+                [node.jsonpath for node in expected],
+            )
+            self.assertEqual(results[name]._native_types, expected._native_types)
+        self.assertEqual(results["first_error"], ["error"])
+        self.assertEqual(results["slow"], [1500, 30.5])
+        self.assertRaises(
+            TypeError, test.query_many, {"A": {"level": "info", "stop_at_match_": "1"}}
+        )
+
+    def test_q_objects(self):
+
+        test = JSONObject(
+            {
+                "data": [
+                    {"timestamp": "2021-05-01 09:00:00", "value": [0.5, 0.87]},
+                    {"timestamp": "2021-04-02 10:30:00", "value": [-0.23, 1]},
+                    {"timestamp": "2021-06-01 08:25:30", "value": [0.9, 0.15]},
+                ],
+                "timestamp": "2021-07-01 00:00:00",
+            }
+        )
+        records = test.data._data
+
+        result = test.query(
+            Q(timestamp__gt="2021-05-01 10:00:00") | Q(value__0__gte=0.5)
+        )
+        self.assertEqual(result, [records[0], records[2]])
+        self.assertEqual(
+            test.query(~Q(value__1__lt=1), timestamp__lt="2021-06-01"), [records[1]]
+        )
+        self.assertEqual(
+            test.query(Q(value__0__lt=0) | ~(Q(value__0=0.5) | Q(value__1__gt=0.5))),
+            [records[1], records[2]],
+        )
+        self.assertEqual(
+            test.data.query(Q(value__0__gt=0), recursive_=False, include_parent_=True),
+            [test.data._data, test.data._data],
+        )
+        self.assertEqual(
+            test.get(Q(timestamp__year=2021) & Q(value__0__lt=0)).timestamp,
+            "2021-04-02 10:30:00",
+        )
+        self.assertEqual(test.query(Q()), records)  # any dict
+        self.assertEqual(
+            test.query(value=All).filter(Q(timestamp__lt="2021-05-02")),
+            [[0.5, 0.87], [-0.23, 1]],
+        )
+        self.assertRaises(TypeError, Q, {"value": 1})
+
+        # cheap conditions are checked first, and checking stops as soon as the result is known
+        calls = []
+        expensive = Q(timestamp__apply=(calls.append, None))
+        self.assertEqual(
+            test.query(expensive & Q(value__0__gt=0)), [records[0], records[2]]
+        )
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(test.query(expensive | Q(value__0__gt=0)), records)
+        self.assertEqual(len(calls), 3)
+
+    def test_query_scope(self):
+
+        test = JSONObject(
+            {
+                "data": [
+                    {"id": 1, "items": [{"id": 10, "tags": {"id": 100}}, {"id": 11}]},
+                    {"id": 2, "items": [{"id": 20}], "links": {"id": 21}},
+                ],
+                "included": [{"id": 3, "items": [{"id": 30}]}],
+                "id": 0,
+            }
+        )
+
+        self.assertEqual(test.query(id=All, within_="data/*/items"), [10, 100, 11, 20])
+        self.assertEqual(
+            test.query(id=All, within_="data/*/items"),
+            test.data._0["items"].query(id=All) + test.data._1["items"].query(id=All),
+        )
+        self.assertEqual(
+            test.query(id=All, within_=("data", 1)), test.data._1.query(id=All)
+        )
+        self.assertEqual(
+            test.query(id=All, within_=test.data._0["items"]._0.jsonpath), [10, 100]
+        )
+        self.assertEqual(test.query(id=All, within_="**/items"), [10, 100, 11, 20, 30])
+        self.assertEqual(test.query(id=All, within_="included/**"), [3, 30])
+        self.assertEqual(test.query(id=All, within_="data/*/missing"), [])
+        self.assertEqual(
+            test.query(id__gt=10, within_="data/*/items", include_parent_=True),
+            [{"id": 100}, {"id": 11}, {"id": 20}],
+        )
+        self.assertEqual(test.get_key("id", within_="data/*/links"), 21)
+
+        # max_depth_ is relative to the node which sends the query
+        self.assertEqual(test.query(id=All, max_depth_=1), [0])
+        self.assertEqual(test.query(id=All, max_depth_=3), [1, 2, 3, 0])
+        self.assertEqual(
+            test.query(id=All, max_depth_=1), test.query(id=All, recursive_=False)
+        )
+        self.assertEqual(
+            test.query(id=All, within_="data/*/items", max_depth_=5), [10, 11, 20]
+        )
+        self.assertEqual(
+            list(test.iquery_key("id", within_="**/items", max_depth_=5)),
+            [10, 11, 20, 30],
+        )
+
+        self.assertRaises(TypeError, test.query, id=All, max_depth_=0)
+        self.assertRaises(TypeError, test.query, id=All, within_={"data": 1})
+
+    def test_compact_nodes(self):
+
+        test = JSONObject({"A": "a", "B": 1.5, "C": True, "D": None, "E": [{}]})
+
+        for node in (test, test.A, test.B, test.C, test.D, test.E, test.E._0):
+            self.assertRaises(
+                AttributeError, object.__getattribute__, node, "__dict__"
+            )
+
+        # reserved attributes are not registered as dict keys
+        test._key = "key"
+        test.parent = None
+        self.assertNotIn("_key", test)
+        self.assertEqual(test._key, "key")
+        test._key = None
+
+        # attribute style access on dicts is kept
+        test.F = 2
+        self.assertEqual(test["F"], 2)
+        self.assertEqual(test.F.jsonpath, "F")
+
+        test.annotate(G=3)
+        self.assertTrue(test.G._is_annotation)
+        self.assertFalse(test.F._is_annotation)
+        test.G = 4
+        self.assertFalse(test.G._is_annotation)
+
+    def test_compiled_query(self):
+
+        test = JSONObject(
+            {"A": [{"B": 1, "C": "x"}, {"B": 2, "C": "y"}, {"B": 3, "C": "y"}]}
+        )
+
+        plan = _compile_query(B__gte=2, C="y")
+        self.assertListEqual(
+            [plan.match(node) for node in (test.A._0.B, test.A._1.B, test.A._2.C)],
+            [False, True, False],
+        )
+        self.assertListEqual(test.query(B__gte=2, C="y"), [2, 3])
+        self.assertListEqual(test.query(B__gte=2, stop_at_match_=1), [2])
+        self.assertListEqual(
+            test.query(B__parent__c_C="x", include_parent_=True), [{"B": 1, "C": "x"}]
+        )
+
+        # bad actions raise an exception only when they are reached
+        self.assertListEqual(test.query(D__foo=1), [])
+        self.assertRaises(JSONQueryException, test.query, B__foo=1)
+        self.assertRaises(JSONQueryException, _compile_query, B=object())
+
+    def test_iquery(self):
+
+        test = JSONObject(
+            {"A": [{"B": 1, "C": "x"}, {"B": 2, "C": "y"}, {"B": 3, "C": "y"}]}
+        )
+
+        visited = []
+        match = _compile_query(B__gte=0).match
+
+        def tracked(node):
+            visited.append(node)
+            return match(node)
+
+        plan = SimpleNamespace(match=tracked, keyed=True)
+        query = LazyQuerySet(
+            test._iter_query_plan(plan, True, False),
+            test._new_queryset(QuerySet, False),
+        )
+        # nodes are only checked until the first match is found
+        self.assertEqual(query.first(), 1)
+        self.assertEqual(len(visited), 3)  # A, A._0 and A._0.B
+        self.assertTrue(query.exists())
+        self.assertEqual(len(visited), 3)
+        self.assertListEqual(list(query), [1, 2, 3])
+        self.assertListEqual(list(query), [1, 2, 3])
+
+        self.assertEqual(test.iquery(C="y").count(), 2)
+        self.assertListEqual(test.iquery(C="y").values("B", flat=True), [2, 3])
+        self.assertEqual(
+            test.iquery(C="y", include_parent_=True)[1], {"B": 3, "C": "y"}
+        )
+        self.assertFalse(test.iquery(D=1).exists())
+        self.assertEqual(test.iquery(D=1).first(), JSONNull(None))
+        self.assertEqual(test.iquery(B=2, native_types_=True).first(), 2)
+        self.assertListEqual(test.iquery_key("^C$", contains="y").keys(), ["C", "C"])
+        self.assertRaises(JSONQueryException, test.iquery(B__foo=1).first)
+
     def test_pop(self):
 
         test = JSONObject({"data": [{"name": "Dan", "age": 30}]})
@@ -922,6 +1438,51 @@ class JsonTest(unittest.TestCase):
             lambda: test.get(A__parents__parents__0=0),
         )
 
+    def test_ancestor_chains(self):
+        test = JSONObject({"A": {"B": [{"C": {"D": 1}}, {"E": 2}], "kind": "a"}})
+        leaf = test.A.B._0.C.D
+
+        self.assertEqual(leaf.depth, 5)
+        self.assertEqual(test.depth, 0)
+        self.assertIs(leaf.root, test)
+        self.assertEqual(leaf.jsonpath, "A/B/0/C/D")
+        self.assertEqual(
+            [node.jsonpath for node in leaf.parent_list],
+            ["A/B/0/C", "A/B/0", "A/B", "A", ""],
+        )
+        self.assertIsInstance(leaf.parent_list, ParentList)
+        self.assertEqual(test.query(D__parents__c_kind="a"), [1])
+
+        # chains are built again after a compose node is moved
+        other = JSONObject({"X": {"kind": "x"}})
+        other.X.Y = test.A.B._0.C
+        moved = other.X.Y.D
+        self.assertEqual(moved.jsonpath, "X/Y/D")
+        self.assertIs(moved.root, other)
+        self.assertEqual(other.query(D__parents__c_kind="x"), [1])
+
+        # a move only drops the cached chains of the moved subtree
+        target = JSONObject({"P": {"Q": {"R": 1}}})
+        self.assertEqual(target.P.Q.R.depth, 3)
+        chain = target.P.Q._ancestor_chain()
+        target.P.Q.S = other.X
+        self.assertIs(target.P.Q._ancestor_chain(), chain)
+        self.assertEqual(moved.jsonpath, "P/Q/S/Y/D")
+        self.assertIs(moved.root, target)
+        self.assertEqual(target.query(D__parents__c_kind="x"), [1])
+        test.A = {"B": {"C": 1}}
+        self.assertEqual(test.A.B.C.depth, 3)
+        self.assertEqual(test.query(C__parents__c_kind="a"), [])
+        subtree = test.A.B
+        subtree.parent = None
+        self.assertIs(subtree.C.root, subtree)
+        self.assertEqual(subtree.C.depth, 1)
+
+        # parents of weak trees are not kept alive by the chains
+        weak = JSONObject({"A": {"B": {"C": 1}}}, weak_parents=True)
+        self.assertEqual(weak.A.B.C.depth, 3)
+        self.assertIsNone(weak.A.B._ancestor_cache)
+
     def test_values(self):
 
         js.config.QUERY_EXCEPTIONS = False
@@ -1117,6 +1678,21 @@ class JsonTest(unittest.TestCase):
         )
         self.assertEqual(test2.query_key("*", type__="numeric"), [0, "012"])
 
+        # node keys are interned, and each pattern is matched once against each distinct key
+        test3 = JSONObject.loads('[{"item_id": 1, "id": 2}, {"item_id": 3, "id": 4}]')
+        test3._0.update({"".join(["user", "_id"]): 5})
+        self.assertIs(
+            test3._1.get_key("item_id")._key, test3._0.get_key("item_id")._key
+        )
+        self.assertIs(test3._0.get_key("user_id")._key, sys.intern("user_id"))
+        self.assertEqual(test3.query_key(r"\w+_id"), [1, 5, 3])
+        self.assertEqual(
+            _compile_query_key(r"\w+_id").match_key.matches,
+            {"item_id": True, "id": False, "user_id": True},
+        )
+        self.assertEqual(test3.query_key(js.I(".*_ID"), gt=1), [5, 3])
+        self.assertEqual(test3.query(id__gt=1).filter_key("item_id", lt=3), [2])
+
     def test_get_key(self):
         test = self.test5
 
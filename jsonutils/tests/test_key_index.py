@@ -0,0 +1,135 @@
+import unittest
+
+import jsonutils as js
+from jsonutils.base import JSONObject
+from jsonutils.indexes import KeyIndex
+
+
+class KeyIndexTest(unittest.TestCase):
+    def setUp(self):
+        js.config.NATIVE_TYPES = False
+        js.config.QUERY_EXCEPTIONS = True
+
+        self.data = {
+            "id": 0,
+            "records": [
+                {"id": 1, "name": "A", "meta": {"id": 10, "views": 5}},
+                {"id": 2, "name": "B", "meta": {"views": 50}},
+                [{"id": 3, "tags": ["x", {"id": 30}]}],
+            ],
+            "owner": {"id": 4, "name": "C"},
+        }
+
+    def queries(self, obj):
+        results = [
+            obj.query(id__gt=0),
+            obj.query(id=1, include_parent_=True),
+            obj.query(views__gt=10, include_parent_=True),
+            obj.query(name__parent__c_id__gt=1),
+            obj.query_key("^i.*"),
+            obj.query_key("na.*", contains="C"),
+            [obj.get(id=30, default_=None), obj.get(name="E", default_=None)],
+            obj.query(id__gt=0, stop_at_match_=2),
+        ]
+        return [
+            [(node.jsonpath, node._data) for node in nodes if node is not None]
+            for nodes in results
+        ]
+
+    def assertIndexed(self, obj):
+        indexed = self.queries(obj)
+        index = obj._indexes
+        obj._indexes = None
+        try:
+            self.assertEqual(indexed, self.queries(obj))
+        finally:
+            obj._indexes = index
+
+    def test_build_key_index(self):
+        test = JSONObject(self.data)
+        index = test.build_key_index()
+
+        self.assertIsInstance(index, KeyIndex)
+        self.assertTrue(index.is_fresh)
+        self.assertIn("views", index)
+        self.assertNotIn("missing", index)
+        self.assertEqual(
+            [node.jsonpath for node in index.nodes("id")],
+            [
+                ("id",),
+                ("records", 0, "id"),
+                ("records", 0, "meta", "id"),
+                ("records", 1, "id"),
+                ("records", 2, 0, "id"),
+                ("records", 2, 0, "tags", 1, "id"),
+                ("owner", "id"),
+            ],
+        )
+        self.assertIndexed(test)
+        # a new index replaces the old one
+        self.assertIsNot(test.build_key_index(), index)
+        self.assertEqual(len(test._indexes), 1)
+
+    def test_updates(self):
+        test = JSONObject(self.data)
+        index = test.build_key_index()
+
+        test.records._0.id = 100
+        test.records._0.meta = {"views": 70, "extra": {"id": 11}}
+        test.records.append({"id": 5, "name": "D"})
+        test.records._2.append({"id": 31})
+        test.owner.pop("name")
+        del test.records._1["meta"]
+        test.records[1] = {"name": "E", "meta": {"id": 20}}
+        test.records.pop(2)
+
+        self.assertTrue(index.is_fresh)
+        self.assertIn("extra", index)  # from records._0.meta
+        self.assertNotIn("meta", test.owner)
+        self.assertIndexed(test)
+        self.assertEqual(test.get(id=20).jsonpath, ("records", 1, "meta", "id"))
+
+    def test_rename_and_annotate(self):
+        test = JSONObject(self.data)
+        index = test.build_key_index()
+
+        test.owner.rename_keys({"name": "label"}, inplace=True)
+        test.annotate(checked=True)
+
+        self.assertTrue(index.is_fresh)
+        self.assertNotIn("name", test.owner)
+        self.assertEqual(
+            [node.jsonpath for node in test.query(checked=True)],
+            [node.jsonpath for node in JSONObject(test._data).query(checked=True)],
+        )
+        self.assertEqual(test.query_key("label").first(), "C")
+        self.assertIndexed(test)
+
+    def test_stale_index(self):
+        test = JSONObject(self.data)
+        index = test.build_key_index()
+
+        # untracked modifications leave the index stale, so it is rebuilt on next query
+        test.records.reverse()
+        del test.records[0]
+        test.records._1.meta.views = 1
+
+        self.assertFalse(index.is_fresh)
+        self.assertIndexed(test)
+        self.assertTrue(index.is_fresh)
+
+    def test_subtree_index(self):
+        test = JSONObject(self.data)
+        records = test.records
+        index = records.build_key_index()
+
+        test.owner.id = 40  # outside the indexed subtree
+        records._1.id = 200
+
+        self.assertTrue(index.is_fresh)
+        self.assertNotIn("owner", index)
+        self.assertEqual(
+            [node.jsonpath for node in records.query(id__gt=100)],
+            [("records", 1, "id")],
+        )
+        self.assertIndexed(records)
@@ -0,0 +1,59 @@
+import json
+import unittest
+
+import jsonutils as js
+from jsonutils.base import JSONDict, JSONList, JSONNode, JSONObject, JSONStr
+
+
+class LazyTest(unittest.TestCase):
+    def setUp(self):
+        js.config.NATIVE_TYPES = False
+        js.config.QUERY_EXCEPTIONS = True
+
+        self.data = {
+            "data": [
+                {"name": "Dan", "age": 30, "tags": ["a", "b"]},
+                {"name": "Mar", "age": None},
+            ],
+            "meta": {"count": 2},
+        }
+
+    def test_children_are_wrapped_on_access(self):
+        test = JSONObject(self.data, lazy=True)
+
+        self.assertIsInstance(test, JSONDict)
+        self.assertNotIsInstance(dict.__getitem__(test, "meta"), JSONNode)
+
+        meta = test["meta"]
+        self.assertIsInstance(meta, JSONDict)
+        self.assertIs(dict.__getitem__(test, "meta"), meta)
+        self.assertIs(meta.parent, test)
+        self.assertEqual(meta.jsonpath, ("meta",))
+
+        name = test.data[-1].name
+        self.assertIsInstance(name, JSONStr)
+        self.assertEqual(name.jsonpath, ("data", 1, "name"))
+        self.assertEqual(test.eval_path("data/0/tags/1"), "b")
+
+    def test_lazy_equals_eager(self):
+        eager = JSONObject(self.data)
+        lazy = JSONObject(self.data, lazy=True)
+
+        self.assertEqual(lazy, eager)
+        self.assertEqual(lazy.json_decode, self.data)
+        self.assertListEqual(
+            lazy.query(name=js.All).jsonpaths(), eager.query(name=js.All).jsonpaths()
+        )
+        self.assertEqual(lazy.get(age=30).parent, eager.get(age=30).parent)
+        self.assertDictEqual(lazy.to_path(), eager.to_path())
+        self.assertListEqual(
+            [item.jsonpath for item in lazy.data], [item.jsonpath for item in eager.data]
+        )
+        self.assertTrue(all(isinstance(v, JSONNode) for _, v in lazy.meta.items()))
+
+    def test_lazy_loads(self):
+        test = JSONObject.loads(json.dumps(self.data), lazy=True)
+
+        self.assertNotIsInstance(dict.__getitem__(test, "data"), JSONNode)
+        self.assertIsInstance(test.data, JSONList)
+        self.assertEqual(test.query(count=2).first().jsonpath, ("meta", "count"))
@@ -0,0 +1,113 @@
+import json
+import unittest
+
+import jsonutils as js
+from jsonutils.base import JSONFloat, JSONInt, JSONList, JSONNumericList, JSONObject
+from jsonutils.query import QuerySet
+
+
+class NumericListTest(unittest.TestCase):
+    def setUp(self):
+        js.config.NATIVE_TYPES = False
+        js.config.QUERY_EXCEPTIONS = True
+        self._min_length = js.config.NUMERIC_ARRAY_MIN_LENGTH
+        js.config.NUMERIC_ARRAY_MIN_LENGTH = 4
+
+        self.data = {
+            "ints": [1, 2, 3, 4, 5],
+            "floats": [0.5, 1.5, 2.5, 3.5],
+            "mixed": [1, 2.5, 3, 4.5],
+            "short": [1, 2],
+            "strings": ["1", "2", "3", "4"],
+        }
+
+    def tearDown(self):
+        js.config.NUMERIC_ARRAY_MIN_LENGTH = self._min_length
+
+    def test_numeric_list_creation(self):
+        test = JSONObject(self.data)
+
+        self.assertIsInstance(test.ints, JSONNumericList)
+        self.assertEqual(test.ints._array.typecode, "q")
+        self.assertEqual(test.floats._array.typecode, "d")
+        self.assertEqual(test.mixed._array.typecode, "d")
+        self.assertNotIsInstance(test.short, JSONNumericList)
+        self.assertNotIsInstance(test.strings, JSONNumericList)
+        self.assertNotIsInstance(JSONObject([True, False, True, True]), JSONNumericList)
+
+        js.config.NUMERIC_ARRAY_MIN_LENGTH = None
+        self.assertNotIsInstance(JSONObject(self.data).ints, JSONNumericList)
+
+    def test_items_are_built_on_access(self):
+        test = JSONObject(self.data)
+
+        self.assertNotIsInstance(list.__getitem__(test.ints, 0), JSONInt)
+        self.assertIsInstance(test.ints[0], JSONInt)
+        self.assertIsInstance(test.mixed._0, JSONInt)
+        self.assertIsInstance(test.mixed._1, JSONFloat)
+        self.assertEqual(test.ints[-1].jsonpath, ("ints", 4))
+        self.assertIs(test.floats._2.parent, test.floats)
+        self.assertListEqual([i.jsonpath for i in test.ints[1:3]], [("ints", 1), ("ints", 2)])
+        self.assertEqual(json.loads(test.json_encode()), self.data)
+        self.assertEqual(test.eval_path("ints/2"), 3)
+        self.assertEqual(test.to_path()[("floats", 3)], 3.5)
+
+    def test_vectorised_actions(self):
+        test = JSONObject(self.data)
+
+        self.assertTrue(test.query(ints__gt=[0, 1, 2, 3, 4]).exists())
+        self.assertFalse(test.query(ints__gt=[0, 1, 2, 3, 5]).exists())
+        self.assertTrue(test.query(ints__gte=[0, 2]).exists())
+        self.assertTrue(test.query(floats__lt=[1, 2, 3, 4]).exists())
+        self.assertFalse(test.query(floats__lte=[0.5, 1]).exists())
+        self.assertFalse(test.query(floats__lt=[]).exists())
+        self.assertTrue(test.query(mixed=[1, 2.5, 3, 4.5]).exists())
+        self.assertFalse(test.query(mixed=[1, 2.5, 3]).exists())
+        self.assertTrue(test.query(ints__in=list(range(10))).exists())
+        self.assertFalse(test.query(ints__in=[1, 2, 3]).exists())
+        # non numeric requested values follow the generic algorithm
+        self.assertTrue(test.query(ints__gt=["0", "1"]).exists())
+        self.assertTrue(test.query(ints=["1", "2", "3", "4", "5"]).exists())
+
+    def test_mutations_keep_the_array_updated(self):
+        test = JSONObject(self.data)
+
+        test.ints.append(6)
+        test.ints[0] = 0.5
+        self.assertEqual(test.ints._array.typecode, "d")
+        self.assertListEqual(test.ints._array.tolist(), [0.5, 2, 3, 4, 5, 6])
+        self.assertEqual(test.ints._5.jsonpath, ("ints", 5))
+
+        test.ints.pop(0)
+        test.ints.insert(0, 1)
+        test.ints.remove(6)
+        self.assertListEqual(test.ints._array.tolist(), [1, 2, 3, 4, 5])
+        self.assertTrue(test.query(ints=[1, 2, 3, 4, 5]).exists())
+
+        test.ints._1.update(20)
+        self.assertEqual(test.ints._array[1], 20)
+
+        test.ints.append("6")
+        self.assertIsNone(test.ints._array)
+        self.assertEqual(test.ints[-1], "6")
+        self.assertTrue(test.query(ints__in=[1, 20, 3, 4, 5, "6"]).exists())
+
+    def test_queryset_sum_and_mean(self):
+        test = JSONObject(self.data)
+
+        self.assertEqual(QuerySet(test.floats).sum(), 8)
+        self.assertEqual(QuerySet(test.ints).mean(), 3)
+        self.assertEqual(QuerySet([1, "2", "3.5", True]).sum(), 6.5)
+
+    def test_queries_without_filters(self):
+        js.config.NUMERIC_ARRAY_MIN_LENGTH = 32
+
+        for length in (31, 32, 40):
+            test = JSONObject({"numbers": list(range(length)), "name": "x"})
+            self.assertEqual(isinstance(test.numbers, JSONNumericList), length >= 32)
+            # items of numeric lists have no key, but they are nodes of the tree
+            self.assertEqual(len(test.query()), length + 2)
+            self.assertEqual(len(test.iquery()), length + 2)
+            self.assertEqual(len(test.query(within_="numbers")), length)
+            self.assertEqual(len(test.query_many({"all": {}})["all"]), length + 2)
+            self.assertEqual(test.query(name="x"), ["x"])
@@ -0,0 +1,81 @@
+import json
+import unittest
+
+import jsonutils as js
+from jsonutils.base import JSONBool, JSONNull, JSONObject, JSONStr
+
+
+class SharedLeavesTest(unittest.TestCase):
+    def setUp(self):
+        js.config.NATIVE_TYPES = False
+        js.config.QUERY_EXCEPTIONS = True
+
+        self.data = {
+            "events": [
+                {"status": "ok", "code": 200, "error": None, "retry": False},
+                {"status": "ok", "code": 200, "error": None, "retry": True},
+                {"status": "ko", "code": 500, "error": "timeout", "retry": True},
+            ]
+        }
+
+    def test_equal_leaves_are_stored_once(self):
+        test = JSONObject(self.data, share_leaves=True)
+        first, second, third = test.events
+
+        for key in ("status", "code", "error"):
+            self.assertIs(dict.__getitem__(first, key), dict.__getitem__(second, key))
+        self.assertIs(dict.__getitem__(second, "retry"), dict.__getitem__(third, "retry"))
+        self.assertIs(test.events._leaf_pool, test._leaf_pool)
+        self.assertEqual(len(test._leaf_pool), 8)
+
+    def test_shared_leaves_keep_their_position(self):
+        test = JSONObject(self.data, share_leaves=True)
+
+        status = test.events._1.status
+        self.assertIsInstance(status, JSONStr)
+        self.assertIs(status.parent, test.events._1)
+        self.assertEqual(status.jsonpath, ("events", 1, "status"))
+        self.assertEqual(test.eval_path("events/0/error").jsonpath, ("events", 0, "error"))
+
+        self.assertListEqual(
+            test.query(status="ok").jsonpaths(),
+            [("events", 0, "status"), ("events", 1, "status")],
+        )
+        self.assertIsInstance(test.get(retry=False), JSONBool)
+        self.assertIsInstance(test.query(error=None).first(), JSONNull)
+        self.assertDictEqual(test.to_path(), JSONObject(self.data).to_path())
+
+    def test_shared_leaves_updates(self):
+        test = JSONObject(self.data, share_leaves=True)
+
+        test.get(retry=False).update(True)
+        test.events._0.status = "ko"
+        test.events.append("ok")
+
+        self.assertEqual(test.events._1.status, "ok")
+        self.assertEqual(test.events._0.status, "ko")
+        self.assertIs(
+            dict.__getitem__(test.events._0, "status"),
+            dict.__getitem__(test.events._2, "status"),
+        )
+        self.assertEqual(test.events._3.jsonpath, ("events", 3))
+        self.assertTrue(test.events._0.retry)
+
+    def test_shared_leaves_serialization(self):
+        data = {"A": [0.0, -0.0, 1, True, 1.0]}
+        test = JSONObject.loads(json.dumps(data), share_leaves=True)
+
+        self.assertEqual(json.dumps(test.json_decode), json.dumps(data))
+        self.assertEqual(test, JSONObject(data))
+
+    def test_shared_pool_among_objects(self):
+        pool = {}
+        test1 = JSONObject(self.data, share_leaves=pool)
+        test2 = JSONObject(self.data, lazy=True, share_leaves=pool)
+
+        self.assertEqual(test2.events._2.error, "timeout")
+        self.assertIs(
+            dict.__getitem__(test1.events._2, "error"),
+            dict.__getitem__(test2.events._2, "error"),
+        )
+        self.assertEqual(test1, test2)
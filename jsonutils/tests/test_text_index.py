@@ -0,0 +1,103 @@
+import unittest
+
+import jsonutils as js
+from jsonutils.base import JSONObject
+from jsonutils.functions.parsers import _compile_query
+from jsonutils.indexes import TextIndex
+
+
+class TextIndexTest(unittest.TestCase):
+    def setUp(self):
+        js.config.NATIVE_TYPES = False
+        js.config.QUERY_EXCEPTIONS = True
+
+        self.data = {
+            "logs": [
+                {"level": "error", "message": "Connection timeout after 30s"},
+                {"level": "info", "message": "request served in 12ms"},
+                {"level": "error", "message": "TIMEOUT waiting for lock"},
+                {"level": "info", "message": 1200},
+                {
+                    "level": "warn",
+                    "message": "retrying",
+                    "context": {"message": "upstream timeout"},
+                },
+                {"level": "info", "message": "ſtatus ok"},
+            ]
+        }
+        self.queries = [
+            {"message__contains": "timeout"},
+            {"message__icontains": "TimeOut"},
+            {"message__contains": 12},
+            {"message__contains": ["request", "served"]},
+            {"message__icontains": ("lock", "wait")},
+            {"message__regex": r"\d+ms$"},
+            {"message__regex": "(?i)^timeout"},
+            {"message__regex": "(?i)status"},
+            {"message__fullregex": "retry.*"},
+            {"message__contains": "timeout", "include_parent_": True},
+        ]
+
+    def assertIndexed(self, obj):
+        def results():
+            return [
+                [(node.jsonpath, node._data) for node in obj.query(**q)]
+                for q in self.queries
+            ]
+
+        def filtered():
+            errors = obj.query(level__in=["error", "warn"])
+            return [errors.filter(**q).jsonpaths() for q in self.queries]
+
+        indexed = results(), filtered()
+        indexes = obj._indexes
+        obj._indexes = None
+        try:
+            self.assertEqual(indexed, (results(), filtered()))
+        finally:
+            obj._indexes = indexes
+
+    def test_create_index(self):
+        test = JSONObject(self.data)
+        index = test.create_index("message", kind="text")
+
+        self.assertIsInstance(index, TextIndex)
+        self.assertEqual(len(index), 7)
+        # only the strings with all the trigrams of the requested text (and other leaves) are checked
+        plan = _compile_query(message__icontains="timeout")
+        self.assertEqual(
+            test._query_candidates(plan),
+            [
+                "Connection timeout after 30s",
+                "TIMEOUT waiting for lock",
+                1200,
+                "upstream timeout",
+            ],
+        )
+        plan = _compile_query(message__regex=r"(?i)\d+ TIMEOUT")
+        self.assertEqual(len(test._query_candidates(plan)), 4)
+        # needles shorter than a trigram can't use the index
+        plan = _compile_query(message__contains="ok")
+        self.assertIsNone(test._query_candidates(plan))
+        self.assertEqual(
+            test.query(level="warn").filter(message__icontains="TIMEOUT"), ["warn"]
+        )
+        self.assertIndexed(test)
+
+    def test_updates(self):
+        test = JSONObject(self.data)
+        index = test.create_index("message", kind="text")
+
+        test.logs._1.message = "timeout in request"
+        test.logs.append({"level": "error", "message": "read timeout"})
+        test.logs._4.context = {"message": "served"}
+        test.logs.pop(0)
+        del test.logs._1["message"]
+        test.logs.reverse()  # untracked, the index is rebuilt
+
+        self.assertIndexed(test)
+        self.assertTrue(index.is_fresh)
+        self.assertEqual(
+            test.query(message__contains="timeout"),
+            ["read timeout", "timeout in request"],
+        )
@@ -0,0 +1,200 @@
+import unittest
+from datetime import datetime
+
+import jsonutils as js
+import pytz
+from jsonutils.base import JSONObject
+from jsonutils.functions.parsers import _compile_query
+from jsonutils.indexes import HashIndex, ValueIndex
+
+
+class ValueIndexTest(unittest.TestCase):
+    def setUp(self):
+        js.config.NATIVE_TYPES = False
+        js.config.QUERY_EXCEPTIONS = True
+
+        self.data = {
+            "events": [
+                {"name": "start", "timestamp": "2021-05-01 08:00:00", "price": 10},
+                {"name": "stop", "timestamp": "2021-05-03 10:00:00", "price": "$ 2.5"},
+                {"name": "restart", "timestamp": "2021-05-02 09:30:00", "price": 7.5},
+                {"name": "sync", "timestamp": "not a date", "price": True},
+                {
+                    "name": "nested",
+                    "timestamp": "2021-05-04 00:00:00",
+                    "price": {"price": 100},
+                },
+            ]
+        }
+        self.queries = [
+            {"timestamp__gte": "2021-05-02"},
+            {"timestamp__lt": datetime(2021, 5, 3, tzinfo=pytz.utc)},
+            {"price__gt": 5},
+            {"price__gte": 2.5, "price__lt": 10},
+            {"price__lte": 7.5, "include_parent_": True},
+            {"name__startswith": "st"},
+            {"name__gt": "restart"},
+        ]
+
+    def assertIndexed(self, obj):
+        def results():
+            return [
+                [(node.jsonpath, node._data) for node in obj.query(**q)]
+                for q in self.queries
+            ]
+
+        indexed = results()
+        indexes = obj._indexes
+        obj._indexes = None
+        try:
+            self.assertEqual(indexed, results())
+        finally:
+            obj._indexes = indexes
+
+    def create_indexes(self, obj):
+        return (
+            obj.create_index("timestamp", kind="datetime"),
+            obj.create_index("price", kind="number"),
+            obj.create_index("name", kind="string"),
+        )
+
+    def test_create_index(self):
+        test = JSONObject(self.data)
+        timestamps, prices, names = self.create_indexes(test)
+
+        self.assertIsInstance(prices, ValueIndex)
+        self.assertEqual(len(prices), 6)
+        self.assertEqual(prices._values, [2.5, 7.5, 10.0, 100.0])
+        self.assertEqual(len(timestamps._others), 1)
+        self.assertRaises(ValueError, test.create_index, "price", kind="float")
+
+        # only the nodes within the requested range (or which can't be parsed) are checked
+        plan = _compile_query(timestamp__gte="2021-05-02", timestamp__lt="2021-05-03")
+        self.assertEqual(
+            test._query_candidates(plan), ["2021-05-02 09:30:00", "not a date"]
+        )
+        self.assertEqual(
+            test.query(timestamp__gte="2021-05-02", timestamp__lt="2021-05-03"),
+            ["2021-05-02 09:30:00"],
+        )
+        plan = _compile_query(name__startswith="st")
+        self.assertEqual(test._query_candidates(plan), ["start", "stop"])
+        self.assertIsNone(test._query_candidates(_compile_query(price=10)))
+        self.assertIndexed(test)
+
+        # an index over the same key and kind replaces the old one
+        test.create_index("price", kind="number")
+        self.assertEqual(len(test._indexes), 3)
+
+    def test_updates(self):
+        test = JSONObject(self.data)
+        indexes = self.create_indexes(test)
+
+        test.events._0.price = 1
+        test.events._1.timestamp = "2021-04-30 00:00:00"
+        test.events.append({"name": "stage", "price": "6.5"})
+        test.events._4.price = 50
+        del test.events._2["name"]
+        test.events.pop(3)
+        test.events[0] = {"name": "step", "timestamp": "2021-05-05 00:00:00"}
+
+        self.assertTrue(all(index.is_fresh for index in indexes))
+        self.assertEqual(indexes[1]._values, [2.5, 6.5, 7.5, 50.0])
+        self.assertIndexed(test)
+
+    def test_stale_index(self):
+        test = JSONObject(self.data)
+        indexes = self.create_indexes(test)
+
+        test.events.reverse()
+        test.events.insert(0, JSONObject({"name": "first", "price": 0}))
+
+        self.assertFalse(any(index.is_fresh for index in indexes))
+        self.assertIndexed(test)
+        self.assertTrue(all(index.is_fresh for index in indexes))
+
+
+class HashIndexTest(unittest.TestCase):
+    def setUp(self):
+        js.config.NATIVE_TYPES = False
+        js.config.QUERY_EXCEPTIONS = True
+
+        self.data = {
+            "records": [
+                {"sku": "ABC", "id": 1, "flag": True},
+                {"sku": "5", "id": "2", "flag": "false"},
+                {"sku": 5, "id": 3.0, "flag": None},
+                {"sku": "2021-05-01", "id": {"id": 4}, "flag": "True"},
+                {"sku": None, "id": [5], "flag": 1},
+            ]
+        }
+        self.queries = [
+            {"sku": "ABC"},
+            {"sku": 5},
+            {"sku": "5"},
+            {"sku": datetime(2021, 5, 1, tzinfo=pytz.utc)},
+            {"sku": None},
+            {"id": 3},
+            {"id": 2.0},
+            {"id__in": [1, "2", 4]},
+            {"flag": True},
+            {"flag": "false"},
+            {"flag__in": (True, None)},
+            {"sku__in": ["ABC", 5], "include_parent_": True},
+            {"sku": "ABC", "id": 1},
+        ]
+
+    def assertIndexed(self, obj):
+        def results():
+            return [
+                [(node.jsonpath, node._data) for node in obj.query(**q)]
+                for q in self.queries
+            ]
+
+        indexed = results()
+        indexes = obj._indexes
+        obj._indexes = None
+        try:
+            self.assertEqual(indexed, results())
+        finally:
+            obj._indexes = indexes
+
+    def create_indexes(self, obj):
+        return tuple(
+            obj.create_index(key, kind="hash") for key in ("sku", "id", "flag")
+        )
+
+    def test_create_index(self):
+        test = JSONObject(self.data)
+        skus, ids, flags = self.create_indexes(test)
+
+        self.assertIsInstance(skus, HashIndex)
+        self.assertEqual(len(skus), 5)
+        # exact queries only check the leaves which can be equal to the query value
+        self.assertEqual(test._query_candidates(_compile_query(sku="ABC")), ["ABC"])
+        self.assertEqual(test._query_candidates(_compile_query(sku=5)), ["5", 5])
+        self.assertEqual(
+            test._query_candidates(_compile_query(id__in=[1, 3])), [1, 3.0]
+        )
+        self.assertIsNone(test._query_candidates(_compile_query(sku__contains="A")))
+        self.assertEqual(test.get(sku="ABC").parent.id, 1)
+        self.assertIndexed(test)
+
+    def test_updates(self):
+        test = JSONObject(self.data)
+        indexes = self.create_indexes(test)
+        test.query(sku=5)  # strings are parsed as numbers
+
+        test.records._0.sku = "XYZ"
+        test.records._1.sku = "5.0"
+        test.records.append({"sku": "ABC", "id": 6})
+        del test.records._2["flag"]
+        test.records.pop(3)
+        test.records[0] = {"sku": 5.0, "id": "1"}
+
+        self.assertTrue(all(index.is_fresh for index in indexes))
+        self.assertEqual(
+            [node.jsonpath for node in test.query(sku=5)],
+            [("records", 0, "sku"), ("records", 1, "sku"), ("records", 2, "sku")],
+        )
+        self.assertIndexed(test)
@@ -0,0 +1,61 @@
+import gc
+import json
+import unittest
+import weakref
+
+import jsonutils as js
+from jsonutils.base import JSONObject
+
+
+class WeakParentsTest(unittest.TestCase):
+    def setUp(self):
+        js.config.NATIVE_TYPES = False
+        js.config.QUERY_EXCEPTIONS = True
+
+        self.data = {
+            "data": [
+                {"name": "John", "tags": ["a", "b"], "address": {"city": "Madrid"}},
+                {"name": "Ann", "tags": [], "address": {"city": "Paris"}},
+            ]
+        }
+
+    def test_parents(self):
+        for test in (
+            JSONObject(self.data, weak_parents=True),
+            JSONObject.loads(json.dumps(self.data), weak_parents=True),
+            JSONObject(self.data, weak_parents=True, lazy=True),
+        ):
+            city = test.data._1.address.city
+            self.assertIsInstance(city._parent, weakref.ref)
+            self.assertIs(city.parent, test.data._1.address)
+            self.assertIs(test.data.parent, test)
+            self.assertEqual(city.jsonpath, ("data", 1, "address", "city"))
+            self.assertEqual(
+                test.query(city__contains="ar").first().jsonpath,
+                ("data", 1, "address", "city"),
+            )
+
+            test.data._0.address.city = "Rome"
+            self.assertEqual(test._data["data"][0]["address"]["city"], "Rome")
+
+    def test_tree_is_freed_without_gc(self):
+        gc.disable()
+        try:
+            test = JSONObject(self.data, weak_parents=True)
+            root, address = weakref.ref(test), weakref.ref(test.data._0.address)
+            del test
+            self.assertIsNone(root())
+            self.assertIsNone(address())
+
+            test = JSONObject(self.data)
+            root = weakref.ref(test)
+            del test
+            self.assertIsNotNone(root())  # a reference cycle
+        finally:
+            gc.enable()
+            gc.collect()
+
+    def test_node_without_root(self):
+        address = JSONObject(self.data, weak_parents=True).data._0.address
+        self.assertIsNone(address.parent)
+        self.assertEqual(address.city, "Madrid")
@@ -1,30 +1,25 @@
-from collections.abc import KeysView
-
 import jsonutils.base as base
 
 
-class UUIDdict(dict):
+class ChildObjects:
     """
-    This objects represents a normal dict, but overwrites the way a new child item is set, asserting its UUID4 id is unique.
+    Ordered view over the children of a compose node (JSONDict values or JSONList items).
+    It exposes the same read interface as the old child registry.
     """
 
-    def __setitem__(self, key, child):
-
-        while key in self.keys():
-            key = child._set_new_uuid()
+    __slots__ = ("_node",)
 
-        return super().__setitem__(key, child)
+    def __init__(self, node):
+        self._node = node
 
-    def values_except(self, except_):
+    def values(self):
+        return self._node._iter_children()
 
-        if isinstance(except_, str):
-            result = {k: v for k, v in self.items() if k != except_}
-        elif isinstance(except_, (list, tuple, set, KeysView)):
-            result = {k: v for k, v in self.items() if k not in except_}
-        else:
-            raise TypeError("except_ argument must be a str o sequence instance")
+    def __iter__(self):
+        return self._node._iter_children()
 
-        return result.values()
+    def __len__(self):
+        return self._node.__len__()
 
 
 class TranslationDict(dict):
@@ -1,5 +1,4 @@
 from jsonutils.exceptions import JSONSchemaError
-from jsonutils.utils.dict import UUIDdict
 
 
 class SchemaSwitcher:
@@ -48,7 +47,7 @@ class SchemaSwitcher:
 
 class SchemaBase:
     def __init__(self, *args, **kwargs):
-        self._child_objects = UUIDdict()
+        self._child_objects = {}
 
 
 class SchemaNodeDict(SchemaBase):